@@ -0,0 +1,128 @@
+"""통장(user_balance)을 가진 사용자 목록을 메모리에 유지하는 인덱스입니다.
+
+처음 한 번 DB에서 전체 user_id를 읽은 뒤로는 balance_ledger의 잔액 변경 결과로
+계좌 존재를 계속 반영하고, DB 밖에서 생긴 계좌는 주기적인 백그라운드 갱신으로 따라잡습니다.
+길드별로 계좌가 있는 멤버의 표시 이름을 정렬해 두어 자동완성은 DB 없이 이분 탐색으로 응답합니다.
+"""
+import asyncio
+import bisect
+import logging
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import discord
+
+from database_manager import fetch
+
+logger = logging.getLogger(__name__)
+
+
+class _GuildNames(NamedTuple):
+    version: int
+    built_at: float
+    # (소문자 표시 이름, 멤버 ID) 정렬 목록
+    entries: List[Tuple[str, int]]
+
+
+class AccountIndex:
+    def __init__(self, refresh_interval: float = 600, names_ttl: float = 300):
+        """refresh_interval초마다 DB와 다시 맞추고, 길드별 이름 인덱스는 names_ttl초 동안 재사용합니다."""
+        self.refresh_interval = refresh_interval
+        self.names_ttl = names_ttl
+
+        self._user_ids: Set[int] = set()
+        self._loaded_at: Optional[float] = None
+        self._version = 0
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._guilds: Dict[int, _GuildNames] = {}
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._user_ids
+
+    def __len__(self) -> int:
+        return len(self._user_ids)
+
+    async def load(self):
+        """DB에서 전체 계좌 목록을 다시 읽습니다."""
+        rows = await fetch("SELECT user_id FROM user_balance")
+        self._user_ids = {row['user_id'] for row in rows}
+        self._loaded_at = time.monotonic()
+        self._version += 1
+        logger.info(f"계좌 인덱스 로드: {len(self._user_ids)}명")
+
+    async def ensure_loaded(self):
+        """처음 호출될 때만 DB를 기다리고, 이후에는 오래된 경우 백그라운드에서 갱신합니다."""
+        if self._loaded_at is None:
+            async with self._load_lock:
+                if self._loaded_at is None:
+                    await self.load()
+            return
+
+        if time.monotonic() - self._loaded_at >= self.refresh_interval and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self):
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"계좌 인덱스 갱신 실패: {e}")
+        finally:
+            self._refresh_task = None
+
+    def add(self, user_ids: Iterable[int]):
+        """잔액 변경에 성공한 사용자를 계좌 보유자로 반영합니다."""
+        before = len(self._user_ids)
+        self._user_ids.update(user_ids)
+        if len(self._user_ids) != before:
+            self._version += 1
+
+    def discard(self, user_id: int):
+        if user_id in self._user_ids:
+            self._user_ids.discard(user_id)
+            self._version += 1
+
+    def invalidate_guild(self, guild_id: int):
+        """멤버 입장/퇴장, 이름 변경 시 해당 길드의 이름 인덱스를 버립니다."""
+        self._guilds.pop(guild_id, None)
+
+    def _guild_names(self, guild: discord.Guild) -> List[Tuple[str, int]]:
+        names = self._guilds.get(guild.id)
+        now = time.monotonic()
+        if names is None or names.version != self._version or now - names.built_at >= self.names_ttl:
+            entries = sorted(
+                (member.display_name.lower(), member.id)
+                for member in guild.members
+                if member.id in self._user_ids
+            )
+            names = _GuildNames(self._version, now, entries)
+            self._guilds[guild.id] = names
+        return names.entries
+
+    def search(self, guild: discord.Guild, current: str, limit: int = 25) -> List[discord.Member]:
+        """계좌가 있는 길드 멤버 중 표시 이름에 current가 들어간 멤버를 찾습니다.
+        접두사가 일치하는 멤버를 먼저, 나머지 부분 일치를 뒤에 채웁니다."""
+        entries = self._guild_names(guild)
+        query = current.lower()
+
+        matched: List[int] = []
+        start = bisect.bisect_left(entries, (query,))
+        for name, member_id in entries[start:]:
+            if not name.startswith(query) or len(matched) >= limit:
+                break
+            matched.append(member_id)
+
+        if query and len(matched) < limit:
+            prefixed = set(matched)
+            for name, member_id in entries:
+                if query in name and member_id not in prefixed:
+                    matched.append(member_id)
+                    if len(matched) >= limit:
+                        break
+
+        members = (guild.get_member(member_id) for member_id in matched)
+        return [member for member in members if member is not None]
+
+
+# 봇 전체에서 공유하는 계좌 인덱스
+accounts = AccountIndex()
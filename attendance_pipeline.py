@@ -0,0 +1,267 @@
+"""출석 처리를 메모리에서 즉시 판정하고, DB 기록은 백그라운드에서 모아서 저장하는 파이프라인입니다.
+
+중복 출석 여부, 출석 순서, 누적/연속 출석 일수는 모두 메모리 상태로 계산하므로
+출석 메시지에 대한 응답은 DB 왕복 없이 바로 전송됩니다.
+daily_chat_log, user_attendance, user_balance 기록은 짧은 간격으로 모아
+하나의 트랜잭션으로 저장합니다.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import asyncpg
+
+import balance_ledger
+import leaderboard
+from database_manager import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# 출석 보상: 기본 보상 + 연속 출석 일수 * 보너스
+BASE_REWARD = 100
+STREAK_BONUS = 10
+
+# 저장 실패 시 재시도 간격(초, 실패할 때마다 두 배)과, 한 건씩 나눠 저장하기 전까지의 시도 횟수
+FLUSH_RETRY_BASE = 1.0
+FLUSH_RETRY_MAX = 60.0
+FLUSH_MAX_ATTEMPTS = 5
+
+
+class AttendanceResult(NamedTuple):
+    order: int
+    attendance_count: int
+    streak_count: int
+    reward: int
+
+
+class AttendanceRecord(NamedTuple):
+    attendance_count: int
+    last_attendance: Optional[date]
+    streak_count: int
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class AttendancePipeline:
+    def __init__(self, flush_interval: float = 1.0):
+        self.flush_interval = flush_interval
+        self.loaded = False
+
+        self._users: Dict[int, AttendanceRecord] = {}
+        self._day: Optional[date] = None
+        self._checked_today: Set[int] = set()
+        self._order_today = 0
+
+        self._pending: List[Tuple[int, date, int]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        # 저장과 관리자 초기화(forget)가 서로 겹치지 않게 함
+        self._flush_lock = asyncio.Lock()
+        # 연속으로 저장에 실패한 횟수
+        self._failures = 0
+
+    async def load(self, today: date):
+        """DB에서 사용자별 출석 기록과 오늘의 출석 상태를 복원합니다."""
+        async with connection() as db:
+            records = await db.fetch(
+                'SELECT user_id, attendance_count, last_attendance, streak_count FROM user_attendance'
+            )
+            chatted = await db.fetch(
+                'SELECT user_id FROM daily_chat_log WHERE chat_date = $1',
+                today.strftime('%Y-%m-%d')
+            )
+            order_today = await db.fetchval_named('attendance_order_get', today)
+
+        self._users = {
+            row['user_id']: AttendanceRecord(row['attendance_count'], _as_date(row['last_attendance']), row['streak_count'])
+            for row in records
+        }
+        leaderboard.streaks.replace({user_id: record.streak_count for user_id, record in self._users.items()})
+        leaderboard.attendance_counts.replace(
+            {user_id: record.attendance_count for user_id, record in self._users.items()}
+        )
+        self._day = today
+        attended = {user_id for user_id, record in self._users.items() if record.last_attendance == today}
+        self._checked_today = attended | {row['user_id'] for row in chatted}
+        # 출석 순서는 upsert 때마다 증가하는 daily_attendance_stats 카운터에서 가져옴
+        self._order_today = order_today or 0
+        self.loaded = True
+        logger.info(f"출석 상태 복원 완료: 사용자 {len(self._users)}명, 오늘 출석 {self._order_today}명")
+
+    async def ensure_loaded(self, today: date):
+        if not self.loaded:
+            await self.load(today)
+
+    def check_in(self, user_id: int, today: date) -> Optional[AttendanceResult]:
+        """출석을 판정합니다. 오늘 이미 출석했다면 None을 반환합니다.
+        DB 기록은 대기열에 넣고 바로 결과를 반환합니다."""
+        if self._day != today:
+            self._day = today
+            self._checked_today = set()
+            self._order_today = 0
+
+        if user_id in self._checked_today:
+            return None
+        self._checked_today.add(user_id)
+        self._order_today += 1
+
+        # user_attendance upsert와 같은 규칙으로 연속 출석을 계산
+        record = self._users.get(user_id)
+        if record is None:
+            attendance_count, streak_count = 1, 1
+        elif record.last_attendance == today - timedelta(days=1):
+            attendance_count, streak_count = record.attendance_count + 1, record.streak_count + 1
+        elif record.last_attendance == today:
+            attendance_count, streak_count = record.attendance_count + 1, record.streak_count
+        else:
+            attendance_count, streak_count = record.attendance_count + 1, 1
+        self._users[user_id] = AttendanceRecord(attendance_count, today, streak_count)
+        leaderboard.streaks.set(user_id, streak_count)
+        leaderboard.attendance_counts.set(user_id, attendance_count)
+
+        reward = BASE_REWARD + streak_count * STREAK_BONUS
+        self._pending.append((user_id, today, reward))
+        self._wakeup.set()
+
+        return AttendanceResult(self._order_today, attendance_count, streak_count, reward)
+
+    @asynccontextmanager
+    async def forget(self, user_ids):
+        """관리자 초기화 등으로 DB 기록을 지울 때 그 DELETE를 이 블록 안에서 실행합니다.
+        대기 중인 기록을 먼저 저장하고 해당 사용자의 메모리 상태를 버리며,
+        블록이 끝날 때까지 백그라운드 저장을 막아 지운 기록이 다시 생기지 않게 합니다.
+            async with pipeline.forget(user_ids):
+                await db.execute('DELETE ...')"""
+        user_ids = set(user_ids)
+        async with self._flush_lock:
+            await self._flush_locked(final=True)
+            # 연결 오류로 저장하지 못하고 남은 기록도 해당 사용자 것은 버림
+            self._pending = [row for row in self._pending if row[0] not in user_ids]
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+                leaderboard.streaks.remove(user_id)
+                leaderboard.attendance_counts.remove(user_id)
+            yield
+
+    def get_record(self, user_id: int) -> Optional[AttendanceRecord]:
+        """메모리에 있는 사용자의 출석 기록을 반환합니다."""
+        return self._users.get(user_id)
+
+    @property
+    def pending_count(self) -> int:
+        """아직 DB에 저장되지 않은 출석 기록 수"""
+        return len(self._pending)
+
+    def start(self):
+        """백그라운드 저장 작업을 시작합니다."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """저장 작업을 멈추고 남은 기록을 모두 저장합니다.
+        저장 도중에 취소하면 그 묶음이 사라지므로 취소 대신 멈춤 신호를 보내고 끝나기를 기다립니다."""
+        if self._task is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush(final=True)
+
+    async def _sleep(self, seconds: float):
+        # 종료 신호가 오면 바로 깨어남
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            await self._wakeup.wait()
+            # 잠깐 기다려 그 사이 들어온 출석을 함께 저장
+            await self._sleep(self.flush_interval)
+            if self._stopping.is_set():
+                # 남은 기록은 close()가 한 건씩 나눠서라도 저장
+                return
+            self._wakeup.clear()
+            if not await self.flush():
+                # 실패하면 점점 길게 기다렸다가 다시 시도
+                await self._sleep(min(FLUSH_RETRY_BASE * 2 ** (self._failures - 1), FLUSH_RETRY_MAX))
+                self._wakeup.set()
+
+    async def _write(self, batch: List[Tuple[int, date, int]]):
+        async with transaction() as db:
+            await db.executemany_named(
+                'daily_chat_insert',
+                [(user_id, day.strftime('%Y-%m-%d')) for user_id, day, _ in batch]
+            )
+            await db.executemany_named(
+                'attendance_upsert',
+                [(user_id, day) for user_id, day, _ in batch]
+            )
+            # 통장이 없는 사용자는 기존처럼 보상 지급을 건너뜀
+            await balance_ledger.apply_many(
+                [(user_id, reward) for user_id, _, reward in batch], db, strict=False
+            )
+
+    async def _write_each(self, remaining: List[Tuple[int, date, int]]):
+        """기록을 한 건씩 저장해 DB가 거부한 기록만 버리고 나머지는 저장합니다.
+        처리한 기록은 remaining에서 빼므로, 연결 문제처럼 기록과 무관한 오류로 멈추면
+        remaining에는 아직 저장하지 않은 기록만 남습니다."""
+        total, dropped = len(remaining), 0
+        while remaining:
+            row = remaining[0]
+            try:
+                await self._write([row])
+            except asyncpg.PostgresError as e:
+                dropped += 1
+                logger.error(f"출석 기록 저장 실패로 버림 (user_id={row[0]}, day={row[1]}, reward={row[2]}): {e}")
+            except Exception as e:
+                logger.error(f"출석 기록 개별 저장 중단: {e}")
+                return
+            remaining.pop(0)
+        logger.info(f"출석 기록 개별 저장 완료: {total - dropped}건 저장, {dropped}건 버림")
+
+    async def flush(self, final: bool = False) -> bool:
+        """대기 중인 출석 기록을 하나의 트랜잭션으로 저장하고 성공 여부를 반환합니다.
+        FLUSH_MAX_ATTEMPTS번 연속 실패하거나 종료 중(final)이면 한 건씩 저장해 DB가 거부한 기록만 버립니다."""
+        async with self._flush_lock:
+            return await self._flush_locked(final)
+
+    async def _flush_locked(self, final: bool) -> bool:
+        if not self._pending:
+            return True
+
+        batch, self._pending = self._pending, []
+        try:
+            await self._write(batch)
+            logger.debug(f"출석 기록 {len(batch)}건 저장 완료")
+            self._failures = 0
+            return True
+        except Exception as e:
+            self._failures += 1
+            logger.error(f"출석 기록 저장 오류 ({self._failures}/{FLUSH_MAX_ATTEMPTS}회): {e}")
+        except BaseException:
+            # 취소되면 트랜잭션은 되돌려지므로 기록을 대기열에 다시 넣음
+            self._pending[:0] = batch
+            raise
+
+        if final or self._failures >= FLUSH_MAX_ATTEMPTS:
+            try:
+                await self._write_each(batch)
+            except BaseException:
+                self._pending[:0] = batch
+                raise
+            if not batch:
+                self._failures = 0
+                return True
+
+        # 다음 저장 때 다시 시도
+        self._pending[:0] = batch
+        return False
@@ -0,0 +1,77 @@
+"""user_balance 잔액 변경을 담당하는 원장 모듈입니다.
+
+모든 변경은 `잔액 >= 차감액` 조건이 붙은 단일 UPDATE로 적용되므로
+조회 후 갱신 사이에 다른 지급/차감이 끼어들어 잔액이 음수가 되는 일이 없습니다.
+"""
+import logging
+from typing import Optional, Sequence, Set, Tuple, Dict
+
+import leaderboard
+from account_index import accounts
+from database_manager import connection, transaction, DBSession
+
+logger = logging.getLogger(__name__)
+
+
+class _Rollback(Exception):
+    """여러 건 중 하나라도 적용하지 못했을 때 트랜잭션을 되돌리기 위한 내부 예외입니다."""
+
+
+async def apply(user_id: int, amount: int, db: Optional[DBSession] = None) -> Optional[int]:
+    """user_id의 잔액을 amount만큼 변경하고 새 잔액을 반환합니다.
+    계좌가 없거나 잔액이 부족하면 아무것도 바꾸지 않고 None을 반환합니다."""
+    async with connection(db) as db:
+        balance = await db.fetchval_named('balance_apply', amount, user_id)
+    if balance is not None:
+        accounts.add((user_id,))
+        leaderboard.balances.set(user_id, balance)
+    return balance
+
+
+async def apply_many(changes: Sequence[Tuple[int, int]], db: Optional[DBSession] = None,
+                     strict: bool = True) -> Optional[Dict[int, int]]:
+    """(user_id, amount) 목록을 unnest를 이용한 단일 UPDATE로 한 번에 적용합니다.
+    같은 사용자가 여러 번 나오면 합산해서 적용합니다.
+    하나라도 실패하면 전부 되돌리고 None을, 성공하면 사용자별 새 잔액을 반환합니다.
+    strict=False이면 적용할 수 없는 사용자만 건너뛰고 나머지는 그대로 반영합니다."""
+    if not changes:
+        return {}
+
+    user_ids = [user_id for user_id, _ in changes]
+    amounts = [amount for _, amount in changes]
+    try:
+        async with transaction(db) as db:
+            rows = await db.fetch_named('balance_apply_many', user_ids, amounts)
+            if strict and len(rows) != len(set(user_ids)):
+                # 계좌가 없거나 잔액이 부족한 사용자가 있으면 전체를 되돌림
+                raise _Rollback()
+    except _Rollback:
+        return None
+    balances = {row['user_id']: row['balance'] for row in rows}
+    accounts.add(balances)
+    for user_id, balance in balances.items():
+        leaderboard.balances.set(user_id, balance)
+    return balances
+
+
+async def transfer(sender_id: int, recipient_id: int, amount: int) -> Optional[Tuple[int, int]]:
+    """sender_id에서 recipient_id로 amount만큼 송금하고 (보낸 사람, 받는 사람)의 새 잔액을 반환합니다."""
+    balances = await apply_many([(sender_id, -amount), (recipient_id, amount)])
+    if balances is None:
+        return None
+    return balances[sender_id], balances[recipient_id]
+
+
+async def credit_each(changes: Sequence[Tuple[int, int]], reason: str) -> Set[int]:
+    """서로 독립적인 지급/환불을 한 번에 적용합니다. 한 사용자가 실패해도 나머지는 반영하며,
+    적용하지 못한 사용자 ID 집합을 반환합니다."""
+    user_ids = {user_id for user_id, _ in changes}
+    try:
+        balances = await apply_many(changes, strict=False)
+    except Exception as e:
+        logger.error(f"{reason} 처리 중 오류 발생: {e}")
+        return user_ids
+    missed = user_ids - set(balances)
+    if missed:
+        logger.error(f"{reason} 중 적용하지 못한 사용자: {sorted(missed)}")
+    return missed
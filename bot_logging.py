@@ -0,0 +1,62 @@
+"""봇 전역 로깅 설정입니다.
+
+로그 기록은 QueueHandler로 큐에 넣기만 하고 실제 출력은 QueueListener 스레드가 담당하므로
+메시지 이벤트 처리 중에 stdout 출력 때문에 이벤트 루프가 멈추지 않습니다.
+
+환경 변수:
+    LOG_LEVEL: 기본 로그 레벨 (기본값 INFO)
+    LOG_LEVELS: 모듈별 로그 레벨. 예) "cogs.dccon=DEBUG,discord=WARNING"
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from typing import Any, Dict, Optional
+
+LOG_FORMAT = '%(asctime)s:%(levelname)s:%(name)s: %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class SamplingFilter(logging.Filter):
+    """extra에 sample_rate가 지정된 기록은 그 확률로만 남깁니다."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, 'sample_rate', 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+def sampled(rate: float, **extra: Any) -> Dict[str, Any]:
+    """자주 발생하는 이벤트 로그에 붙일 extra를 만듭니다.
+    예) logger.debug("메시지 수신", extra=sampled(0.01, message_id=message.id))"""
+    return {'sample_rate': rate, **extra}
+
+
+def setup_logging():
+    """루트 로거에 비동기 큐 핸들러를 설치합니다. 여러 번 호출해도 한 번만 적용됩니다."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    root.addHandler(queue_handler)
+
+    for entry in os.getenv('LOG_LEVELS', '').split(','):
+        if '=' in entry:
+            name, level = entry.split('=', 1)
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
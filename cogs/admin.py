@@ -6,6 +6,10 @@ from typing import Optional, List, Dict, Any
 
 from main import DEVELOPER_IDS, KST, RankingView, ClearAllView, is_admin_or_developer
 from database_manager import execute_query
+import leaderboard
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class Admin(commands.Cog):
@@ -37,15 +41,15 @@ class Admin(commands.Cog):
                 return
 
             channel_id = interaction.channel_id
-            print(f"\n=== 출석 채널 설정 시도 ===", flush=True)
-            print(f"채널 ID: {channel_id}", flush=True)
-            print(f"현재 등록된 출석 채널: {bot.attendance_channels}", flush=True)
+            logger.info(f"=== 출석 채널 설정 시도 ===")
+            logger.info(f"채널 ID: {channel_id}")
+            logger.info(f"현재 등록된 출석 채널: {bot.attendance_channels}")
 
             try:
                 # 먼저 응답 대기 상태로 전환
                 await interaction.response.defer(ephemeral=True)
             except discord.NotFound:
-                print("상호작용이 만료되었습니다.", flush=True)
+                logger.info("상호작용이 만료되었습니다.")
                 return
 
             try:
@@ -58,7 +62,7 @@ class Admin(commands.Cog):
                     (guild_channels,)
                 )
                 deleted_count = len(result) if result else 0
-                print(f"삭제된 기존 출석 채널 수: {deleted_count}", flush=True)
+                logger.info(f"삭제된 기존 출석 채널 수: {deleted_count}")
 
                 # 새로운 채널 등록
                 await execute_query(
@@ -70,9 +74,9 @@ class Admin(commands.Cog):
                 result = await execute_query('SELECT channel_id FROM attendance_channels')
                 if result:
                     bot.attendance_channels = {row['channel_id'] for row in result}
-                    print(f"업데이트된 출석 채널 목록: {bot.attendance_channels}", flush=True)
+                    logger.info(f"업데이트된 출석 채널 목록: {bot.attendance_channels}")
                 else:
-                    print("등록된 채널이 없습니다.", flush=True)
+                    logger.info("등록된 채널이 없습니다.")
                     bot.attendance_channels = set()  # 빈 집합으로 초기화
 
                 try:
@@ -84,10 +88,10 @@ class Admin(commands.Cog):
                     )
                     await interaction.followup.send(embed=success_embed, ephemeral=True)
                 except discord.NotFound:
-                    print("상호작용이 만료되었습니다.", flush=True)
+                    logger.info("상호작용이 만료되었습니다.")
 
             except Exception as e:
-                print(f"출석 채널 설정 중 오류 발생: {e}", flush=True)
+                logger.error(f"출석 채널 설정 중 오류 발생: {e}")
                 try:
                     error_embed = discord.Embed(
                         title="❌ 오류",
@@ -96,9 +100,9 @@ class Admin(commands.Cog):
                     )
                     await interaction.followup.send(embed=error_embed, ephemeral=True)
                 except discord.NotFound:
-                    print("상호작용이 만료되었습니다.", flush=True)
+                    logger.info("상호작용이 만료되었습니다.")
             finally:
-                print("=== 출석 채널 설정 완료 ===\n", flush=True)
+                logger.info("=== 출석 채널 설정 완료 ===")
 
         @bot.tree.command(name="출석현황", description="서버 멤버들의 출석 현황을 확인합니다. (개발자 전용)")
         async def check_server_attendance(interaction: discord.Interaction):
@@ -114,91 +118,61 @@ class Admin(commands.Cog):
                 except discord.NotFound:
                     await interaction.followup.send(embed=error_embed, ephemeral=True)
                 except Exception as e:
-                    print(f"권한 오류 메시지 전송 실패: {e}")
+                    logger.error(f"권한 오류 메시지 전송 실패: {e}")
                 return
 
             try:
-                # 서버 멤버 목록 가져오기
                 guild = interaction.guild
-                member_ids = [member.id for member in guild.members if not member.bot]
-
-                # 출석 데이터 조회
-                attendance_results = await execute_query(
-                    '''
-                    SELECT 
-                        user_id,
-                        attendance_count,
-                        streak_count,
-                        last_attendance
-                    FROM user_attendance
-                    WHERE user_id = ANY($1)
-                    ORDER BY attendance_count DESC
-                    ''',
-                    (member_ids,)
-                )
+                attendance = interaction.client.attendance
+                today = datetime.now(KST).date()
+                await attendance.ensure_loaded(today)
+                await leaderboard.ensure_balances_loaded()
+                include = leaderboard.guild_filter(guild)
 
-                if not attendance_results:
+                # 총 출석 횟수 순으로 정렬된 보드에서 이 서버 멤버만 조회
+                attendance_data = []
+                for _, user_id, count in leaderboard.attendance_counts.top(10, include):
+                    record = attendance.get_record(user_id)
+                    attendance_data.append({
+                        'name': guild.get_member(user_id).display_name,
+                        'count': count,
+                        'streak': record.streak_count if record else 0,
+                        'last': record.last_attendance if record else None
+                    })
+
+                if not attendance_data:
                     try:
                         await interaction.response.send_message("아직 출석 기록이 없습니다.", ephemeral=True)
                     except discord.NotFound:
                         await interaction.followup.send("아직 출석 기록이 없습니다.", ephemeral=True)
                     except Exception as e:
-                        print(f"출석 기록 없음 메시지 전송 실패: {e}")
+                        logger.error(f"출석 기록 없음 메시지 전송 실패: {e}")
                     return
 
-                user_money_results = await execute_query(
-                    '''
-                    SELECT
-                        user_id,
-                        balance
-                    FROM user_balance
-                    WHERE user_id = ANY($1)
-                    ORDER BY balance DESC 
-                    ''',
-                    (member_ids,)
-                )
-
-                # 결과 처리
-                attendance_data = []
-                for row in attendance_results:
-                    member = guild.get_member(row['user_id'])
-                    if member:
-                        attendance_data.append({
-                            'name': member.display_name,
-                            'count': row['attendance_count'],
-                            'streak': row['streak_count'],
-                            'last': row['last_attendance']
-                        })
-
-                user_money_data = []
-                for row in user_money_results:
-                    member = guild.get_member(row['user_id'])
-                    if member:
-                        user_money_data.append({
-                            'name': member.display_name,
-                            'money': row['money']
-                        })
-
-                registered_members = len(attendance_results)
-                today = datetime.now(KST).strftime('%Y-%m-%d')
-                today_attendance = sum(
-                    1 for row in (attendance_results or [])
-                    if row.get("attendance_date") and row["attendance_date"].strftime('%Y-%m-%d') == today)
-                total_money = sum(
-                    row.get("money") for row in (user_money_results or [])
-                    if row.get("money")
-                )
+                registered_members = 0
+                today_attendance = 0
+                for member in guild.members:
+                    if member.bot:
+                        continue
+                    record = attendance.get_record(member.id)
+                    if record is None:
+                        continue
+                    registered_members += 1
+                    if record.last_attendance == today:
+                        today_attendance += 1
+                attended_members = sum(1 for user_id, _ in leaderboard.attendance_counts if include(user_id))
+                total_money = sum(money for user_id, money in leaderboard.balances if include(user_id))
 
                 # 메시지 구성
                 embed = discord.Embed(
                     title="📊 서버 출석 현황",
-                    description=f"총 {len(attendance_data)}명의 멤버가 출석했습니다.",
+                    description=f"총 {attended_members}명의 멤버가 출석했습니다.",
                     color=0x00ff00
                 )
 
                 # 상위 10명만 표시
                 for i, data in enumerate(attendance_data[:10], 1):
-                    last_attendance = data['last'].strftime('%Y-%m-%d %H:%M') if data['last'] else '없음'
+                    last_attendance = data['last'].strftime('%Y-%m-%d') if data['last'] else '없음'
                     embed.add_field(
                         name=f"{i}위: {data['name']}",
                         value=f"총 출석: {data['count']}회\n"
@@ -218,14 +192,14 @@ class Admin(commands.Cog):
                 except discord.NotFound:
                     await interaction.followup.send(embed=embed, ephemeral=True)
                 except Exception as e:
-                    print(f"출석 현황 메시지 전송 실패: {e}")
+                    logger.error(f"출석 현황 메시지 전송 실패: {e}")
                     try:
                         await interaction.followup.send("출석 현황을 표시하는 중 오류가 발생했습니다.", ephemeral=True)
                     except:
                         pass
 
             except Exception as e:
-                print(f"출석 현황 조회 중 오류 발생: {e}")
+                logger.error(f"출석 현황 조회 중 오류 발생: {e}")
                 error_embed = discord.Embed(
                     title="❌ 오류",
                     description=f"출석 현황 조회 중 오류가 발생했습니다.\n오류: {str(e)}",
@@ -259,14 +233,14 @@ class Admin(commands.Cog):
                     # 상호작용이 만료된 경우 followup 사용
                     await interaction.followup.send(embed=embed, view=view, ephemeral=True)
                 except Exception as e:
-                    print(f"랭킹 명령어 응답 오류: {e}")
+                    logger.error(f"랭킹 명령어 응답 오류: {e}")
                     try:
                         await interaction.followup.send("랭킹 정보를 표시하는 중 오류가 발생했습니다.", ephemeral=True)
                     except:
                         pass
 
             except Exception as e:
-                print(f"랭킹 명령어 실행 오류: {e}")
+                logger.error(f"랭킹 명령어 실행 오류: {e}")
                 try:
                     await interaction.followup.send("랭킹 정보를 가져오는 중 오류가 발생했습니다.", ephemeral=True)
                 except:
@@ -1,42 +1,32 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional, List
-from database_manager import execute_query
+from typing import Optional
+import balance_ledger
+from account_index import accounts
+import logging
 
-from main import update_balance
-
-
-async def get_user_ids_from_db() -> List[int]:
-    """데이터베이스에서 모든 user_id 가져오기"""
-    try:
-        result = await execute_query("SELECT user_id FROM user_balance")
-        return [row['user_id'] for row in result] if result else []
-    except Exception as e:
-        print(f"데이터베이스 오류: {e}")
-        return []
+logger = logging.getLogger(__name__)
 
 
 async def get_user_id_from_str_id(interaction: discord.Interaction, user_name: str) -> Optional[int]:
     """
-    사용자 이름(display_name)을 통해 실제 user_id를 찾는 함수
+    자동완성으로 선택된 값(user_id 문자열)을 실제 user_id로 바꾸는 함수
 
     Args:
         interaction (discord.Interaction): 현재 상호작용 컨텍스트
-        user_name (str): 사용자의 디스플레이 이름
+        user_name (str): 자동완성이 넘겨준 user_id 문자열
 
     Returns:
-        str: 찾은 사용자의 user_id, 찾지 못하면 None
+        int: 길드 멤버이면서 통장이 있는 사용자의 user_id, 찾지 못하면 None
     """
-    # 데이터베이스에서 유효한 user_ids 가져오기
-    valid_user_ids = await get_user_ids_from_db()
-
-    # 길드의 모든 멤버 중에서 이름과 일치하고 데이터베이스에 존재하는 멤버 찾기
-    for member in interaction.guild.members:
-        if (str(member.id) == user_name and
-                member.id in valid_user_ids):
-            return member.id
+    if not user_name.isdigit():
+        return None
 
+    await accounts.ensure_loaded()
+    user_id = int(user_name)
+    if user_id in accounts and interaction.guild.get_member(user_id) is not None:
+        return user_id
     return None
 
 
@@ -46,17 +36,13 @@ class UserNameTransformer(app_commands.Transformer):
         return value
 
     async def autocomplete(self, interaction: discord.Interaction, current: str):
-        """데이터베이스에서 유저 목록을 가져와 자동 완성"""
-        user_ids = await get_user_ids_from_db()
-
-        matching_members = [
+        """메모리의 계좌 인덱스에서 유저 목록을 찾아 자동 완성"""
+        await accounts.ensure_loaded()
+        return [
             discord.app_commands.Choice(name=member.display_name, value=str(member.id))
-            for member in interaction.guild.members
-            if member.id in user_ids and current.lower() in member.display_name.lower()
+            for member in accounts.search(interaction.guild, current)
         ]
 
-        return matching_members[:25]
-
 
 class TransferAutocomplete(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -75,13 +61,32 @@ class TransferAutocomplete(commands.Cog):
                 await interaction.response.send_message(f"{recipient} 해당 사용자를 찾을 수 없습니다.")
                 return
 
+            if amount <= 0:
+                await interaction.response.send_message("송금 금액은 0보다 커야 합니다!", ephemeral=True)
+                return
+
             try:
-                await update_balance(recipient_id, amount)
-                await update_balance(interaction.user.id, -amount)
+                # 차감과 입금을 하나의 트랜잭션으로 처리
+                if await balance_ledger.transfer(interaction.user.id, recipient_id, amount) is None:
+                    await interaction.response.send_message("잔액이 부족합니다!", ephemeral=True)
+                    return
                 await interaction.response.send_message(f"{amount}원을 송금했습니다.")
             except Exception as e:
                 await interaction.response.send_message(f"송금 중 오류가 발생했습니다: {e}")
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        accounts.invalidate_guild(member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        accounts.invalidate_guild(member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.display_name != after.display_name:
+            accounts.invalidate_guild(after.guild.id)
+
 
 async def setup(bot):
     await bot.add_cog(TransferAutocomplete(bot))
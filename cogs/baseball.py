@@ -5,7 +5,12 @@ import asyncio
 import math
 from typing import Dict, Tuple
 from main import update_balance
+import balance_ledger
 from database_manager import execute_query
+from message_router import MessageKind
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def generate_number() -> str:
@@ -27,6 +32,10 @@ class Baseball(commands.Cog):
         self.bot = bot
         self.active_games: Dict[
             int, Tuple[str, int, int, float]] = {}  # user_id: (target_number, bet_amount, attempts_left, multiplier)
+        # 진행 중인 게임의 DM 입력 대기열 (user_id: Queue)
+        self.guess_queues: Dict[int, asyncio.Queue] = {}
+        # 모든 메시지에 wait_for 검사를 돌리지 않도록 DM만 라우터에서 받아옴
+        bot.router.register(MessageKind.DM, self.on_dm_message)
 
         @bot.tree.command(name="숫자야구", description="숫자야구 게임을 시작합니다.")
         async def baseball(interaction: discord.Interaction, bet_amount: int):
@@ -48,7 +57,7 @@ class Baseball(commands.Cog):
                     )
                     return await interaction.response.send_message(embed=error_embed)
             except Exception as e:
-                print(f"베팅금 차감 중 오류 발생: {e}")
+                logger.error(f"베팅금 차감 중 오류 발생: {e}")
                 error_embed = discord.Embed(
                     title="❌ 오류",
                     description="베팅금 차감 중 오류가 발생했습니다.",
@@ -97,112 +106,122 @@ class Baseball(commands.Cog):
                 await interaction.response.send_message(embed=error_embed, ephemeral=True)
                 return
 
-            def check(m):
-                return (
-                        m.author == interaction.user
-                        and isinstance(m.channel, discord.DMChannel)  # DM 채널에서만 입력받기
-                        and m.content.isdigit()
-                        and len(m.content) == 3
-                )
-
-            while attempts_left > 0:
-                try:
-                    guess = await self.bot.wait_for('message', timeout=300.0, check=check)
-                    guess_number = guess.content
+            guesses = self.guess_queues[interaction.user.id] = asyncio.Queue()
 
-                    if len(set(guess_number)) != 3:
-                        error_embed = discord.Embed(
-                            title="❌ 잘못된 입력",
-                            description="중복되지 않는 3자리 숫자를 입력해주세요!",
+            # 어떤 경로로 끝나도(예외 포함) 대기열이 남지 않도록 finally에서 정리
+            try:
+                while attempts_left > 0:
+                    try:
+                        guess = await asyncio.wait_for(guesses.get(), timeout=300.0)
+                        guess_number = guess.content
+
+                        if len(set(guess_number)) != 3:
+                            error_embed = discord.Embed(
+                                title="❌ 잘못된 입력",
+                                description="중복되지 않는 3자리 숫자를 입력해주세요!",
+                                color=0xff0000
+                            )
+                            await interaction.user.send(embed=error_embed)
+                            continue
+
+                        strikes, balls = check_number(target_number, guess_number)
+
+                        if strikes == 3:
+                            # 승리 금액 계산식
+                            winnings = round(bet_amount * multiplier)
+
+                            try:
+                                # 봇의 잔고에서 차감하고 유저에게 지급
+                                if await balance_ledger.apply_many([(bot.user.id, -winnings), (interaction.user.id, winnings)]) is not None:
+                                    win_embed = discord.Embed(
+                                        title="🎉 승리!",
+                                        description=f"정답입니다! {target_number}\n"
+                                                  f"축하합니다! 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 {winnings}원을 획득했습니다!",
+                                        color=0x00ff00
+                                    )
+                                    await interaction.user.send(embed=win_embed)
+                                    # 원래 채널에도 결과 전송
+                                    channel_win_embed = discord.Embed(
+                                        title="🎉 숫자야구 게임 승리!",
+                                        description=f"{interaction.user.mention}님 축하합니다! 숫자야구 게임에서 승리하여 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 ***{winnings}원**을 획득했습니다!*",
+                                        color=0x00ff00
+                                    )
+                                    await interaction.channel.send(embed=channel_win_embed)
+                                    return
+                                else:
+                                    # 봇의 잔고 부족
+                                    win_no_money_embed = discord.Embed(
+                                        title="🎉 승리! (지급 실패)",
+                                        description=f"정답입니다! {target_number}\n"
+                                                  f"축하합니다! 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 {winnings}원을 획득했습니다!\n"
+                                                  f"하지만 돈이 부족하여 지급해드리지 못했습니다...",
+                                        color=0xffcc00
+                                    )
+                                    await interaction.user.send(embed=win_no_money_embed)
+                                    channel_win_no_money_embed = discord.Embed(
+                                        title="🎉 숫자야구 게임 승리! (지급 실패)",
+                                        description=f"{interaction.user.mention}님 축하합니다! 숫자야구 게임에서 승리하여 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 ***{winnings}원**을 획득했습니다!*\n"
+                                                  f"하지만 돈이 부족하여 지급해드리지 못했습니다...",
+                                        color=0xffcc00
+                                    )
+                                    await interaction.channel.send(embed=channel_win_no_money_embed)
+                            except Exception as e:
+                                logger.error(f"승리 금액 지급 중 오류 발생: {e}")
+
+                            return
+
+                        attempts_left -= 1
+                        multiplier -= 0.2  # 시도마다 0.2씩 감소하도록 변경
+                        self.active_games[interaction.user.id] = (target_number, bet_amount, attempts_left, multiplier)
+
+                        result_embed = discord.Embed(
+                            title="⚾ 숫자야구 결과",
+                            description=f"✅ **{strikes} 스트라이크 / {balls} 볼**\n"
+                                      f"남은 기회 🔄️ ***{attempts_left}번***",
+                            color=0xffcc00
+                        )
+                        await interaction.user.send(embed=result_embed)
+                    except asyncio.TimeoutError:
+                        timeout_embed = discord.Embed(
+                            title="⏰ 시간 초과",
+                            description="시간이 초과되었습니다. 게임이 종료됩니다.",
                             color=0xff0000
                         )
-                        await interaction.user.send(embed=error_embed)
-                        continue
-
-                    strikes, balls = check_number(target_number, guess_number)
-
-                    if strikes == 3:
-                        # 승리 금액 계산식
-                        winnings = round(bet_amount * multiplier)
-
-                        try:
-                            # 봇의 잔고에서 차감하고 유저에게 지급
-                            if await update_balance(bot.user.id, -winnings) and await update_balance(interaction.user.id, winnings):
-                                win_embed = discord.Embed(
-                                    title="🎉 승리!",
-                                    description=f"정답입니다! {target_number}\n"
-                                              f"축하합니다! 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 {winnings}원을 획득했습니다!",
-                                    color=0x00ff00
-                                )
-                                await interaction.user.send(embed=win_embed)
-                                # 원래 채널에도 결과 전송
-                                channel_win_embed = discord.Embed(
-                                    title="🎉 숫자야구 게임 승리!",
-                                    description=f"{interaction.user.mention}님 축하합니다! 숫자야구 게임에서 승리하여 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 ***{winnings}원**을 획득했습니다!*",
-                                    color=0x00ff00
-                                )
-                                await interaction.channel.send(embed=channel_win_embed)
-                                return
-                            else:
-                                # 봇의 잔고 부족
-                                win_no_money_embed = discord.Embed(
-                                    title="🎉 승리! (지급 실패)",
-                                    description=f"정답입니다! {target_number}\n"
-                                              f"축하합니다! 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 {winnings}원을 획득했습니다!\n"
-                                              f"하지만 돈이 부족하여 지급해드리지 못했습니다...",
-                                    color=0xffcc00
-                                )
-                                await interaction.user.send(embed=win_no_money_embed)
-                                channel_win_no_money_embed = discord.Embed(
-                                    title="🎉 숫자야구 게임 승리! (지급 실패)",
-                                    description=f"{interaction.user.mention}님 축하합니다! 숫자야구 게임에서 승리하여 베팅금 {bet_amount}원의 {multiplier:.1f}배인 💰 ***{winnings}원**을 획득했습니다!*\n"
-                                              f"하지만 돈이 부족하여 지급해드리지 못했습니다...",
-                                    color=0xffcc00
-                                )
-                                await interaction.channel.send(embed=channel_win_no_money_embed)
-                        except Exception as e:
-                            print(f"승리 금액 지급 중 오류 발생: {e}")
-
-                        del self.active_games[interaction.user.id]
+                        await interaction.user.send(embed=timeout_embed)
                         return
-
-                    attempts_left -= 1
-                    multiplier -= 0.2  # 시도마다 0.2씩 감소하도록 변경
-                    self.active_games[interaction.user.id] = (target_number, bet_amount, attempts_left, multiplier)
-
-                    result_embed = discord.Embed(
-                        title="⚾ 숫자야구 결과",
-                        description=f"✅ **{strikes} 스트라이크 / {balls} 볼**\n"
-                                  f"남은 기회 🔄️ ***{attempts_left}번***",
-                        color=0xffcc00
-                    )
-                    await interaction.user.send(embed=result_embed)
-                except asyncio.TimeoutError:
-                    timeout_embed = discord.Embed(
-                        title="⏰ 시간 초과",
-                        description="시간이 초과되었습니다. 게임이 종료됩니다.",
-                        color=0xff0000
-                    )
-                    await interaction.user.send(embed=timeout_embed)
-                    del self.active_games[interaction.user.id]
-                    return
-            # 봇 잔고 추가
-            await update_balance(bot.user.id, bet_amount)
-            # DM으로 결과 전송
-            lose_embed = discord.Embed(
-                title="😢 게임 종료",
-                description=f"아쉽게도 모든 기회를 사용했습니다. 정답은 {target_number}였습니다.",
-                color=0xff0000
-            )
-            await interaction.user.send(embed=lose_embed)
-            # 원래 채널에 결과 전송
-            channel_lose_embed = discord.Embed(
-                title="😢 숫자야구 게임 종료",
-                description=f"{interaction.user.mention}님의 숫자야구 게임이 종료되었습니다. 아쉽게도 정답을 맞추지 못하여 💸 ***{bet_amount}원**을 잃었습니다.*",
-                color=0xff0000
-            )
-            await interaction.channel.send(embed=channel_lose_embed)
-            del self.active_games[interaction.user.id]
+                # 봇 잔고 추가
+                await update_balance(bot.user.id, bet_amount)
+                # DM으로 결과 전송
+                lose_embed = discord.Embed(
+                    title="😢 게임 종료",
+                    description=f"아쉽게도 모든 기회를 사용했습니다. 정답은 {target_number}였습니다.",
+                    color=0xff0000
+                )
+                await interaction.user.send(embed=lose_embed)
+                # 원래 채널에 결과 전송
+                channel_lose_embed = discord.Embed(
+                    title="😢 숫자야구 게임 종료",
+                    description=f"{interaction.user.mention}님의 숫자야구 게임이 종료되었습니다. 아쉽게도 정답을 맞추지 못하여 💸 ***{bet_amount}원**을 잃었습니다.*",
+                    color=0xff0000
+                )
+                await interaction.channel.send(embed=channel_lose_embed)
+            finally:
+                self.end_game(interaction.user.id)
+
+    async def on_dm_message(self, message: discord.Message):
+        """진행 중인 게임이 있는 유저의 3자리 숫자 DM만 대기열로 넘깁니다."""
+        guesses = self.guess_queues.get(message.author.id)
+        if guesses is None:
+            return
+        if message.content.isdigit() and len(message.content) == 3:
+            guesses.put_nowait(message)
+
+    def end_game(self, user_id: int):
+        self.active_games.pop(user_id, None)
+        self.guess_queues.pop(user_id, None)
+
+    def cog_unload(self):
+        self.bot.router.unregister(MessageKind.DM, self.on_dm_message)
 
 
 async def setup(bot: commands.Bot):
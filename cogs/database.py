@@ -1,32 +1,140 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import List, Optional
-from database_manager import execute_query
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+import asyncpg
+from database_manager import execute_query, fetch, fetchval, transaction, get_statement_stats
+from ttl_cache import TTLCache
+import migrations
 from main import is_admin_or_developer, DEVELOPER_IDS
-import io
 import os
-
-
-async def fetch_all_data(table_name: str) -> str:
-    """특정 테이블의 모든 컬럼 데이터를 가져와 출력"""
-    try:
-        result = await execute_query(f"SELECT * FROM {table_name};")
-        if not result:
-            return "데이터가 없습니다."
-
-        # 컬럼명 가져오기
-        col_names = list(result[0].keys())
-        
-        # 데이터 출력
-        output = [" | ".join(col_names), "-" * 50]
-        for row in result:
-            output.append(" | ".join(map(str, row.values())))  # 데이터 추가
-
-        return "\n".join(output)
-
-    except Exception as e:
-        return f"데이터 조회 오류: {e}"
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# /디비조회 한 페이지에 보여줄 행 수와 표시 길이 제한
+PAGE_SIZE = 15
+MAX_CELL_LENGTH = 40
+MAX_PAGE_LENGTH = 1800
+
+# 기본 키가 없는 테이블은 ctid 순서로 페이지를 나눔
+_CTID_COLUMN = "__ctid"
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def get_primary_key(table_name: str) -> List[str]:
+    """테이블의 기본 키 컬럼 이름을 순서대로 가져옵니다."""
+    rows = await fetch("""
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = to_regclass($1) AND i.indisprimary
+        ORDER BY array_position(i.indkey::int2[], a.attnum)
+    """, f"public.{_quote_ident(table_name)}")
+    return [row['attname'] for row in rows]
+
+
+class TablePager:
+    """기본 키 순서로 마지막으로 본 키 다음부터 한 페이지씩 읽는 키셋 페이지네이션입니다."""
+
+    def __init__(self, table_name: str, key_columns: List[str]):
+        self.table_name = table_name
+        self.relation = f"public.{_quote_ident(table_name)}"
+        if key_columns:
+            self.key_columns = key_columns
+            self.key_expr = ", ".join(_quote_ident(column) for column in key_columns)
+            self.select = "*"
+        else:
+            self.key_columns = [_CTID_COLUMN]
+            self.key_expr = "ctid"
+            self.select = f"ctid AS {_CTID_COLUMN}, *"
+
+    def _query(self, after: Optional[tuple]) -> str:
+        query = f"SELECT {self.select} FROM {self.relation}"
+        if after is not None:
+            placeholders = ", ".join(f"${i}" for i in range(1, len(after) + 1))
+            query += f" WHERE ({self.key_expr}) > ({placeholders})"
+        # 다음 페이지가 있는지 알기 위해 한 행 더 읽음
+        return query + f" ORDER BY {self.key_expr} LIMIT {PAGE_SIZE + 1}"
+
+    async def fetch_page(self, after: Optional[tuple]) -> Tuple[List[asyncpg.Record], Optional[tuple], bool]:
+        """after 다음 페이지의 (행 목록, 마지막 행의 키, 다음 페이지 존재 여부)를 반환합니다."""
+        records = []
+        async with transaction() as db:
+            async for record in db.cursor(self._query(after), *(after or ()), prefetch=PAGE_SIZE + 1):
+                records.append(record)
+
+        has_next = len(records) > PAGE_SIZE
+        records = records[:PAGE_SIZE]
+        last_key = tuple(records[-1][column] for column in self.key_columns) if records else None
+        return records, last_key, has_next
+
+
+def format_page(records: List[asyncpg.Record]) -> str:
+    """한 페이지의 행을 메시지 길이 제한 안에서 표 형태의 문자열로 만듭니다."""
+    if not records:
+        return "데이터가 없습니다."
+
+    def cell(value) -> str:
+        text = str(value)
+        return text if len(text) <= MAX_CELL_LENGTH else text[:MAX_CELL_LENGTH - 1] + "…"
+
+    columns = [column for column in records[0].keys() if column != _CTID_COLUMN]
+    output = [" | ".join(columns), "-" * 50]
+    length = sum(len(line) + 1 for line in output)
+    for record in records:
+        line = " | ".join(cell(record[column]) for column in columns)
+        if length + len(line) + 1 > MAX_PAGE_LENGTH:
+            output.append("…")
+            break
+        output.append(line)
+        length += len(line) + 1
+    return "\n".join(output)
+
+
+class TablePageView(discord.ui.View):
+    """/디비조회 결과를 한 페이지씩 넘겨보는 뷰. 현재 페이지만 메모리에 둡니다."""
+
+    def __init__(self, owner_id: int, pager: TablePager):
+        super().__init__(timeout=300)
+        self.owner_id = owner_id
+        self.pager = pager
+        # 방문한 페이지마다 시작 키(이전 페이지의 마지막 키)만 보관
+        self.starts: List[Optional[tuple]] = [None]
+        self.next_key: Optional[tuple] = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message("명령어를 실행한 사용자만 페이지를 넘길 수 있습니다.", ephemeral=True)
+            return False
+        return True
+
+    async def load(self) -> str:
+        """현재 페이지를 읽고 메시지 내용을 반환합니다."""
+        records, self.next_key, has_next = await self.pager.fetch_page(self.starts[-1])
+        self.previous_page.disabled = len(self.starts) == 1
+        self.next_page.disabled = not has_next
+        return (
+            f"**{self.pager.table_name}** 테이블의 데이터 ({len(self.starts)}페이지):\n"
+            f"```\n{format_page(records)}\n```"
+        )
+
+    @discord.ui.button(label="◀ 이전", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if len(self.starts) > 1:
+            self.starts.pop()
+        await interaction.response.edit_message(content=await self.load(), view=self)
+
+    @discord.ui.button(label="다음 ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.next_key is not None:
+            self.starts.append(self.next_key)
+        await interaction.response.edit_message(content=await self.load(), view=self)
 
 
 class TableNameTransformer(app_commands.Transformer):
@@ -52,22 +160,87 @@ async def get_table_list() -> List[str]:
         """)
         return [row['tablename'] for row in result] if result else []
     except Exception as e:
-        print(f"테이블 목록 조회 오류: {e}")
+        logger.error(f"테이블 목록 조회 오류: {e}")
         return []
 
 
+# /디비구조 결과 캐시 (정확한 행 수 여부 -> 테이블 구조 목록)
+_structure_cache = TTLCache(maxsize=2, ttl=30)
+
+
+async def get_db_structure(exact_count: bool = False) -> List[Dict[str, Any]]:
+    """모든 public 테이블의 컬럼 정보와 행 수를 한 번의 카탈로그 쿼리로 가져옵니다.
+
+    행 수는 기본적으로 pg_class.reltuples 추정치를 사용하고,
+    exact_count=True이면 테이블별 COUNT(*)를 동시에 실행해 정확한 값으로 바꿉니다.
+    """
+    cached = _structure_cache.get(exact_count)
+    if cached is not None:
+        return cached
+
+    rows = await fetch("""
+        SELECT
+            c.relname AS table_name,
+            c.reltuples::bigint AS estimated_rows,
+            a.attname AS column_name,
+            format_type(a.atttypid, a.atttypmod) AS data_type,
+            a.attnotnull AS not_null
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p')
+        ORDER BY c.relname, a.attnum
+    """)
+
+    tables: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        table = tables.setdefault(row['table_name'], {
+            'name': row['table_name'],
+            # 한 번도 ANALYZE 되지 않은 테이블은 -1
+            'rows': row['estimated_rows'] if row['estimated_rows'] >= 0 else None,
+            'exact': False,
+            'columns': []
+        })
+        table['columns'].append((row['column_name'], row['data_type'], row['not_null']))
+
+    if exact_count and tables:
+        counts = await asyncio.gather(*(
+            fetchval(f"SELECT COUNT(*) FROM public.{_quote_ident(name)}") for name in tables
+        ))
+        for table, count in zip(tables.values(), counts):
+            table['rows'] = count
+            table['exact'] = True
+
+    structure = list(tables.values())
+    _structure_cache.set(exact_count, structure)
+    return structure
+
+
 class Database(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.db_initialized = False
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """봇이 준비되면 데이터베이스 초기화를 시작합니다."""
-        if not self.db_initialized:
-            print("Bot is ready, starting database initialization...")
-            await initialize_database()
-            self.db_initialized = True
+    @app_commands.command(name="디비마이그레이션", description="sql/ 스크립트 중 적용이 필요한 것을 확인하거나 적용합니다. (개발자 전용)")
+    @app_commands.describe(dry_run="True이면 적용하지 않고 목록만 보여줍니다.")
+    async def run_migrations(self, interaction: discord.Interaction, dry_run: bool = True):
+        if interaction.user.id not in DEVELOPER_IDS:
+            await interaction.response.send_message("❌ 이 명령어는 개발자만 사용할 수 있습니다!", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            items = await migrations.migrate(dry_run=dry_run)
+        except Exception as e:
+            await interaction.followup.send(f"❌ 마이그레이션 확인 중 오류가 발생했습니다.\n`{e}`", ephemeral=True)
+            return
+
+        if not items:
+            await interaction.followup.send("✅ 적용할 마이그레이션이 없습니다.", ephemeral=True)
+            return
+
+        title = "적용 예정 마이그레이션" if dry_run else "마이그레이션 적용 결과 (자세한 결과는 로그 확인)"
+        lines = [f"- {item.migration.name} ({'신규' if item.reason == 'new' else '변경됨'})" for item in items]
+        await interaction.followup.send(f"**{title}**\n" + "\n".join(lines), ephemeral=True)
 
     @app_commands.command(name="db실행", description="SQL 파일을 실행하여 데이터베이스를 설정합니다. (개발자 전용)")
     @app_commands.describe(filename="실행할 SQL 파일 이름을 입력하세요 (예: create_game_tables.sql)")
@@ -121,7 +294,7 @@ class Database(commands.Cog):
             await interaction.response.send_message(embed=error_embed, ephemeral=True)
             return
 
-        print(f"디비테스트 명령어 실행 - 요청자: {interaction.user.name}", flush=True)
+        logger.info(f"디비테스트 명령어 실행 - 요청자: {interaction.user.name}")
 
         try:
             # 테이블 존재 여부 확인
@@ -155,7 +328,8 @@ class Database(commands.Cog):
             await interaction.response.send_message(embed=error_embed, ephemeral=True)
 
     @app_commands.command(name="디비구조", description="데이터베이스의 테이블 구조와 현황을 확인합니다. (개발자 전용)")
-    async def check_db_structure(self, interaction: discord.Interaction):
+    @app_commands.describe(exact_count="추정치 대신 정확한 행 수를 셉니다. (느릴 수 있음)")
+    async def check_db_structure(self, interaction: discord.Interaction, exact_count: bool = False):
         # 개발자 권한 확인
         if not is_admin_or_developer(interaction):
             error_embed = discord.Embed(
@@ -166,34 +340,29 @@ class Database(commands.Cog):
             await interaction.response.send_message(embed=error_embed, ephemeral=True)
             return
 
+        # 정확한 행 수를 세는 경우 3초 안에 응답하지 못할 수 있으므로 먼저 응답을 미룸
+        await interaction.response.defer(ephemeral=True)
+
         try:
-            # 테이블 목록 조회
-            tables = await get_table_list()
+            tables = await get_db_structure(exact_count)
             if not tables:
-                await interaction.response.send_message("데이터베이스에 테이블이 없습니다.", ephemeral=True)
+                await interaction.followup.send("데이터베이스에 테이블이 없습니다.", ephemeral=True)
                 return
 
-            # 각 테이블의 구조와 데이터 수 조회
             structure_info = []
             for table in tables:
-                # 테이블 구조 조회
-                columns = await execute_query(f"""
-                    SELECT column_name, data_type, is_nullable
-                    FROM information_schema.columns
-                    WHERE table_name = '{table}'
-                    ORDER BY ordinal_position;
-                """)
-                
-                # 데이터 수 조회
-                count = await execute_query(f"SELECT COUNT(*) FROM {table};")
-                row_count = count[0]['count'] if count else 0
-
-                # 테이블 정보 구성
-                table_info = [f"**{table}** (총 {row_count}개 행)"]
-                for col in columns:
-                    nullable = "NULL" if col['is_nullable'] == 'YES' else "NOT NULL"
-                    table_info.append(f"- {col['column_name']}: {col['data_type']} {nullable}")
-                
+                if table['rows'] is None:
+                    row_count = "행 수 알 수 없음"
+                elif table['exact']:
+                    row_count = f"총 {table['rows']}개 행"
+                else:
+                    row_count = f"약 {table['rows']}개 행"
+
+                table_info = [f"**{table['name']}** ({row_count})"]
+                for column_name, data_type, not_null in table['columns']:
+                    nullable = "NOT NULL" if not_null else "NULL"
+                    table_info.append(f"- {column_name}: {data_type} {nullable}")
+
                 structure_info.append("\n".join(table_info))
 
             # 결과 메시지 구성
@@ -202,7 +371,7 @@ class Database(commands.Cog):
                 description="\n\n".join(structure_info),
                 color=0x00ff00
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
 
         except Exception as e:
             error_embed = discord.Embed(
@@ -210,7 +379,33 @@ class Database(commands.Cog):
                 description=f"데이터베이스 구조 조회 중 오류가 발생했습니다.\n오류: {str(e)}",
                 color=0xff0000
             )
+            await interaction.followup.send(embed=error_embed, ephemeral=True)
+
+    @app_commands.command(name="디비통계", description="자주 쓰는 쿼리의 호출 수와 지연 시간을 확인합니다. (개발자 전용)")
+    async def show_statement_stats(self, interaction: discord.Interaction):
+        # 개발자 권한 확인
+        if not is_admin_or_developer(interaction):
+            error_embed = discord.Embed(
+                title="❌ 권한 오류",
+                description="이 명령어는 개발자만 사용할 수 있습니다!",
+                color=0xff0000
+            )
             await interaction.response.send_message(embed=error_embed, ephemeral=True)
+            return
+
+        stats = get_statement_stats()
+        if not stats:
+            await interaction.response.send_message("아직 실행된 쿼리가 없습니다.", ephemeral=True)
+            return
+
+        lines = ["이름                 호출     평균(ms)  최대(ms)", "-" * 48]
+        for name, stat in sorted(stats.items(), key=lambda item: item[1]['calls'], reverse=True):
+            lines.append(f"{name:<20} {stat['calls']:>6} {stat['avg_ms']:>10.2f} {stat['max_ms']:>9.2f}")
+
+        await interaction.response.send_message(
+            "**쿼리 실행 통계**\n```\n" + "\n".join(lines) + "\n```",
+            ephemeral=True
+        )
 
     @app_commands.command(name="디비조회", description="데이터베이스의 테이블 내용을 조회합니다. (개발자 전용)")
     @app_commands.describe(table_name="조회할 테이블을 선택하세요.")
@@ -227,25 +422,14 @@ class Database(commands.Cog):
             return
 
         try:
-            # 테이블 데이터 조회
-            data = await fetch_all_data(table_name)
-            
-            # 결과가 너무 길 경우 파일로 전송
-            if len(data) > 1900:
-                file = discord.File(
-                    io.StringIO(data),
-                    filename=f"{table_name}_data.txt"
-                )
-                await interaction.response.send_message(
-                    f"**{table_name}** 테이블의 데이터가 너무 길어 파일로 전송합니다.",
-                    file=file,
-                    ephemeral=True
-                )
-            else:
-                await interaction.response.send_message(
-                    f"**{table_name}** 테이블의 데이터:\n```\n{data}\n```",
-                    ephemeral=True
-                )
+            # 자동완성을 거치지 않은 이름은 거부
+            if table_name not in await get_table_list():
+                await interaction.response.send_message(f"❌ '{table_name}' 테이블을 찾을 수 없습니다.", ephemeral=True)
+                return
+
+            # 첫 페이지만 읽어서 전송하고, 이후 페이지는 버튼으로 이어서 조회
+            view = TablePageView(interaction.user.id, TablePager(table_name, await get_primary_key(table_name)))
+            await interaction.response.send_message(await view.load(), view=view, ephemeral=True)
 
         except Exception as e:
             error_embed = discord.Embed(
@@ -256,86 +440,5 @@ class Database(commands.Cog):
             await interaction.response.send_message(embed=error_embed, ephemeral=True)
 
 
-async def initialize_database():
-    """데이터베이스를 초기화하고 모든 테이블 생성 및 데이터 업데이트를 수행합니다."""
-    try:
-        print("데이터베이스 초기화 시작...")
-        # 1. 모든 게임 테이블 생성 (스크립트 전체를 단일 명령으로 실행)
-        sql_file_path = 'sql/create_game_tables.sql'
-        with open(sql_file_path, 'r', encoding='utf-8') as f:
-            sql_script = f.read()
-            if sql_script:  # 파일이 비어있지 않은지 확인
-                await execute_query(sql_script)
-        print("✅ 기본 테이블 구조 생성 완료.")
-
-        # 2. 데이터 버전 확인 및 업데이트 적용
-        await check_and_apply_updates()
-
-    except Exception as e:
-        import traceback
-        print(f"❌ 데이터베이스 초기화 중 심각한 오류 발생: {e}")
-        traceback.print_exc()
-
-
-async def check_and_apply_updates():
-    """sql/updates 폴더를 확인하여 데이터베이스 업데이트를 자동으로 적용합니다."""
-    print("데이터 업데이트 확인 시작...")
-    updates_path = 'sql/updates'
-    if not os.path.exists(updates_path):
-        print("`sql/updates` 폴더가 존재하지 않아 업데이트를 건너뜁니다.")
-        return
-
-    try:
-        # 데이터 타입별 현재 DB 버전 가져오기
-        db_versions_records = await execute_query("SELECT data_type, version FROM game_data_versions")
-        db_versions = {rec['data_type']: rec['version'] for rec in db_versions_records}
-
-        # 업데이트 파일 목록 가져오기 및 파싱
-        update_files = sorted(os.listdir(updates_path))
-        
-        # 데이터 타입별로 업데이트할 파일들을 정리
-        updates_to_apply = {}
-        for filename in update_files:
-            if filename.endswith(".sql"):
-                parts = filename[:-4].split('_v')
-                if len(parts) == 2:
-                    data_type, version_str = parts
-                    try:
-                        version = int(version_str)
-                        if data_type not in updates_to_apply:
-                            updates_to_apply[data_type] = []
-                        updates_to_apply[data_type].append({'version': version, 'filename': filename})
-                    except ValueError:
-                        continue # 버전이 숫자가 아닌 파일은 무시
-
-        # 각 데이터 타입에 대해 버전 비교 및 스크립트 실행
-        for data_type, files in updates_to_apply.items():
-            current_db_version = db_versions.get(data_type, 0)
-            
-            # 버전 순으로 정렬
-            sorted_files = sorted(files, key=lambda x: x['version'])
-
-            for file_info in sorted_files:
-                if file_info['version'] > current_db_version:
-                    print(f"'{data_type}' 데이터 업데이트 적용: 버전 {file_info['version']} (파일: {file_info['filename']})")
-                    file_path = os.path.join(updates_path, file_info['filename'])
-                    
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        sql_script = f.read()
-                    
-                    await execute_query(sql_script)
-                    await execute_query(
-                        "UPDATE game_data_versions SET version = $1 WHERE data_type = $2",
-                        (file_info['version'], data_type)
-                    )
-        
-        print("✅ 모든 데이터 업데이트 확인 및 적용 완료.")
-
-    except Exception as e:
-        import traceback
-        print(f"❌ 데이터 업데이트 확인 중 오류 발생: {e}")
-        traceback.print_exc()
-
-
 async def setup(bot: commands.Bot):
     await bot.add_cog(Database(bot))
@@ -1,24 +1,52 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import requests
 import os
 import re
 import subprocess
-from bs4 import BeautifulSoup
 from typing import List, Dict, Optional, Any
 import aiohttp
 import asyncio
 import uuid
 import shutil
-from PIL import Image, ImageSequence
 import hashlib
 import time
 import io
+import logging
+
+import metrics
+from debug_capture import captures
+from main import DEVELOPER_IDS
+from lazy import LazyModule
+from tracing import span
+from ttl_cache import LoadingCache, TTLCache
+from image_cache import ImageCache
+
+logger = logging.getLogger(__name__)
+
+# HTML 파서와 이미지 라이브러리는 처음 검색/변환할 때 불러옴
+bs4 = LazyModule("bs4")
+Image = LazyModule("PIL.Image")
+ImageSequence = LazyModule("PIL.ImageSequence")
 
 # 디스코드 파일 용량 제한 (8MB) 보다 약간 작은 값으로 설정 (7.5MB)
 DISCORD_MAX_FILE_SIZE = int(7.5 * 1024 * 1024)
 
+# APNG → WebP 변환 품질 탐색 설정
+WEBP_MIN_QUALITY = 35
+WEBP_MAX_QUALITY = 100
+# 전체 프레임 변환 최대 횟수와, 맞는 품질을 찾은 뒤 더 좁히지 않을 품질 범위
+WEBP_MAX_PASSES = 4
+WEBP_QUALITY_TOLERANCE = 5
+# 시작 품질 추정용 샘플 프레임 수와 두 번째 샘플 품질, 추정 크기 여유
+WEBP_SAMPLE_FRAMES = 8
+WEBP_SAMPLE_LOW_QUALITY = 50
+WEBP_TARGET_RATIO = 0.9
+
+# 변환된 이미지 디스크 캐시 위치와 최대 용량
+IMAGE_CACHE_DIR = os.getenv("DCCON_IMAGE_CACHE_DIR", "image_cache")
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("DCCON_IMAGE_CACHE_MB", "512")) * 1024 * 1024
+
 # --- 데이터베이스 함수 임포트 ---
 from database_manager import (
     add_dccon_favorite,
@@ -27,17 +55,51 @@ from database_manager import (
     is_dccon_favorited
 )
 
+# 요청별 제한 시간 (초)
+SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+DETAIL_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+IMAGE_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5)
+# CSRF 토큰은 이 시간이 지나면 목록 페이지에서 다시 받아옴
+CSRF_TOKEN_TTL = 10 * 60
+# 검색 결과와 패키지 상세 정보 캐시 유지 시간 (초)
+SEARCH_CACHE_TTL = 10 * 60
+SEARCH_CACHE_STALE = 60 * 60
+DETAILS_CACHE_TTL = 60 * 60
+DETAILS_CACHE_STALE = 24 * 60 * 60
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """디시콘 검색과 이미지 다운로드에 함께 쓰는 커넥션 풀 세션을 만듭니다."""
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=8, ttl_dns_cache=300)
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=30, connect=5),
+    )
+
+
 # DcconScraper 클래스를 디스코드 봇에 맞게 일부 수정합니다.
-# print() 대신 로깅이나 다른 방식을 사용하는 것이 좋으나, 여기서는 간단하게 유지합니다.
 class DcconScraper:
-    """DCinside 디시콘 스크래핑을 담당하는 클래스"""
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-        })
+    """DCinside 디시콘 스크래핑을 담당하는 클래스 (Dccon Cog가 소유한 aiohttp 세션 사용)"""
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
         self.csrf_token = None
+        self.csrf_token_at = 0.0
         self.base_url = "https://m.dcinside.com"
+        # 토큰 갱신이 동시에 여러 번 일어나지 않도록 함
+        self._csrf_lock = asyncio.Lock()
+        # 같은 키워드/패키지를 여러 명이 동시에 요청해도 DCinside에는 한 번만 요청
+        # 캐시가 만료된 뒤에도 STALE 시간 동안은 이전 결과를 바로 돌려주고 뒤에서 새로 고침
+        # 빈 검색 결과와 상세 정보 오류는 일시적인 실패일 수 있으므로 캐시하지 않음
+        self.search_cache = LoadingCache(
+            maxsize=256, ttl=SEARCH_CACHE_TTL, stale_ttl=SEARCH_CACHE_STALE,
+            cacheable=bool, name='디시콘 검색 캐시'
+        )
+        self.details_cache = LoadingCache(
+            maxsize=512, ttl=DETAILS_CACHE_TTL, stale_ttl=DETAILS_CACHE_STALE,
+            cacheable=lambda result: result[0] is not None, name='디시콘 상세 정보 캐시'
+        )
 
     def get_app_id(self) -> (Optional[str], Optional[str]):
         """Python 네이티브 코드로 app_id를 생성합니다. (app_id, error_message) 튜플을 반환합니다."""
@@ -47,153 +109,175 @@ class DcconScraper:
             current_time_millis = int(time.time() * 1000)
             app_id_raw = f"dcinside.app{current_time_millis}"
             app_id = hashlib.md5(app_id_raw.encode()).hexdigest()
-            print(f"✅ Python 네이티브 app_id 생성 성공: {app_id}")
+            logger.info(f"✅ Python 네이티브 app_id 생성 성공: {app_id}")
             return app_id, None
         except Exception as e:
             error = f"❌ Python 네이티브 app_id 생성 중 오류 발생: {e}"
-            print(error)
+            logger.error(error)
             return None, error
 
-    def search(self, keyword: str, limit: int = 25) -> List[Dict[str, str]]:
-        """키워드로 디시콘을 검색하고, 상위 n개의 결과를 반환합니다."""
+    def _update_csrf_token(self, soup) -> bool:
+        csrf_tag = soup.find('meta', {'name': 'csrf-token'})
+        if csrf_tag and csrf_tag.get('content'):
+            self.csrf_token = csrf_tag.get('content')
+            self.csrf_token_at = time.monotonic()
+            logger.info(f"CSRF 토큰 추출 성공: {self.csrf_token[:10]}...")
+            return True
+        logger.info("CSRF 토큰을 찾을 수 없습니다.")
+        return False
+
+    def _csrf_token_valid(self) -> bool:
+        return bool(self.csrf_token) and time.monotonic() - self.csrf_token_at < CSRF_TOKEN_TTL
+
+    async def refresh_csrf_token(self, force: bool = False) -> Optional[str]:
+        """CSRF 토큰이 없거나 오래되었으면 목록 페이지에서 새로 받아옵니다."""
+        async with self._csrf_lock:
+            if not force and self._csrf_token_valid():
+                return self.csrf_token
+            url = f"{self.base_url}/dcconShop/dcconList"
+            try:
+                with span("http.client", f"GET {url}"):
+                    async with self.session.get(url, timeout=SEARCH_TIMEOUT) as response:
+                        response.raise_for_status()
+                        text = await response.text()
+                soup = await asyncio.to_thread(bs4.BeautifulSoup, text, 'html.parser')
+                self._update_csrf_token(soup)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"❌ CSRF 토큰 갱신 중 HTTP 오류 발생: {e}")
+            return self.csrf_token
+
+    async def search(self, keyword: str, limit: int = 25) -> List[Dict[str, str]]:
+        """키워드로 디시콘을 검색하고, 상위 n개의 결과를 반환합니다. 최근 검색 결과는 캐시에서 돌려줍니다."""
+        keyword = keyword.strip()
+        return await self.search_cache.get(
+            (keyword.casefold(), limit), lambda: self._fetch_search(keyword, limit)
+        )
+
+    async def _fetch_search(self, keyword: str, limit: int) -> List[Dict[str, str]]:
         search_url = f"{self.base_url}/dcconShop/dcconList"
         params = {"s_type": "title", "s_word": keyword}
         results = []
         
-        print(f"\n--- 🔍 DCcon Scraper: 검색 시작 ---")
-        print(f"키워드: '{keyword}', URL: {search_url}, 파라미터: {params}")
+        logger.info(f"--- 🔍 DCcon Scraper: 검색 시작 ---")
+        logger.debug(f"키워드: '{keyword}', URL: {search_url}, 파라미터: {params}")
 
         try:
-            response = self.session.get(search_url, params=params)
-            print(f"응답 상태 코드: {response.status_code}")
-            response.raise_for_status()
-            
-            # --- HTML 저장 코드 추가 ---
-            try:
-                with open("dccon_search_result.html", "w", encoding="utf-8") as f:
-                    f.write(response.text)
-                print("\n[ℹ️] 디버깅을 위해 'dccon_search_result.html' 파일에 현재 HTML을 저장했습니다.")
-            except Exception as e:
-                print(f"\n[🚨] HTML 파일 저장 실패: {e}")
-            # --------------------------
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with span("http.client", f"GET {search_url}"):
+                async with self.session.get(search_url, params=params, timeout=SEARCH_TIMEOUT) as response:
+                    logger.debug(f"응답 상태 코드: {response.status}")
+                    response.raise_for_status()
+                    text = await response.text()
+                    response_url, status = str(response.url), response.status
+
+            # HTML 파싱은 CPU 작업이므로 워커 스레드에서 진행
+            results = await asyncio.to_thread(self._parse_search, text, limit)
+
+            # 디버그 캡처가 켜져 있을 때만 원문을 메모리에 보관 (결과가 비정상적으로 비면 항상 보관)
+            parse_failed = not results and "검색결과가 없습니다." not in text
+            captures.record('search', response_url, status, text, error=parse_failed)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ 검색 중 HTTP 오류 발생: {e!r}")
+        
+        except Exception as e:
+            logger.error(f"❌ 파싱 중 예기치 않은 오류 발생: {e}")
 
-            if "검색결과가 없습니다." in response.text:
-                print("페이지에 '검색결과가 없습니다.' 문구가 포함되어 있습니다.")
+        logger.info(f"--- ✅ 검색 및 파싱 완료 ---")
+        logger.info(f"최종적으로 {len(results)}개의 디시콘 정보를 추출했습니다.")
+        return results
 
-            csrf_tag = soup.find('meta', {'name': 'csrf-token'})
-            if csrf_tag:
-                self.csrf_token = csrf_tag.get('content')
-                print(f"CSRF 토큰 추출 성공: {self.csrf_token[:10]}...")
-            else:
-                print("CSRF 토큰을 찾을 수 없습니다.")
+    def _parse_search(self, text: str, limit: int) -> List[Dict[str, str]]:
+        results = []
+        soup = bs4.BeautifulSoup(text, 'html.parser')
 
-            items_container = soup.select_one("#dcconList")
-            if not items_container:
-                print("\n[🚨 크리티컬 오류] 디시콘 목록 컨테이너('#dcconList')를 찾지 못했습니다.")
-                print("--- 수신된 전체 HTML ---")
-                print(soup.prettify())
-                print("------------------------")
-                return []
+        if "검색결과가 없습니다." in text:
+            logger.info("페이지에 '검색결과가 없습니다.' 문구가 포함되어 있습니다.")
 
-            items = items_container.select("li.lst-item")
-            print(f"\n[📊 파싱 시작] '{items_container.get('id', 'ID 없음')}' 컨테이너에서 {len(items)}개의 아이템 발견")
+        self._update_csrf_token(soup)
 
-            for i, item in enumerate(items[:limit]):
-                print(f"\n--- {i+1}번째 아이템 처리 ---")
-                
-                title = "N/A"
-                title_tag = item.select_one('div.thum-txt span.name')
-                if title_tag:
-                    author_span = title_tag.find('span', class_='namein')
-                    if author_span:
-                        author_span.decompose()
-                        print("  - 제작자 이름(span.namein) 제거 완료")
-                    title = title_tag.text.strip()
-                    print(f"  - 제목 추출 성공: '{title}'")
-                else:
-                    print("  - 🚨 제목 태그('div.thum-txt span.name')를 찾지 못함")
-
-                package_idx = "N/A"
-                link_tag = item.select_one('a')
-                if link_tag and link_tag.has_attr('href'):
-                    href = link_tag['href']
-                    print(f"  - 링크 href 발견: {href}")
-                    match = re.search(r"viewDcconDetail\('(\d+)'", href)
-                    if match:
-                        package_idx = match.group(1)
-                        print(f"  - ID 추출 성공: '{package_idx}'")
-                    else:
-                        print("  - 🚨 href에서 정규식으로 ID 추출 실패")
-                else:
-                    print("  - 🚨 링크 태그('a') 또는 href 속성을 찾지 못함")
-
-                thumbnail_url = "N/A"
-                img_tag = item.select_one('div.thum-img img')
-                if img_tag and img_tag.has_attr('src'):
-                    thumbnail_url = img_tag['src']
-                    print(f"  - 썸네일 URL 추출 성공: {thumbnail_url}")
-
-                    # URL이 완전한 형태인지 확인하고, 아니라면 수정
-                    if thumbnail_url.startswith('//'):
-                        thumbnail_url = 'https:' + thumbnail_url
-                        print(f"  - URL 수정됨 (// 접두사): {thumbnail_url}")
-                    elif not thumbnail_url.startswith('http'):
-                        # m.dcinside.com을 기준으로 한 상대 경로일 수 있음
-                        # 하지만 dcimg5.dcinside.com과 같은 다른 도메인일 가능성이 높음
-                        # dccon.php로 시작하는 경우를 특정하여 처리
-                        if thumbnail_url.startswith('/dccon.php'):
-                             thumbnail_url = 'https://dcimg5.dcinside.com' + thumbnail_url
-                             print(f"  - URL 수정됨 (상대 경로): {thumbnail_url}")
-                        else: # 그 외의 경우는 일단 기본 도메인을 붙여봄
-                             thumbnail_url = self.base_url + thumbnail_url
-                             print(f"  - URL 수정됨 (기타 상대 경로): {thumbnail_url}")
+        items_container = soup.select_one("#dcconList")
+        if not items_container:
+            logger.error("[🚨 크리티컬 오류] 디시콘 목록 컨테이너('#dcconList')를 찾지 못했습니다. (원문은 /디시콘캡처로 확인)")
+            return []
 
+        items = items_container.select("li.lst-item")
+        logger.info(f"[📊 파싱 시작] '{items_container.get('id', 'ID 없음')}' 컨테이너에서 {len(items)}개의 아이템 발견")
+
+        for i, item in enumerate(items[:limit]):
+            logger.debug(f"--- {i+1}번째 아이템 처리 ---")
+            
+            title = "N/A"
+            title_tag = item.select_one('div.thum-txt span.name')
+            if title_tag:
+                author_span = title_tag.find('span', class_='namein')
+                if author_span:
+                    author_span.decompose()
+                    logger.debug("  - 제작자 이름(span.namein) 제거 완료")
+                title = title_tag.text.strip()
+                logger.debug(f"  - 제목 추출 성공: '{title}'")
+            else:
+                logger.warning("  - 🚨 제목 태그('div.thum-txt span.name')를 찾지 못함")
+
+            package_idx = "N/A"
+            link_tag = item.select_one('a')
+            if link_tag and link_tag.has_attr('href'):
+                href = link_tag['href']
+                logger.debug(f"  - 링크 href 발견: {href}")
+                match = re.search(r"viewDcconDetail\('(\d+)'", href)
+                if match:
+                    package_idx = match.group(1)
+                    logger.debug(f"  - ID 추출 성공: '{package_idx}'")
                 else:
-                    print("  - 🚨 이미지 태그('div.thum-img img') 또는 src 속성을 찾지 못함")
-                
-                description = "설명 없음"
-                # 올바른 선택자로 수정: 'div.thum-txt' 아래의 'span.caption'
-                desc_tag = item.select_one('div.thum-txt > span.caption')
-                if desc_tag:
-                    description = desc_tag.text.strip()
-                    print(f"  - 설명 추출 성공: '{description[:30]}...'")
-                else:
-                    print("  - ℹ️ 설명 태그('div.thum-txt > span.caption')를 찾지 못함 (선택 사항)")
-
-                if title != "N/A" and package_idx != "N/A" and thumbnail_url != "N/A":
-                    results.append({
-                        "name": title,
-                        "package_idx": package_idx,
-                        "thumbnail_url": thumbnail_url,
-                        "description": description
-                    })
-                    print("  -> ✅ 모든 정보 추출 성공. 결과에 추가합니다.")
-                else:
-                    print("  -> ❌ 일부 정보 추출 실패. 이 아이템은 건너뜁니다.")
-        
-        except requests.exceptions.RequestException as e:
-            print(f"❌ 검색 중 HTTP 오류 발생: {e}")
-        
-        except Exception as e:
-            print(f"❌ 파싱 중 예기치 않은 오류 발생: {e}")
+                    logger.warning("  - 🚨 href에서 정규식으로 ID 추출 실패")
+            else:
+                logger.warning("  - 🚨 링크 태그('a') 또는 href 속성을 찾지 못함")
+
+            thumbnail_url = "N/A"
+            img_tag = item.select_one('div.thum-img img')
+            if img_tag and img_tag.has_attr('src'):
+                thumbnail_url = img_tag['src']
+                logger.debug(f"  - 썸네일 URL 추출 성공: {thumbnail_url}")
+
+                # URL이 완전한 형태인지 확인하고, 아니라면 수정
+                if thumbnail_url.startswith('//'):
+                    thumbnail_url = 'https:' + thumbnail_url
+                    logger.debug(f"  - URL 수정됨 (// 접두사): {thumbnail_url}")
+                elif not thumbnail_url.startswith('http'):
+                    # m.dcinside.com을 기준으로 한 상대 경로일 수 있음
+                    # 하지만 dcimg5.dcinside.com과 같은 다른 도메인일 가능성이 높음
+                    # dccon.php로 시작하는 경우를 특정하여 처리
+                    if thumbnail_url.startswith('/dccon.php'):
+                         thumbnail_url = 'https://dcimg5.dcinside.com' + thumbnail_url
+                         logger.debug(f"  - URL 수정됨 (상대 경로): {thumbnail_url}")
+                    else: # 그 외의 경우는 일단 기본 도메인을 붙여봄
+                         thumbnail_url = self.base_url + thumbnail_url
+                         logger.debug(f"  - URL 수정됨 (기타 상대 경로): {thumbnail_url}")
 
-        print(f"\n--- ✅ 검색 및 파싱 완료 ---")
-        print(f"최종적으로 {len(results)}개의 디시콘 정보를 추출했습니다.")
+            else:
+                logger.warning("  - 🚨 이미지 태그('div.thum-img img') 또는 src 속성을 찾지 못함")
+            
+            description = "설명 없음"
+            # 올바른 선택자로 수정: 'div.thum-txt' 아래의 'span.caption'
+            desc_tag = item.select_one('div.thum-txt > span.caption')
+            if desc_tag:
+                description = desc_tag.text.strip()
+                logger.debug(f"  - 설명 추출 성공: '{description[:30]}...'")
+            else:
+                logger.debug("  - ℹ️ 설명 태그('div.thum-txt > span.caption')를 찾지 못함 (선택 사항)")
+
+            if title != "N/A" and package_idx != "N/A" and thumbnail_url != "N/A":
+                results.append({
+                    "name": title,
+                    "package_idx": package_idx,
+                    "thumbnail_url": thumbnail_url,
+                    "description": description
+                })
+                logger.debug("  -> ✅ 모든 정보 추출 성공. 결과에 추가합니다.")
+            else:
+                logger.error("  -> ❌ 일부 정보 추출 실패. 이 아이템은 건너뜁니다.")
         return results
 
-    def get_details(self, package_idx: str) -> (Optional[Dict[str, Any]], Optional[str]):
-        """패키지 ID로 디시콘 상세 정보(정보, 이미지 URL 및 캡션 목록)를 가져옵니다."""
-        if not self.csrf_token:
-            error = "❌ CSRF 토큰이 없습니다. search()를 먼저 호출해야 합니다."
-            print(error)
-            return None, error
-
-        app_id, error_msg = self.get_app_id()
-        if error_msg:
-            return None, error_msg
-
+    async def _post_details(self, package_idx: str, app_id: str) -> (int, str):
         detail_url = f"{self.base_url}/dccon/getDcconDetail"
         data = {"dcconInfo": package_idx, "app_id": app_id}
         headers = {
@@ -201,44 +285,79 @@ class DcconScraper:
             "X-Requested-With": "XMLHttpRequest",
             "X-CSRF-TOKEN": self.csrf_token
         }
-        
+        with span("http.client", f"POST {detail_url}"):
+            async with self.session.post(detail_url, data=data, headers=headers, timeout=DETAIL_TIMEOUT) as response:
+                return response.status, await response.text()
+
+    async def get_details(self, package_idx: str) -> (Optional[Dict[str, Any]], Optional[str]):
+        """패키지 ID로 디시콘 상세 정보(정보, 이미지 URL 및 캡션 목록)를 가져옵니다. 성공한 결과는 캐시합니다."""
+        return await self.details_cache.get(package_idx, lambda: self._fetch_details(package_idx))
+
+    async def _fetch_details(self, package_idx: str) -> (Optional[Dict[str, Any]], Optional[str]):
+        if not await self.refresh_csrf_token():
+            error = "❌ CSRF 토큰을 가져오지 못했습니다."
+            logger.error(error)
+            return None, error
+
+        app_id, error_msg = self.get_app_id()
+        if error_msg:
+            return None, error_msg
+
         try:
-            response = self.session.post(detail_url, data=data, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            info = {}
-            info['title'] = (soup.select_one('div.top-tit > span.name') or soup.new_tag('span')).text.strip()
-            info['maker'] = (soup.select_one('div.make > span.by') or soup.new_tag('span')).text.strip()
-            info['description'] = (soup.select_one('div.txt') or soup.new_tag('p')).text.strip()
-            
-            main_img_tag = soup.select_one('div.dccon-caption-box div.thum-img > img')
-            info['main_img_url'] = main_img_tag['src'] if main_img_tag else None
-
-            images_data = []
-            for img_tag in soup.select('ul.dccon-img-lst img'):
-                if img_tag.has_attr('src'):
-                    images_data.append({
-                        "url": img_tag['src'],
-                        "caption": img_tag.get('alt', '').strip()  # alt 속성을 캡션으로 사용
-                    })
-            
-            if not images_data: 
+            status, text = await self._post_details(package_idx, app_id)
+            # 토큰이 만료되면 403/419 또는 빈 응답이 오므로 한 번만 새 토큰으로 다시 시도
+            if status in (403, 419) or (status == 200 and not text.strip()):
+                logger.info(f"상세 정보 요청 거부됨 (상태 코드: {status}). CSRF 토큰을 갱신해 다시 시도합니다.")
+                if await self.refresh_csrf_token(force=True):
+                    status, text = await self._post_details(package_idx, app_id)
+            capture_url = f"{self.base_url}/dccon/getDcconDetail?dcconInfo={package_idx}"
+            if status >= 400:
+                captures.record('detail', capture_url, status, text, error=True)
+                error = f"❌ 상세 정보 요청 실패 (상태 코드: {status})"
+                logger.error(error)
+                return None, error
+
+            details = await asyncio.to_thread(self._parse_details, text)
+            captures.record('detail', capture_url, status, text, error=details is None)
+            if details is None:
                 error = "❌ 상세 정보 HTML 파싱 후 이미지 목록을 찾지 못했습니다."
-                print(error)
+                logger.error(error)
                 return None, error
-            return {'info': info, 'images': images_data}, None
+            return details, None
 
-        except requests.exceptions.RequestException as e:
-            error = f"❌ 상세 정보 요청 중 네트워크 오류 발생: {e}"
-            print(error)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = f"❌ 상세 정보 요청 중 네트워크 오류 발생: {e!r}"
+            logger.error(error)
             return None, error
         except Exception as e:
             import traceback
             error = f"❌ 상세 정보 파싱 중 알 수 없는 오류 발생:\n{traceback.format_exc()}"
-            print(error)
+            logger.error(error)
             return None, error
 
+    def _parse_details(self, text: str) -> Optional[Dict[str, Any]]:
+        soup = bs4.BeautifulSoup(text, 'html.parser')
+
+        info = {}
+        info['title'] = (soup.select_one('div.top-tit > span.name') or soup.new_tag('span')).text.strip()
+        info['maker'] = (soup.select_one('div.make > span.by') or soup.new_tag('span')).text.strip()
+        info['description'] = (soup.select_one('div.txt') or soup.new_tag('p')).text.strip()
+        
+        main_img_tag = soup.select_one('div.dccon-caption-box div.thum-img > img')
+        info['main_img_url'] = main_img_tag['src'] if main_img_tag else None
+
+        images_data = []
+        for img_tag in soup.select('ul.dccon-img-lst img'):
+            if img_tag.has_attr('src'):
+                images_data.append({
+                    "url": img_tag['src'],
+                    "caption": img_tag.get('alt', '').strip()  # alt 속성을 캡션으로 사용
+                })
+
+        if not images_data:
+            return None
+        return {'info': info, 'images': images_data}
+
 
 # --- 즐겨찾기 뷰 ---
 class FavoriteDcconView(discord.ui.View):
@@ -278,10 +397,7 @@ class FavoriteDcconView(discord.ui.View):
         if delete_button: delete_button.disabled = is_empty
 
     async def _cleanup_file(self):
-        if self.current_temp_file_path and os.path.exists(self.current_temp_file_path):
-            try:
-                os.remove(self.current_temp_file_path)
-            except OSError: pass
+        # 이미지 파일은 캐시가 관리하므로 참조만 놓음
         self.current_temp_file_path = None
 
     async def show_current_page(self, interaction: discord.Interaction):
@@ -297,8 +413,7 @@ class FavoriteDcconView(discord.ui.View):
         fav = self.favorites[self.current_page]
         image_url = fav['image_url']
         
-        async with aiohttp.ClientSession() as session:
-            path, error, dims = await self.cog.download_image(session, image_url)
+        path, error, dims = await self.cog.download_image(self.cog.session, image_url, package_key=fav['dccon_title'])
         
         if error:
             await interaction.response.edit_message(content=f"오류: 이미지를 불러올 수 없습니다.\n> {error}", view=self, embed=None, attachments=[])
@@ -340,9 +455,9 @@ class FavoriteDcconView(discord.ui.View):
         try:
             # 100x100 이미지는 200x200으로 확대해서 전송
             if self.current_image_dimensions == (100, 100):
-                print(f"INFO: 100x100 즐겨찾기 이미지 전송 시 200x200으로 확대합니다.")
-                base, ext = os.path.splitext(self.current_temp_file_path)
-                upscaled_filepath = f"{base}_200px{ext}"
+                logger.info(f"100x100 즐겨찾기 이미지 전송 시 200x200으로 확대합니다.")
+                ext = os.path.splitext(self.current_temp_file_path)[1]
+                upscaled_filepath = os.path.join(self.cog.temp_dir, f"{uuid.uuid4()}_200px{ext}")
                 with Image.open(self.current_temp_file_path) as img:
                     resize_method = Image.Resampling.NEAREST
                     if hasattr(img, 'n_frames') and img.n_frames > 1:
@@ -457,12 +572,7 @@ class DcconImageView(discord.ui.View):
         if select_button: select_button.disabled = is_errored
 
     async def _cleanup_previous_file(self):
-        """이전 임시 파일을 삭제합니다."""
-        if self.current_temp_file_path and os.path.exists(self.current_temp_file_path):
-            try:
-                os.remove(self.current_temp_file_path)
-            except OSError as e:
-                print(f"🚨 임시 파일 삭제 실패: {e}")
+        """이전 이미지 참조를 놓습니다. 파일은 이미지 캐시가 관리합니다."""
         self.current_temp_file_path = None
         self.current_error = None
         
@@ -478,8 +588,7 @@ class DcconImageView(discord.ui.View):
         current_url = self.images_data[self.current_page]['url']
 
         # 이미지 다운로드 및 처리
-        async with aiohttp.ClientSession() as session:
-            path, error, dims = await self.cog.download_image(session, current_url)
+        path, error, dims = await self.cog.download_image(self.cog.session, current_url, package_key=self.title)
         
         self.current_temp_file_path = path
         self.current_error = error
@@ -523,7 +632,7 @@ class DcconImageView(discord.ui.View):
             success = await add_dccon_favorite(self.author.id, self.title, current_image_url)
             if success:
                 await interaction.response.send_message("✅ 즐겨찾기에 추가했습니다!", ephemeral=True)
-                print(f"[✅] 즐겨찾기 저장 (URL): {self.author.id} -> {current_image_url}")
+                logger.info(f"[✅] 즐겨찾기 저장 (URL): {self.author.id} -> {current_image_url}")
             else:
                 await interaction.response.send_message("즐겨찾기 추가에 실패했습니다. (DB 오류)", ephemeral=True)
         except Exception as e:
@@ -544,9 +653,9 @@ class DcconImageView(discord.ui.View):
         try:
             # 100x100 이미지는 200x200으로 확대해서 전송
             if self.current_image_dimensions == (100, 100):
-                print(f"INFO: 100x100 이미지 전송 시 200x200으로 확대합니다.")
-                base, ext = os.path.splitext(self.current_temp_file_path)
-                upscaled_filepath = f"{base}_200px{ext}"
+                logger.info(f"100x100 이미지 전송 시 200x200으로 확대합니다.")
+                ext = os.path.splitext(self.current_temp_file_path)[1]
+                upscaled_filepath = os.path.join(self.cog.temp_dir, f"{uuid.uuid4()}_200px{ext}")
                 with Image.open(self.current_temp_file_path) as img:
                     resize_method = Image.Resampling.NEAREST
                     if hasattr(img, 'n_frames') and img.n_frames > 1:
@@ -594,7 +703,7 @@ class DcconImageView(discord.ui.View):
 
     async def on_timeout(self):
         """타임아웃 시 버튼을 비활성화하고 임시 파일을 삭제합니다."""
-        print("\n[⏰] 뷰어 타임아웃. 임시 파일 정리를 시작합니다...")
+        logger.info("[⏰] 뷰어 타임아웃. 임시 파일 정리를 시작합니다...")
         for item in self.children:
             item.disabled = True
         
@@ -629,7 +738,7 @@ class DcconSelect(discord.ui.Select):
         )
         
         try:
-            details, error_msg = self.cog.scraper.get_details(package_idx)
+            details, error_msg = await self.cog.scraper.get_details(package_idx)
             
             # 에러가 있다면, 사용자에게 바로 보여줌
             if error_msg:
@@ -667,7 +776,7 @@ class DcconSelect(discord.ui.Select):
             # traceback을 사용하여 더 상세한 에러 정보 로깅
             import traceback
             error_details = f"```\n{traceback.format_exc()}\n```"
-            print(f"❌ DcconSelect 콜백에서 예외 발생: {e}")
+            logger.error(f"❌ DcconSelect 콜백에서 예외 발생: {e}")
             await interaction.edit_original_response(
                 content=f"디시콘을 불러오는 중 심각한 오류가 발생했습니다. 😥\n**오류 내용:**\n{error_details}",
                 view=None, embed=None, attachments=[]
@@ -690,28 +799,46 @@ class DcconSelectView(discord.ui.View):
 class Dccon(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.scraper = DcconScraper()
+        # 검색, 상세 정보, 이미지 다운로드가 함께 쓰는 세션 (cog_load에서 생성)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.scraper: Optional[DcconScraper] = None
         self.temp_dir = "temp_images"
         self.favorites_dir = "favorited_dccons"
+        # 변환이 끝난 이미지는 원본 URL 해시로 디스크에 보관하고, 용량을 넘으면 오래 안 쓴 것부터 지움
+        self.image_cache = ImageCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES)
+        # 같은 이미지를 동시에 요청하면 다운로드/변환은 한 번만
+        self._image_inflight: Dict[str, asyncio.Task] = {}
+        # 패키지별로 마지막에 고른 WebP 품질 (다음 이미지 변환의 시작점)
+        self._package_quality = TTLCache(maxsize=1000, ttl=7 * 24 * 60 * 60)
         for dir_path in [self.temp_dir, self.favorites_dir]:
             if not os.path.exists(dir_path):
                 os.makedirs(dir_path)
         self.cleanup_task.start()
 
-    def cog_unload(self):
+    async def cog_load(self):
+        self.session = create_http_session()
+        self.scraper = DcconScraper(self.session)
+        await asyncio.to_thread(self.image_cache.load)
+
+    async def cog_unload(self):
         self.cleanup_task.cancel()
+        await asyncio.to_thread(self.image_cache.persist_access)
+        if self.session is not None:
+            await self.session.close()
 
     @tasks.loop(hours=1.0)
     async def cleanup_task(self):
-        """주기적으로 오래된 임시 파일을 정리하는 백그라운드 작업입니다."""
-        print("\n--- 🧹 주기적인 임시 파일 정리 시작 ---")
+        """주기적으로 오래된 임시 파일을 정리하는 백그라운드 작업입니다.
+        변환된 이미지는 이미지 캐시가 용량 기준으로 관리하므로 여기서는 남은 임시 파일만 지웁니다."""
+        logger.info("--- 🧹 주기적인 임시 파일 정리 시작 ---")
+        await asyncio.to_thread(self.image_cache.persist_access)
         now = time.time()
         # 3시간 이상된 파일들을 삭제 대상으로 설정
         cleanup_age_seconds = 3 * 60 * 60  
 
         deleted_count = 0
         for dir_path in [self.temp_dir, self.favorites_dir]:
-            print(f"[{dir_path}] 폴더를 확인합니다...")
+            logger.info(f"[{dir_path}] 폴더를 확인합니다...")
             try:
                 for filename in os.listdir(dir_path):
                     file_path = os.path.join(dir_path, filename)
@@ -722,103 +849,155 @@ class Dccon(commands.Cog):
                             if file_age > cleanup_age_seconds:
                                 os.remove(file_path)
                                 deleted_count += 1
-                                print(f"  - 삭제 (오래됨): {file_path}")
+                                logger.debug(f"  - 삭제 (오래됨): {file_path}")
                         except FileNotFoundError:
                             # 파일을 확인하고 삭제하는 사이에 다른 로직에 의해 삭제된 경우
                             continue
             except Exception as e:
-                print(f"🚨 [{dir_path}] 폴더 정리 중 오류 발생: {e}")
+                logger.error(f"🚨 [{dir_path}] 폴더 정리 중 오류 발생: {e}")
         
         if deleted_count > 0:
-            print(f"--- ✅ 주기적인 정리 완료. {deleted_count}개의 오래된 파일을 삭제했습니다. ---")
+            logger.info(f"--- ✅ 주기적인 정리 완료. {deleted_count}개의 오래된 파일을 삭제했습니다. ---")
         else:
-            print(f"--- ✅ 주기적인 정리 완료. 삭제할 오래된 파일이 없습니다. ---")
+            logger.info(f"--- ✅ 주기적인 정리 완료. 삭제할 오래된 파일이 없습니다. ---")
 
     @cleanup_task.before_loop
     async def before_cleanup_task(self):
         """루프가 시작되기 전에 봇이 준비될 때까지 기다립니다."""
         await self.bot.wait_until_ready()
 
-    def _process_and_convert_image(self, temp_filepath: str, content_type: str) -> (Optional[str], Optional[str], Optional[tuple]):
+    @staticmethod
+    def _run_ffmpeg_webp(input_path: str, output_path: str, quality: int, max_frames: Optional[int] = None) -> bool:
+        """주어진 품질로 FFmpeg WebP 변환을 실행하고 성공 여부를 반환합니다. max_frames가 있으면 앞부분만 변환합니다."""
+        command = [
+            'ffmpeg',
+            '-y',  # 덮어쓰기 허용
+            '-i', input_path,
+            '-c:v', 'libwebp',
+            '-lossless', '0',
+            '-quality', str(quality),
+            '-loop', '0',
+            '-preset', 'default',
+            '-an',
+            '-vsync', '0',
+        ]
+        if max_frames is not None:
+            command += ['-frames:v', str(max_frames)]
+        command.append(output_path)
+        try:
+            # FFmpeg의 상세 로그는 숨기고, 오류 발생 시에만 표시
+            subprocess.run(command, check=True, capture_output=True, text=True)
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error(f"--- 🚨 FFmpeg 오류 (quality: {quality}) ---")
+            logger.error(e.stderr)
+            return False
+
+    def _estimate_webp_quality(self, input_path: str, n_frames: int) -> int:
+        """앞쪽 몇 프레임만 두 가지 품질로 변환해 전체 크기를 추정하고, 목표 크기에 맞을 품질을 고릅니다."""
+        sample_frames = min(n_frames, WEBP_SAMPLE_FRAMES)
+        scale = n_frames / sample_frames
+        target = DISCORD_MAX_FILE_SIZE * WEBP_TARGET_RATIO
+        sample_path = input_path + ".sample.webp"
+
+        def estimate(quality: int) -> Optional[float]:
+            if not self._run_ffmpeg_webp(input_path, sample_path, quality, max_frames=sample_frames):
+                return None
+            return os.path.getsize(sample_path) * scale
+
+        try:
+            high = estimate(WEBP_MAX_QUALITY)
+            if high is None or high <= target:
+                return WEBP_MAX_QUALITY
+            low = estimate(WEBP_SAMPLE_LOW_QUALITY)
+            if low is None or high <= low:
+                return WEBP_SAMPLE_LOW_QUALITY
+            # 두 점 사이를 직선으로 보고 목표 크기가 되는 품질을 구함
+            quality = WEBP_SAMPLE_LOW_QUALITY + (WEBP_MAX_QUALITY - WEBP_SAMPLE_LOW_QUALITY) * (target - low) / (high - low)
+            logger.debug(f"  - 크기 추정: 품질 {WEBP_MAX_QUALITY} → {high / (1024*1024):.2f}MB, "
+                         f"품질 {WEBP_SAMPLE_LOW_QUALITY} → {low / (1024*1024):.2f}MB, 시작 품질 {quality:.0f}")
+            return int(min(max(quality, WEBP_MIN_QUALITY), WEBP_MAX_QUALITY))
+        finally:
+            if os.path.exists(sample_path):
+                os.remove(sample_path)
+
+    def _encode_webp_to_size(self, input_path: str, output_path: str, n_frames: int,
+                             quality_hint: Optional[int]) -> Optional[int]:
         """
-        다운로드된 이미지 파일을 처리하고 (final_path, error_msg, original_dims)를 반환합니다.
+        디스코드 용량 제한 안에 들어가는 가장 높은 품질을 이진 탐색으로 찾아 output_path에 저장합니다.
+        첫 시도 품질은 같은 패키지에서 고른 품질(quality_hint) 또는 샘플 프레임으로 추정한 값이며,
+        맞으면 더 높은 품질을, 안 맞으면 더 낮은 품질을 찾습니다.
+        전체 변환은 최대 WEBP_MAX_PASSES번만 실행합니다. 찾은 품질을 반환하고, 실패하면 None.
+        """
+        start = quality_hint if quality_hint is not None else self._estimate_webp_quality(input_path, n_frames)
+        low, high = WEBP_MIN_QUALITY, WEBP_MAX_QUALITY
+        best_quality = None
+        attempt_path = output_path + ".try"
+        quality = start
+
+        for attempt in range(1, WEBP_MAX_PASSES + 1):
+            logger.debug(f"    - 품질 {quality} 변환 ({attempt}/{WEBP_MAX_PASSES})...")
+            fits = self._run_ffmpeg_webp(input_path, attempt_path, quality) and \
+                os.path.getsize(attempt_path) <= DISCORD_MAX_FILE_SIZE
+            if fits:
+                logger.debug(f"    - 결과 크기: {os.path.getsize(attempt_path) / (1024*1024):.2f}MB")
+                os.replace(attempt_path, output_path)
+                best_quality = quality
+                low = quality + 1
+            else:
+                high = quality - 1
+
+            if low > high:
+                break
+            if best_quality is not None and high - low < WEBP_QUALITY_TOLERANCE:
+                break
+            if attempt == WEBP_MAX_PASSES - 1 and best_quality is None:
+                # 남은 기회가 한 번뿐이고 아직 맞는 품질이 없으면 가장 낮은 품질로 시도
+                quality = low
+            else:
+                # 위쪽을 찾을 때는 올림으로 나눠 같은 품질을 다시 시도하지 않게 함
+                quality = (low + high + 1) // 2
+
+        if os.path.exists(attempt_path):
+            os.remove(attempt_path)
+        return best_quality
+
+    def _process_and_convert_image(self, temp_filepath: str, content_type: str,
+                                   quality_hint: Optional[int] = None) -> (Optional[str], Optional[str], Optional[tuple], Optional[int]):
+        """
+        다운로드된 이미지 파일을 처리하고 (final_path, error_msg, original_dims, webp_quality)를 반환합니다.
+        webp_quality는 APNG를 변환했을 때 고른 품질이며, quality_hint가 있으면 그 품질부터 시도합니다.
         """
         img = None
         final_filepath = None
         original_dims = None
+        best_quality = None
         try:
             img = Image.open(temp_filepath)
             original_dims = (img.width, img.height)
 
             # APNG인 경우, FFmpeg를 사용하여 WebP로 변환 (최고의 호환성 보장)
             if hasattr(img, 'n_frames') and img.n_frames > 1:
-                print(f"✅ APNG 감지됨 ({img.n_frames} 프레임). 'FFmpeg'를 사용한 'Fast Path' 최적화를 시작합니다.")
+                n_frames = img.n_frames
+                logger.info(f"✅ APNG 감지됨 ({n_frames} 프레임). 'FFmpeg'를 사용한 WebP 변환을 시작합니다.")
                 
                 # Pillow 라이브러리가 더 이상 필요 없으므로 핸들을 닫음
                 img.close()
                 img = None
 
                 final_filepath = temp_filepath + ".webp"
-                
-                # --- FFmpeg Fast Path / Slow Path 최적화 로직 ---
-                FAST_PATH_QUALITY = 100
-                best_quality = None
-                
-                def run_ffmpeg(quality: int) -> bool:
-                    """주어진 품질로 FFmpeg 변환을 실행하고 성공 여부를 반환합니다."""
-                    command = [
-                        'ffmpeg',
-                        '-y',  # 덮어쓰기 허용
-                        '-i', temp_filepath,
-                        '-c:v', 'libwebp',
-                        '-lossless', '0',
-                        '-quality', str(quality),
-                        '-loop', '0',
-                        '-preset', 'default',
-                        '-an',
-                        '-vsync', '0',
-                        final_filepath
-                    ]
-                    try:
-                        # FFmpeg의 상세 로그는 숨기고, 오류 발생 시에만 표시
-                        result = subprocess.run(command, check=True, capture_output=True, text=True)
-                        return True
-                    except subprocess.CalledProcessError as e:
-                        print(f"--- 🚨 FFmpeg 오류 (quality: {quality}) ---")
-                        print(e.stderr)
-                        return False
-
-                # 1. Fast Path
-                print(f"  - Fast Path: 품질 {FAST_PATH_QUALITY}로 변환 시도...")
-                if run_ffmpeg(FAST_PATH_QUALITY):
-                    file_size = os.path.getsize(final_filepath)
-                    print(f"  - 결과 크기: {file_size / (1024*1024):.2f}MB")
-                    if file_size <= DISCORD_MAX_FILE_SIZE:
-                        best_quality = FAST_PATH_QUALITY
-                
-                # 2. Slow Path
-                if best_quality is None:
-                    print(f"  -> Fast Path 실패. Slow Path (정밀 탐색)를 시작합니다.")
-                    for quality in range(FAST_PATH_QUALITY - 10, 35, -10): # 65, 55, 45
-                        print(f"    - 품질 {quality} 테스트...")
-                        if run_ffmpeg(quality):
-                            file_size = os.path.getsize(final_filepath)
-                            print(f"    - 결과 크기: {file_size / (1024*1024):.2f}MB")
-                            if file_size <= DISCORD_MAX_FILE_SIZE:
-                                best_quality = quality
-                                break
-
-                # 3. 최종 결과 처리
+                best_quality = self._encode_webp_to_size(temp_filepath, final_filepath, n_frames, quality_hint)
+
                 if best_quality is not None:
-                    print(f"-> ✅ FFmpeg 변환 완료. 최적 품질: {best_quality}")
+                    logger.info(f"-> ✅ FFmpeg 변환 완료. 최적 품질: {best_quality}")
                     # 최종 파일은 이미 final_filepath에 저장되어 있음
                 else:
                     error = "FFmpeg 변환 실패 또는 가장 낮은 품질로도 파일 크기를 줄일 수 없었습니다."
-                    print(f"--- ❌ {error} ---")
+                    logger.error(f"--- ❌ {error} ---")
                     # 생성되었을 수 있는 최종 파일 삭제
                     if os.path.exists(final_filepath):
                         os.remove(final_filepath)
-                    return None, error, original_dims
+                    return None, error, original_dims, None
 
             # 일반 이미지인 경우 확장자 추가
             else:
@@ -836,21 +1015,21 @@ class Dccon(commands.Cog):
             if final_size > DISCORD_MAX_FILE_SIZE:
                 size_in_mb = final_size / (1024 * 1024)
                 error = f"변환된 파일 크기({size_in_mb:.2f}MB)가 너무 큽니다."
-                print(f"--- ❌ {error} ---")
+                logger.error(f"--- ❌ {error} ---")
                 os.remove(final_filepath)
-                return None, error, original_dims
+                return None, error, original_dims, None
 
-            print(f"최종 저장된 파일 경로: {final_filepath}")
-            print(f"파일 크기: {final_size} bytes")
-            return final_filepath, None, original_dims
+            logger.info(f"최종 저장된 파일 경로: {final_filepath}")
+            logger.info(f"파일 크기: {final_size} bytes")
+            return final_filepath, None, original_dims, best_quality
 
         except Exception as e:
             error_msg = "이미지 처리 중 오류가 발생했습니다."
-            print(f"--- ❌ {error_msg} (상세: {e}) ---")
+            logger.error(f"--- ❌ {error_msg} (상세: {e}) ---")
             # 변환 실패 시 생성되었을 수 있는 파일 삭제
             if final_filepath and os.path.exists(final_filepath):
                 os.remove(final_filepath)
-            return None, error_msg, original_dims
+            return None, error_msg, original_dims, None
         finally:
             if img:
                 img.close()
@@ -859,71 +1038,125 @@ class Dccon(commands.Cog):
                 os.remove(temp_filepath)
 
 
-    async def download_image(self, session: aiohttp.ClientSession, url: str) -> (Optional[str], Optional[str], Optional[tuple]):
+    async def download_image(self, session: aiohttp.ClientSession, url: str,
+                             package_key: Optional[str] = None) -> (Optional[str], Optional[str], Optional[tuple]):
+        """
+        주어진 URL의 변환된 이미지를 반환합니다. 캐시에 있으면 다운로드/변환 없이 바로 돌려줍니다.
+        반환값: (최종 파일 경로, 에러 메시지, 원본 이미지 크기)
+        반환된 파일은 이미지 캐시 소유이므로 호출한 쪽에서 지우면 안 됩니다.
+        """
+        cached = self.image_cache.get(url)
+        if cached is not None:
+            logger.debug(f"이미지 캐시 적중: {url}")
+            return cached.path, None, cached.dimensions
+
+        task = self._image_inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._download_and_cache(session, url, package_key))
+            self._image_inflight[url] = task
+            task.add_done_callback(lambda _: self._image_inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def _download_and_cache(self, session: aiohttp.ClientSession, url: str,
+                                  package_key: Optional[str]) -> (Optional[str], Optional[str], Optional[tuple]):
+        path, error, dims = await self._download_and_convert(session, url, package_key)
+        if path is None:
+            return path, error, dims
+        try:
+            cached = await asyncio.to_thread(self.image_cache.put, url, path, dims)
+        except OSError as e:
+            # 캐시에 넣지 못해도 변환된 파일은 그대로 사용
+            logger.error(f"🚨 이미지 캐시 저장 실패: {e}")
+            return path, error, dims
+        return cached.path, None, cached.dimensions
+
+    async def _download_and_convert(self, session: aiohttp.ClientSession, url: str,
+                                    package_key: Optional[str] = None) -> (Optional[str], Optional[str], Optional[tuple]):
         """
         주어진 URL에서 이미지를 비동기적으로 다운로드하고 처리합니다.
+        package_key(디시콘 제목)가 있으면 같은 패키지에서 고른 WebP 품질을 기억해 변환 시작점으로 사용합니다.
+        즐겨찾기에는 제목만 저장되므로 보기 화면과 즐겨찾기 모두 제목을 키로 넘깁니다.
         반환값: (최종 파일 경로, 에러 메시지, 원본 이미지 크기)
         """
-        print(f"\n--- 🖼️ 이미지 다운로드 시작 ---")
-        print(f"URL: {url}")
+        logger.info(f"--- 🖼️ 이미지 다운로드 시작 ---")
+        logger.debug(f"URL: {url}")
         
         temp_filepath = os.path.join(self.temp_dir, f"{uuid.uuid4()}")
-        
+
+        download_start = time.perf_counter()
+        downloaded = False
+
+        def observe_download(result: str):
+            metrics.DCCON_DOWNLOAD_SECONDS.observe(time.perf_counter() - download_start, result=result)
+
         try:
             headers = {'Referer': 'https://m.dcinside.com/'}
-            async with session.get(url, headers=headers) as response:
-                print(f"응답 상태: {response.status}")
-                if response.status != 200:
-                    error = f"다운로드 실패 (상태 코드: {response.status})"
-                    print(f"--- ❌ {error} ---")
-                    return None, error, None
-                
-                # --- [디버그 로그] 원본 파일 크기 사전 확인 ---
-                content_length = response.content_length
-                if content_length:
-                    size_in_mb = content_length / (1024 * 1024)
-                    print(f"  [사전 확인] 서버가 알려준 크기: {size_in_mb:.2f}MB")
-                    if content_length > DISCORD_MAX_FILE_SIZE:
-                        error = f"원본 파일 크기({size_in_mb:.2f}MB)가 너무 큽니다."
-                        print(f"--- ❌ {error} ---")
+            with span("http.client", f"GET {url}"):
+                async with session.get(url, headers=headers, timeout=IMAGE_TIMEOUT) as response:
+                    logger.debug(f"응답 상태: {response.status}")
+                    if response.status != 200:
+                        error = f"다운로드 실패 (상태 코드: {response.status})"
+                        logger.error(f"--- ❌ {error} ---")
+                        observe_download('error')
                         return None, error, None
-                else:
-                    print("  [사전 확인] 서버가 크기 정보를 제공하지 않음. 다운로드 후 확인합니다.")
-
-                content_type = response.content_type
-                print(f"  > Content-Type: {content_type}")
-                print(f"  > 다운로드 시작...")
-
-                with open(temp_filepath, 'wb') as f:
-                    f.write(await response.read())
-                print(f"  > 다운로드 완료.")
+                
+                    # --- [디버그 로그] 원본 파일 크기 사전 확인 ---
+                    content_length = response.content_length
+                    if content_length:
+                        size_in_mb = content_length / (1024 * 1024)
+                        logger.debug(f"  [사전 확인] 서버가 알려준 크기: {size_in_mb:.2f}MB")
+                        if content_length > DISCORD_MAX_FILE_SIZE:
+                            error = f"원본 파일 크기({size_in_mb:.2f}MB)가 너무 큽니다."
+                            logger.error(f"--- ❌ {error} ---")
+                            observe_download('too_large')
+                            return None, error, None
+                    else:
+                        logger.debug("  [사전 확인] 서버가 크기 정보를 제공하지 않음. 다운로드 후 확인합니다.")
+
+                    content_type = response.content_type
+                    logger.debug(f"  > Content-Type: {content_type}")
+                    logger.debug(f"  > 다운로드 시작...")
+
+                    data = await response.read()
+                    with open(temp_filepath, 'wb') as f:
+                        f.write(data)
+                    logger.debug(f"  > 다운로드 완료.")
+                    metrics.DCCON_DOWNLOAD_BYTES.inc(len(data))
+            observe_download('ok')
+            downloaded = True
             
             # 다운로드 후 파일 크기 재확인 (헤더가 없는 경우 대비)
             downloaded_size = os.path.getsize(temp_filepath)
             size_in_mb = downloaded_size / (1024 * 1024)
-            print(f"  [사후 확인] 다운로드된 실제 크기: {size_in_mb:.2f}MB")
+            logger.debug(f"  [사후 확인] 다운로드된 실제 크기: {size_in_mb:.2f}MB")
             if downloaded_size > DISCORD_MAX_FILE_SIZE:
                 error = f"다운로드된 파일 크기({size_in_mb:.2f}MB)가 너무 큽니다."
-                print(f"--- ❌ {error} ---")
+                logger.error(f"--- ❌ {error} ---")
                 os.remove(temp_filepath)
                 return None, error, None
 
             # CPU 집약적인 이미지 처리 작업을 별도 스레드에서 실행
             loop = asyncio.get_running_loop()
-            final_filepath, error_msg, original_dims = await loop.run_in_executor(
-                None, self._process_and_convert_image, temp_filepath, content_type
+            quality_hint = self._package_quality.get(package_key) if package_key else None
+            final_filepath, error_msg, original_dims, webp_quality = await loop.run_in_executor(
+                None, self._process_and_convert_image, temp_filepath, content_type, quality_hint
             )
+            # 같은 패키지의 다음 이미지는 이번에 고른 품질부터 시도 (힌트 그대로인 결과는 다시 저장하지 않음)
+            if package_key and webp_quality is not None and webp_quality != quality_hint:
+                self._package_quality.set(package_key, webp_quality)
 
             if final_filepath:
-                print(f"--- 🖼️ 이미지 다운로드 및 처리 성공 ---")
+                logger.info(f"--- 🖼️ 이미지 다운로드 및 처리 성공 ---")
             else:
-                print(f"--- 🖼️ 이미지 처리 중 실패 ---")
+                logger.error(f"--- 🖼️ 이미지 처리 중 실패 ---")
             
             return final_filepath, error_msg, original_dims
 
         except Exception as e:
             error = f"다운로드/처리 중 외부 오류: {e}"
-            print(f"--- ❌ {error} ---")
+            logger.error(f"--- ❌ {error} ---")
+            if not downloaded:
+                observe_download('error')
             # 오류 발생 시 다운로드된 임시 파일 정리
             if os.path.exists(temp_filepath):
                 os.remove(temp_filepath)
@@ -934,16 +1167,14 @@ class Dccon(commands.Cog):
     async def dccon_search(self, interaction: discord.Interaction, keyword: str):
         await interaction.response.defer(ephemeral=True)
 
-        print(f"\n--- 🤖 /디시콘 명령어 실행 ---")
-        print(f"사용자: {interaction.user}, 키워드: '{keyword}'")
+        logger.info(f"--- 🤖 /디시콘 명령어 실행 ---")
+        logger.info(f"사용자: {interaction.user}, 키워드: '{keyword}'")
 
-        search_results = self.scraper.search(keyword, limit=25)
+        search_results = await self.scraper.search(keyword, limit=25)
 
-        print(f"\n--- scraper.search 결과 ---")
-        print(f"반환된 결과 수: {len(search_results)}")
+        logger.info(f"scraper.search 반환된 결과 수: {len(search_results)}")
         if search_results:
-            print("첫 번째 결과:", search_results[0])
-        print("---------------------------")
+            logger.debug(f"첫 번째 결과: {search_results[0]}")
 
 
         if not search_results:
@@ -967,9 +1198,8 @@ class Dccon(commands.Cog):
         # 첫 번째 결과의 미리보기 이미지를 썸네일로 설정 (이제는 로컬 파일로)
         temp_image_path = None
         if search_results and search_results[0].get('thumbnail_url'):
-            async with aiohttp.ClientSession() as session:
-                # 썸네일 다운로드는 실패해도 전체 기능에 영향이 없도록 간단히 처리
-                temp_image_path, _, _ = await self.download_image(session, search_results[0]['thumbnail_url'])
+            # 썸네일 다운로드는 실패해도 전체 기능에 영향이 없도록 간단히 처리
+            temp_image_path, _, _ = await self.download_image(self.session, search_results[0]['thumbnail_url'])
 
         file = None
         if temp_image_path:
@@ -979,10 +1209,6 @@ class Dccon(commands.Cog):
         select_view = DcconSelectView(self, search_results, interaction.user.id)
         await interaction.followup.send(embed=embed, view=select_view, file=file, ephemeral=True)
 
-        # 메시지 전송 후 임시 파일 삭제
-        if temp_image_path and os.path.exists(temp_image_path):
-             os.remove(temp_image_path)
-             print(f"[✅] 임시 썸네일 파일 삭제: {temp_image_path}")
 
     @app_commands.command(name="즐겨찾기", description="즐겨찾기한 디시콘을 봅니다.")
     async def dccon_favorites(self, interaction: discord.Interaction):
@@ -999,6 +1225,45 @@ class Dccon(commands.Cog):
         await view.show_current_page(interaction)
         view.message = await interaction.original_response()
 
+    @app_commands.command(name="디시콘캡처", description="보관 중인 DCinside 응답 원문을 받거나 캡처 비율을 바꿉니다. (개발자 전용)")
+    @app_commands.describe(
+        source="받을 응답 종류 (비우면 전체)",
+        sample_rate="정상 응답을 보관할 비율 (0이면 끔, 0~1)",
+        clear="받은 뒤 보관 중인 응답을 비웁니다."
+    )
+    @app_commands.choices(source=[
+        app_commands.Choice(name="검색", value="search"),
+        app_commands.Choice(name="상세 정보", value="detail"),
+    ])
+    async def dccon_capture(self, interaction: discord.Interaction, source: Optional[str] = None,
+                            sample_rate: Optional[float] = None, clear: bool = False):
+        if interaction.user.id not in DEVELOPER_IDS:
+            await interaction.response.send_message("❌ 이 명령어는 개발자만 사용할 수 있습니다!", ephemeral=True)
+            return
+
+        lines = []
+        if sample_rate is not None:
+            captures.set_rate(sample_rate)
+            lines.append(f"캡처 비율을 {captures.rate}(으)로 변경했습니다.")
+
+        # 압축은 응답 수에 따라 오래 걸릴 수 있으므로 워커 스레드에서 실행
+        archive = await asyncio.to_thread(captures.dump, source)
+        file = None
+        if archive is not None:
+            file = discord.File(archive, filename=f"dccon_capture_{source or 'all'}.zip")
+            lines.append(f"보관 중인 응답 {len(captures.entries(source))}개를 첨부합니다.")
+        else:
+            lines.append("보관 중인 응답이 없습니다." + ("" if captures.enabled else " (캡처가 꺼져 있습니다)"))
+
+        if clear:
+            captures.clear()
+            lines.append("보관 중인 응답을 비웠습니다.")
+
+        if file is not None:
+            await interaction.response.send_message("\n".join(lines), file=file, ephemeral=True)
+        else:
+            await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Dccon(bot)) 
\ No newline at end of file
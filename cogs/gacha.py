@@ -2,8 +2,11 @@ import discord
 from discord.ext import commands
 import random
 import asyncio
-from main import update_balance
-from database_manager import execute_query
+import balance_ledger
+from database_manager import connection, fetch
+import logging
+
+logger = logging.getLogger(__name__)
 
 # 가챠 캐릭터 데이터 템플릿
 GACHA_CHARACTERS = {
@@ -295,52 +298,49 @@ class Gacha(commands.Cog):
         user_id = ctx.author.id
         gacha_cost = 10
 
-        # 돈 인출
-        try:
-            if not await update_balance(user_id, -gacha_cost):
+        # 인출과 저장을 하나의 커넥션에서 처리
+        async with connection() as db:
+            # 돈 인출 (차감 후 잔액을 함께 돌려받음)
+            try:
+                money = await balance_ledger.apply(user_id, -gacha_cost, db)
+                if money is None:
+                    error_embed = discord.Embed(
+                        title="❌ 오류",
+                        description="보유 금액이 부족합니다!",
+                        color=0xff0000
+                    )
+                    if isinstance(ctx, discord.Interaction):
+                        return await ctx.response.send_message(embed=error_embed, ephemeral=True)
+                    return await ctx.send(embed=error_embed)
+            except Exception as e:
+                logger.error(f"가챠 금액 인출 오류: {e}")
                 error_embed = discord.Embed(
                     title="❌ 오류",
-                    description="보유 금액이 부족합니다!",
+                    description="가챠 금액 인출 중 오류가 발생했습니다.",
                     color=0xff0000
                 )
                 if isinstance(ctx, discord.Interaction):
                     return await ctx.response.send_message(embed=error_embed, ephemeral=True)
                 return await ctx.send(embed=error_embed)
-        except Exception as e:
-            print(f"가챠 금액 인출 오류: {e}")
-            error_embed = discord.Embed(
-                title="❌ 오류",
-                description="가챠 금액 인출 중 오류가 발생했습니다.",
-                color=0xff0000
-            )
-            if isinstance(ctx, discord.Interaction):
-                return await ctx.response.send_message(embed=error_embed, ephemeral=True)
-            return await ctx.send(embed=error_embed)
 
-        # 확률에 따라 성급 결정
-        rand = random.random()
-        cumulative = 0
-        star = 1
-        for s, rate in GACHA_RATES:
-            cumulative += rate
-            if rand < cumulative:
-                star = s
-                break
+            # 확률에 따라 성급 결정
+            rand = random.random()
+            cumulative = 0
+            star = 1
+            for s, rate in GACHA_RATES:
+                cumulative += rate
+                if rand < cumulative:
+                    star = s
+                    break
 
-        # 캐릭터 랜덤 선택
-        char = random.choice(GACHA_CHARACTERS[star])
+            # 캐릭터 랜덤 선택
+            char = random.choice(GACHA_CHARACTERS[star])
 
-        # DB에 캐릭터 보유 정보 upsert
-        upsert_query = """
-            INSERT INTO user_gacha_characters (user_id, character_name, star, image_url, quantity)
-            VALUES ($1, $2, $3, $4, 1)
-            ON CONFLICT (user_id, character_name, star, image_url)
-            DO UPDATE SET quantity = user_gacha_characters.quantity + 1;
-        """
-        try:
-            await execute_query(upsert_query, (user_id, char['name'], star, char['image_url']))
-        except Exception as e:
-            print(f"가챠 캐릭터 DB 저장 오류: {e}")
+            # DB에 캐릭터 보유 정보 upsert
+            try:
+                await db.execute_named('gacha_upsert', user_id, char['name'], star, char['image_url'])
+            except Exception as e:
+                logger.error(f"가챠 캐릭터 DB 저장 오류: {e}")
 
         # 연출
         effect_text, effect_sec = GACHA_EFFECTS[star]
@@ -368,14 +368,6 @@ class Gacha(commands.Cog):
                 await ctx.send(embed=embed)
             await asyncio.sleep(effect_sec)
 
-        # 남은 돈 조회
-        try:
-            result = await execute_query('SELECT balance FROM user_balance WHERE user_id = $1', (user_id,))
-            money = result[0]['balance'] if result else 0
-        except Exception as e:
-            print(f"잔액 조회 오류: {e}")
-            money = "?"
-
         # 결과 임베드
         result_embed = discord.Embed(
             title=f"{'★'*star} {char['name']}",
@@ -402,9 +394,9 @@ class Gacha(commands.Cog):
             ORDER BY star DESC, character_name
         """
         try:
-            result = await execute_query(query, (user_id,))
+            result = await fetch(query, user_id)
         except Exception as e:
-            print(f"모집현황 조회 오류: {e}")
+            logger.error(f"모집현황 조회 오류: {e}")
             result = []
         if not result:
             embed = discord.Embed(
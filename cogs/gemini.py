@@ -1,22 +1,27 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import google.generativeai as genai
-import google.generativeai.types as genai_types
 import os
 import logging
 from dotenv import load_dotenv
-from PIL import Image
 import io
 from typing import Optional, List, Dict, Any  # Dict, Any 추가
 import json
 import glob
 
+import metrics
+from lazy import LazyClient, LazyModule
+from tracing import span
+
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s:%(levelname)s:%(name)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# 무거운 SDK는 처음 사용할 때 불러옴
+genai = LazyModule("google.generativeai")
+genai_types = LazyModule("google.generativeai.types")
+Image = LazyModule("PIL.Image")
+
 SUPPORTED_IMAGE_MIME_TYPES = [
     "image/png", "image/jpeg", "image/webp", "image/heic", "image/heif",
 ]
@@ -30,7 +35,6 @@ class GeminiCog(commands.Cog):
         self.bot = bot
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model_name = os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash-preview-05-20")
-        self.model = None
         # user_conversations 구조: { user_id: { char_id1: {'session': ChatSession}, char_id2: {'session': ChatSession} } }
         self.user_conversations: Dict[int, Dict[str, Dict[str, Any]]] = {}
         self.characters_data: Dict[str, Dict[str, Any]] = {}
@@ -38,7 +42,12 @@ class GeminiCog(commands.Cog):
 
         if not self.api_key:
             logger.error("🚨 GEMINI_API_KEY가 설정되지 않았습니다.")
-            return
+        # 모델은 처음 요청이 들어올 때 생성
+        self._model = LazyClient(f"gemini model ({self.model_name})", self._create_model)
+
+    def _create_model(self):
+        if not self.api_key:
+            return None
         try:
             genai.configure(api_key=self.api_key)
             safety_settings = [
@@ -47,10 +56,16 @@ class GeminiCog(commands.Cog):
                 {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
                 {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
             ]
-            self.model = genai.GenerativeModel(self.model_name, safety_settings=safety_settings)
+            model = genai.GenerativeModel(self.model_name, safety_settings=safety_settings)
             logger.info(f"✅ Gemini 모델({self.model_name}) 초기화 성공 (안전 설정 적용됨).")
+            return model
         except Exception as e:
             logger.error(f"Gemini 모델 ({self.model_name}) 초기화 중 오류: {e}")
+            return None
+
+    @property
+    def model(self):
+        return self._model.get()
 
     def _load_characters(self):  # 변경 없음
         if not os.path.exists(CHARACTERS_DIR):
@@ -171,7 +186,7 @@ class GeminiCog(commands.Cog):
                                    character_id: str,
                                    attachment_image_url: str = None,
                                    ephemeral_response: bool = False,
-                                   chat_session: Optional[genai.ChatSession] = None,
+                                   chat_session: Optional["genai.ChatSession"] = None,
                                    is_first_message_in_session: bool = False):
         # ... (이전 턴의 _send_gemini_request 코드와 동일)
         if not self.model:
@@ -220,12 +235,14 @@ class GeminiCog(commands.Cog):
             )
 
             response = None
-            if chat_session:
-                content_to_send = processed_prompt_parts[0] if len(processed_prompt_parts) == 1 and isinstance(
-                    processed_prompt_parts[0], str) else processed_prompt_parts
-                response = await chat_session.send_message_async(content_to_send)
-            else:
-                response = await self.model.generate_content_async(processed_prompt_parts)
+            with span("http.client", "POST gemini generate_content", character=char_data['name']), \
+                    metrics.EXTERNAL_API_SECONDS.time(api="gemini"):
+                if chat_session:
+                    content_to_send = processed_prompt_parts[0] if len(processed_prompt_parts) == 1 and isinstance(
+                        processed_prompt_parts[0], str) else processed_prompt_parts
+                    response = await chat_session.send_message_async(content_to_send)
+                else:
+                    response = await self.model.generate_content_async(processed_prompt_parts)
 
             response_text_content = ""
             if response.text:
@@ -6,6 +6,9 @@ from typing import Optional, Dict, Any, List
 
 from main import ResetAttendanceView, ResetMoneyView, KST
 from database_manager import execute_query
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class General(commands.Cog):
@@ -70,9 +73,9 @@ class General(commands.Cog):
                     await interaction.followup.send(embed=embed, ephemeral=True)
 
             except discord.NotFound:
-                print("상호작용이 만료되었습니다.", flush=True)
+                logger.info("상호작용이 만료되었습니다.")
             except Exception as e:
-                print(f"출석정보 확인 중 오류 발생: {e}", flush=True)
+                logger.error(f"출석정보 확인 중 오류 발생: {e}")
                 try:
                     error_embed = discord.Embed(
                         title="❌ 오류",
@@ -81,7 +84,7 @@ class General(commands.Cog):
                     )
                     await interaction.followup.send(embed=error_embed, ephemeral=True)
                 except discord.NotFound:
-                    print("상호작용이 만료되어 응답을 보낼 수 없습니다.", flush=True)
+                    logger.info("상호작용이 만료되어 응답을 보낼 수 없습니다.")
 
         @bot.tree.command(name="통장", description="보유한 금액을 확인합니다.")
         async def check_balance(interaction: discord.Interaction):
@@ -111,7 +114,7 @@ class General(commands.Cog):
                     await interaction.response.send_message(embed=error_embed, ephemeral=True)
 
             except Exception as e:
-                print(f"잔액 확인 중 오류 발생: {e}")
+                logger.error(f"잔액 확인 중 오류 발생: {e}")
                 error_embed = discord.Embed(
                     title="❌ 오류",
                     description="잔액 확인 중 오류가 발생했습니다. 다시 시도해주세요.",
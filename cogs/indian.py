@@ -4,6 +4,10 @@ import random
 import math
 from typing import Dict, Tuple, List
 from main import update_balance
+import balance_ledger
+import logging
+
+logger = logging.getLogger(__name__)
 
 class IndianPoker(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -35,10 +39,6 @@ class IndianPoker(commands.Cog):
         bot_hidden_pool.remove(bot_reveal)
         return user_reveal, bot_reveal
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        await self.bot.tree.sync()
-
     @commands.hybrid_command(name="인디언포커", description="인디언 포커 게임을 시작합니다.")
     async def indian_poker(self, ctx: commands.Context, bet_amount: int):
         if bet_amount < 10:
@@ -63,7 +63,7 @@ class IndianPoker(commands.Cog):
                     return await ctx.response.send_message(embed=error_embed, ephemeral=True)
                 return await ctx.send(embed=error_embed)
         except Exception as e:
-            print(f"베팅금 차감 중 오류 발생: {e}")
+            logger.error(f"베팅금 차감 중 오류 발생: {e}")
             error_embed = discord.Embed(
                 title="❌ 오류",
                 description="베팅금 차감 중 오류가 발생했습니다.",
@@ -202,7 +202,8 @@ class IndianPokerView(discord.ui.View):
         try:
             if user_sum > bot_sum:
                 winnings = round(bet_amount * multiplier)
-                if await update_balance(self.cog.bot.user.id, -winnings) and await update_balance(interaction.user.id, winnings):
+                # 봇의 잔고에서 차감하고 유저에게 지급 (한 트랜잭션)
+                if await balance_ledger.apply_many([(self.cog.bot.user.id, -winnings), (interaction.user.id, winnings)]) is not None:
                     result_embed.description += f"🎉 승리! {winnings}원을 획득했습니다!"
                     result_embed.color = 0x00ff00
             elif user_sum < bot_sum:
@@ -215,7 +216,7 @@ class IndianPokerView(discord.ui.View):
                 result_embed.description += "🤝 무승부! 베팅금이 반환됩니다."
                 result_embed.color = 0xffff00
         except Exception as e:
-            print(f"결과 처리 중 오류 발생: {e}")
+            logger.error(f"결과 처리 중 오류 발생: {e}")
             result_embed.description += "오류가 발생했습니다."
             result_embed.color = 0xff0000
 
@@ -251,14 +252,16 @@ class IndianPokerView(discord.ui.View):
         refund_amount = round(bet_amount * refund_rate)
 
         try:
-            # 환급금 지급
-            if refund_amount > 0:
-                await update_balance(interaction.user.id, refund_amount)
-            
-            # 나머지 손실금은 봇에게
+            # 환급금은 유저에게, 나머지 손실금은 봇에게 한 번에 정산
             final_loss = loss - refund_amount
+            settlements = []
+            if refund_amount > 0:
+                settlements.append((interaction.user.id, refund_amount))
             if final_loss > 0:
-                await update_balance(self.cog.bot.user.id, final_loss)
+                settlements.append((self.cog.bot.user.id, final_loss))
+            missed = await balance_ledger.credit_each(settlements, "인디언 포커 포기 정산")
+            if interaction.user.id in missed:
+                raise RuntimeError("환급금 지급 실패")
 
             fold_embed = discord.Embed(
                 title="🎮 인디언 포커 - 포기",
@@ -270,7 +273,7 @@ class IndianPokerView(discord.ui.View):
                 color=0xff0000
             )
         except Exception as e:
-            print(f"포기 처리 중 오류 발생: {e}")
+            logger.error(f"포기 처리 중 오류 발생: {e}")
             fold_embed = discord.Embed(
                 title="🎮 인디언 포커 - 오류",
                 description="포기 처리 중 오류가 발생했습니다.",
@@ -2,6 +2,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 # 지원할 오디오 파일 확장자 목록
 SUPPORTED_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a')
@@ -59,11 +62,11 @@ class MusicCog(commands.Cog):
             # 재생이 끝나면 임시 파일을 삭제하도록 콜백 설정
             def after_playing(error):
                 if error:
-                    print(f'재생 중 오류 발생: {error}')
+                    logger.error(f'재생 중 오류 발생: {error}')
                 try:
                     os.remove(temp_file_path)
                 except OSError as e:
-                    print(f"임시 파일 삭제 오류: {e}")
+                    logger.error(f"임시 파일 삭제 오류: {e}")
 
             voice_client.play(audio_source, after=after_playing)
 
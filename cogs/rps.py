@@ -5,7 +5,11 @@ import random
 import asyncio
 from typing import Dict, Tuple, List, Optional
 from main import update_balance, check_balance
+import balance_ledger
 from database_manager import execute_query
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # 게임의 실제 구현부
@@ -70,7 +74,7 @@ class RPSGameView(discord.ui.View):
             key = (user, target)
             bet_summary[key] = bet_summary.get(key, 0) + amount
             self.total_bet_amount += amount
-            print(f"초기 베팅 금액 합 {self.init_bet_amount * 2}에 {amount} 추가 = {self.total_bet_amount}")
+            logger.debug(f"초기 베팅 금액 합 {self.init_bet_amount * 2}에 {amount} 추가 = {self.total_bet_amount}")
 
         # 베팅 기록 문자열 생성
         bet_lines = []
@@ -135,7 +139,7 @@ class RPSGameView(discord.ui.View):
         # 플레이어들의 선택을 정확히 매칭시켜서 결과를 처리
         challenger_choice = self.choices.get(self.challenger)
         opponent_choice = self.choices.get(self.opponent)
-        print(f"{self.challenger}가 {challenger_choice}를 냄\n"
+        logger.debug(f"{self.challenger}가 {challenger_choice}를 냄\n"
               f"{self.opponent}가 {opponent_choice}를 냄")
         result_details = self.determine_winner(
             self.challenger, challenger_choice,
@@ -153,7 +157,7 @@ class RPSGameView(discord.ui.View):
             loser: discord.Member | None
             winner, loser = result_details["winner"], result_details["loser"]
 
-            print(winner, loser)
+            logger.debug(f"승자: {winner}, 패자: {loser}")
             winner_choice = self.choices[winner]
             loser_choice = self.choices[loser]
 
@@ -195,20 +199,27 @@ class RPSGameView(discord.ui.View):
         # 승리 예측자가 있는 경우에만 분배
         if side_bet_winners:
             total_winner_bet = sum(amount for _, amount in side_bet_winners)
+            payouts = []
 
             # 승리 예측자들에게 비례적으로 분배
             for user, amount in side_bet_winners:
                 # 각 승리 예측자의 베팅 비율에 따라 추가 베팅금 분배
                 proportional_gain = (amount / total_winner_bet) * additional_bet_amount
-                total_payout = amount + proportional_gain
-
-                # 사용자 통장에 추가
-                await update_balance(user.id, total_payout)
+                total_payout = int(amount + proportional_gain)
+                payouts.append((user.id, total_payout))
 
                 side_bet_distribution_message.append(
                     f"{user.name}님이 {total_payout}원을 획득하셨습니다!"
                 )
 
+            # 지급은 사용자마다 독립적이므로 일부가 실패해도 나머지는 지급
+            missed = await balance_ledger.credit_each(payouts, "추가 베팅 배당금 지급")
+            for user, _ in side_bet_winners:
+                if user.id in missed:
+                    side_bet_distribution_message.append(
+                        f"⚠️ {user.name}님의 배당금 지급에 실패했습니다. 관리자에게 문의해주세요."
+                    )
+
         # 패배 예측자들의 베팅금은 몰수
         for user, amount in side_bet_losers:
             side_bet_distribution_message.append(
@@ -226,18 +237,21 @@ class RPSGameView(discord.ui.View):
             )
 
             # 첫 두 명의 참가자 베팅금 환불
-            await update_balance(self.challenger.id, self.init_bet_amount)
-            if self.opponent == self.bot:
-                await update_balance(self.opponent.user.id, self.init_bet_amount)
-            else:
-                await update_balance(self.opponent.id, self.init_bet_amount)
+            opponent_id = self.opponent.user.id if self.opponent == self.bot else self.opponent.id
+            refunds = [(self.challenger.id, self.init_bet_amount), (opponent_id, self.init_bet_amount)]
 
             # 추가 베팅한 사용자들 환불
             side_bets = [bet for bet in self.bet_history
                          if bet[0] not in [self.challenger, self.opponent]]
-
-            for user, amount, _ in side_bets:
-                await update_balance(user.id, amount)
+            refunds.extend((user.id, amount) for user, amount, _ in side_bets)
+
+            missed = await balance_ledger.credit_each(refunds, "가위바위보 시간 초과 환불")
+            if missed - {self.bot.user.id}:
+                await self.interaction.channel.send(
+                    "⚠️ 일부 사용자의 베팅 금액 환불에 실패했습니다: "
+                    + ", ".join(f"<@{user_id}>" for user_id in sorted(missed - {self.bot.user.id}))
+                    + "\n관리자에게 문의해주세요."
+                )
 
             await asyncio.sleep(5)
             await self.interaction.delete_original_response()
@@ -273,10 +287,10 @@ class RPSGameView(discord.ui.View):
     def start(self):
         """게임 시작"""
         if self.timer_task is None:
-            print("[DEBUG] start() 호출됨, 타이머 시작")
+            logger.debug("start() 호출됨, 타이머 시작")
             self.timer_task = asyncio.create_task(self.start_timer())
         else:
-            print("[DEBUG] start() 이미 실행됨, 무시")
+            logger.debug("start() 이미 실행됨, 무시")
 
 
 class RockPaperScissorsInfoView(discord.ui.View):
@@ -317,12 +331,16 @@ class RockPaperScissorsInfoView(discord.ui.View):
                 await asyncio.sleep(5)
                 await self.interaction.delete_original_response()
 
-                # 베팅금 환불
-                await update_balance(self.challenger.id, self.init_bet_amount)
-
-                # 추가금 환불
-                for user, amount, _ in self.bet_history:
-                    await update_balance(user.id, amount)
+                # 베팅금과 추가금을 한 번에 환불
+                refunds = [(self.challenger.id, self.init_bet_amount)]
+                refunds.extend((user.id, amount) for user, amount, _ in self.bet_history)
+                missed = await balance_ledger.credit_each(refunds, "가위바위보 매칭 실패 환불")
+                if missed:
+                    await self.interaction.channel.send(
+                        "⚠️ 일부 사용자의 베팅 금액 환불에 실패했습니다: "
+                        + ", ".join(f"<@{user_id}>" for user_id in sorted(missed))
+                        + "\n관리자에게 문의해주세요."
+                    )
             else:
                 # 대전 상대와 게임 시작
                 if self.is_vs_bot:
@@ -444,7 +462,7 @@ class JoinGameButton(discord.ui.Button):
                 await interaction.delete_original_response()
                 return
         except Exception as e:
-            print(f"베팅금 차감 중 오류 발생: {e}")
+            logger.error(f"베팅금 차감 중 오류 발생: {e}")
             error_embed = discord.Embed(
                 title="❌ 오류",
                 description="베팅금 차감 중 오류가 발생했습니다.",
@@ -478,7 +496,7 @@ class JoinGameButton(discord.ui.Button):
             view.add_item(IncreaseBetButton(view, view.challenger))
             view.add_item(IncreaseBetButton(view, view.opponent.user))
         except Exception as e:
-            print(e)
+            logger.error(f"베팅 버튼 추가 중 오류 발생: {e}")
 
         await interaction.edit_original_response(view=view)
 
@@ -2,13 +2,15 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from database_manager import execute_query
+from database_manager import connection, transaction
 import json
 import sentry_sdk
 import io
 from main import is_admin_or_developer
 from game.renderer import TERRAIN_EMOJIS
 
+logger = logging.getLogger(__name__)
+
 # 데이터 버전 상수는 cogs/database.py에서 중앙 관리하므로 여기서는 제거합니다.
 
 # ==== 캐릭터 생성 UI ====
@@ -90,29 +92,29 @@ class CharacterCreationView(discord.ui.View):
             defense = race['base_defense']
             next_exp = 100 
 
-            new_char = await execute_query(
-                """
-                INSERT INTO game_characters 
-                (user_id, name, race_id, class_id, hp, max_hp, mp, max_mp, attack, defense, next_exp)
-                VALUES ($1, $2, $3, $4, $5, $5, $6, $6, $7, $8, $9)
-                RETURNING character_id
-                """,
-                (user_id, name, int(self.selected_race_id), int(self.selected_class_id), hp, mp, attack, defense, next_exp)
-            )
-            character_id = new_char[0]['character_id']
-            
-            if d_class['starting_items']:
-                starting_items_str = d_class['starting_items']
-                starting_items = json.loads(starting_items_str) if isinstance(starting_items_str, str) else starting_items_str
-                
-                for item_info in starting_items:
-                    item_record = await execute_query("SELECT item_id FROM game_items WHERE name = $1", (item_info['item_name'],))
-                    if item_record:
-                        item_id = item_record[0]['item_id']
-                        await execute_query(
-                            "INSERT INTO game_inventory (character_id, item_id, quantity) VALUES ($1, $2, $3)",
-                            (character_id, item_id, item_info['quantity'])
-                        )
+            # 캐릭터와 시작 아이템을 하나의 트랜잭션으로 저장
+            async with transaction() as db:
+                character_id = await db.fetchval(
+                    """
+                    INSERT INTO game_characters 
+                    (user_id, name, race_id, class_id, hp, max_hp, mp, max_mp, attack, defense, next_exp)
+                    VALUES ($1, $2, $3, $4, $5, $5, $6, $6, $7, $8, $9)
+                    RETURNING character_id
+                    """,
+                    user_id, name, int(self.selected_race_id), int(self.selected_class_id), hp, mp, attack, defense, next_exp
+                )
+
+                if d_class['starting_items']:
+                    starting_items_str = d_class['starting_items']
+                    starting_items = json.loads(starting_items_str) if isinstance(starting_items_str, str) else starting_items_str
+
+                    for item_info in starting_items:
+                        item_id = await db.fetchval("SELECT item_id FROM game_items WHERE name = $1", item_info['item_name'])
+                        if item_id is not None:
+                            await db.execute(
+                                "INSERT INTO game_inventory (character_id, item_id, quantity) VALUES ($1, $2, $3)",
+                                character_id, item_id, item_info['quantity']
+                            )
 
             embed = discord.Embed(title="⚔️ 모험의 시작", description=f"{interaction.user.mention}, 당신의 새로운 이야기가 시작됩니다.", color=discord.Color.green())
             embed.add_field(name="이름", value=name)
@@ -127,7 +129,7 @@ class CharacterCreationView(discord.ui.View):
             self.stop()
 
         except Exception as e:
-            logging.error(f"캐릭터 생성 중 오류: {e}", exc_info=True)
+            logger.error(f"캐릭터 생성 중 오류: {e}", exc_info=True)
             await interaction.followup.send("캐릭터 생성 중 오류가 발생했습니다. 다시 시도해주세요.", ephemeral=True)
 
     async def on_race_select(self, interaction: discord.Interaction):
@@ -248,11 +250,11 @@ class GameUIView(discord.ui.View):
                 f"```\n"
                 f"이 정보와 함께 개발자에게 문의해주세요."
             )
-            logging.error(f"IndexError during rendering: Player({p.x},{p.y}), Move({dx},{dy}), Dungeon({d.width},{d.height})", exc_info=True)
+            logger.error(f"IndexError during rendering: Player({p.x},{p.y}), Move({dx},{dy}), Dungeon({d.width},{d.height})", exc_info=True)
             await interaction.edit_original_response(content=error_message, view=None) # view=None to remove buttons
         
         except Exception as e:
-            logging.error(f"An unexpected error occurred in handle_move: {e}", exc_info=True)
+            logger.error(f"An unexpected error occurred in handle_move: {e}", exc_info=True)
             await interaction.edit_original_response(content=f"알 수 없는 오류 발생: {e}", view=None)
 
     # 3x3 격자 이동 버튼
@@ -314,7 +316,7 @@ class GameUIView(discord.ui.View):
                 await interaction.followup.send("이곳에는 계단이 없습니다.", ephemeral=True)
 
         except Exception as e:
-            logging.error(f"An unexpected error occurred in use_stairs_callback: {e}", exc_info=True)
+            logger.error(f"An unexpected error occurred in use_stairs_callback: {e}", exc_info=True)
             await interaction.edit_original_response(content=f"계단 이용 중 알 수 없는 오류 발생: {e}", view=None)
 
 class TextRPG(commands.Cog):
@@ -327,14 +329,16 @@ class TextRPG(commands.Cog):
     async def explore_start(self, interaction: discord.Interaction):
         user_id = interaction.user.id
         try:
-            existing_character = await execute_query("SELECT 1 FROM game_characters WHERE user_id = $1", (user_id,))
+            async with connection() as db:
+                existing_character = await db.fetchval("SELECT 1 FROM game_characters WHERE user_id = $1", user_id)
+                if not existing_character:
+                    races = await db.fetch("SELECT * FROM game_races ORDER BY name")
+                    classes = await db.fetch("SELECT * FROM game_classes ORDER BY name")
+
             if existing_character:
                 await interaction.response.send_message("⚠️ 이미 살아있는 모험가가 있습니다. 여정을 끝마친 후에 새로운 모험을 시작할 수 있습니다.", ephemeral=True)
                 return
 
-            races = await execute_query("SELECT * FROM game_races ORDER BY name")
-            classes = await execute_query("SELECT * FROM game_classes ORDER BY name")
-
             if not races or not classes:
                 await interaction.response.send_message("❌ 게임 기본 데이터를 불러올 수 없습니다. 관리자에게 문의하세요.", ephemeral=True)
                 return
@@ -344,7 +348,7 @@ class TextRPG(commands.Cog):
             view.message = await interaction.original_response()
 
         except Exception as e:
-            logging.error(f"/던전 시작 명령어 처리 중 오류 발생: {e}", exc_info=True)
+            logger.error(f"/던전 시작 명령어 처리 중 오류 발생: {e}", exc_info=True)
             await interaction.response.send_message("❌ 모험을 시작하는 중 오류가 발생했습니다.", ephemeral=True)
 
     @dungeon.command(name="정보", description="현재 캐릭터의 상태를 확인합니다.")
@@ -352,30 +356,31 @@ class TextRPG(commands.Cog):
         user_id = interaction.user.id
         try:
             # 캐릭터 기본 정보, 종족, 직업 정보 가져오기
-            char_data = await execute_query("""
-                SELECT c.*, r.name as race_name, cl.name as class_name
-                FROM game_characters c
-                JOIN game_races r ON c.race_id = r.race_id
-                JOIN game_classes cl ON c.class_id = cl.class_id
-                WHERE c.user_id = $1
-            """, (user_id,))
-
-            if not char_data:
+            async with connection() as db:
+                char = await db.fetchrow("""
+                    SELECT c.*, r.name as race_name, cl.name as class_name
+                    FROM game_characters c
+                    JOIN game_races r ON c.race_id = r.race_id
+                    JOIN game_classes cl ON c.class_id = cl.class_id
+                    WHERE c.user_id = $1
+                """, user_id)
+
+                if char:
+                    # 인벤토리 정보 가져오기 (아이템 타입 포함)
+                    inventory_data = await db.fetch("""
+                        SELECT i.name, i.item_type, inv.quantity, inv.is_equipped
+                        FROM game_inventory inv
+                        JOIN game_items i ON inv.item_id = i.item_id
+                        WHERE inv.character_id = $1
+                        ORDER BY inv.is_equipped DESC, i.item_type, i.name
+                    """, char['character_id'])
+
+            if not char:
                 await interaction.response.send_message("생성된 캐릭터가 없습니다. `/던전 시작`으로 새로운 모험을 시작하세요.", ephemeral=True)
                 return
             
-            char = char_data[0]
             character_id = char['character_id']
 
-            # 인벤토리 정보 가져오기 (아이템 타입 포함)
-            inventory_data = await execute_query("""
-                SELECT i.name, i.item_type, inv.quantity, inv.is_equipped
-                FROM game_inventory inv
-                JOIN game_items i ON inv.item_id = i.item_id
-                WHERE inv.character_id = $1
-                ORDER BY inv.is_equipped DESC, i.item_type, i.name
-            """, (character_id,))
-
             # Embed 생성
             embed = discord.Embed(
                 title=f"<{char['name']}>의 모험 정보",
@@ -438,7 +443,7 @@ class TextRPG(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
         except Exception as e:
-            logging.error(f"/던전 정보 명령어 처리 중 오류 발생: {e}", exc_info=True)
+            logger.error(f"/던전 정보 명령어 처리 중 오류 발생: {e}", exc_info=True)
             await interaction.response.send_message("❌ 정보를 불러오는 중 오류가 발생했습니다.", ephemeral=True)
 
     @dungeon.command(name="맵보기", description="[개발자] 현재 생성된 던전의 전체 맵을 파일로 확인합니다.")
@@ -473,7 +478,7 @@ class TextRPG(commands.Cog):
             await interaction.response.send_message("현재 던전의 전체 맵입니다.", file=file, ephemeral=True)
 
         except Exception as e:
-            logging.error(f"맵 보기 기능 처리 중 오류: {e}", exc_info=True)
+            logger.error(f"맵 보기 기능 처리 중 오류: {e}", exc_info=True)
             await interaction.response.send_message("맵을 불러오는 중 오류가 발생했습니다.", ephemeral=True)
 
     @dungeon.command(name="텔레포트", description="[개발자] 지정된 방 ID의 중심으로 순간이동합니다.")
@@ -515,7 +520,7 @@ class TextRPG(commands.Cog):
                 await interaction.followup.send("⚠️ 텔레포트는 성공했으나, 화면을 찾을 수 없어 새로고침하지 못했습니다.", ephemeral=True)
 
         except Exception as e:
-            logging.error(f"텔레포트 기능 처리 중 오류: {e}", exc_info=True)
+            logger.error(f"텔레포트 기능 처리 중 오류: {e}", exc_info=True)
             # 이미 defer된 상호작용이므로 followup으로 응답
             if not interaction.is_done():
                 await interaction.followup.send("텔레포트 중 오류가 발생했습니다.", ephemeral=True)
@@ -561,14 +566,14 @@ class TextRPG(commands.Cog):
                 f"```\n"
                 f"이 정보와 함께 개발자에게 문의해주세요."
             )
-            logging.error(f"IndexError during initial rendering: Player={player_pos}, Dungeon={dungeon_size}", exc_info=True)
+            logger.error(f"IndexError during initial rendering: Player={player_pos}, Dungeon={dungeon_size}", exc_info=True)
             if not interaction.response.is_done():
                 await interaction.response.send_message(error_message, ephemeral=True)
             else:
                 await interaction.followup.send(error_message, ephemeral=True)
 
         except Exception as e:
-            logging.error(f"An unexpected error occurred in test_phase0: {e}", exc_info=True)
+            logger.error(f"An unexpected error occurred in test_phase0: {e}", exc_info=True)
             sentry_sdk.capture_exception(e)
             if not interaction.response.is_done():
                 await interaction.response.send_message(f"오류 발생: {e}", ephemeral=True)
@@ -1,8 +1,6 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from google import genai
-from google.genai import types
 import os
 from dotenv import load_dotenv
 import io
@@ -10,14 +8,24 @@ import wave
 import asyncio
 import logging
 
+import metrics
+from lazy import LazyClient, LazyModule
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
 load_dotenv()
 
+# google-genai SDK와 클라이언트는 처음 TTS를 요청할 때 불러옴
+genai = LazyModule("google.genai")
+types = LazyModule("google.genai.types")
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
-    print("경고: GEMINI_API_KEY 환경 변수가 설정되지 않았습니다. TTS 기능이 작동하지 않을 수 있습니다.")
+    logger.warning("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다. TTS 기능이 작동하지 않을 수 있습니다.")
     client = None
 else:
-    client = genai.Client(api_key=GEMINI_API_KEY)
+    client = LazyClient("google.genai.Client", lambda: genai.Client(api_key=GEMINI_API_KEY))
 
 # Google Gemini TTS에서 사용 가능한 음성 목록
 AVAILABLE_VOICES = {
@@ -83,7 +91,7 @@ class TTSCog(commands.Cog):
 
         def generate_tts():
             # 단일 화자 설정
-            return client.models.generate_content(
+            return client.get().models.generate_content(
                 model="gemini-2.5-flash-preview-tts",
                 contents=text,
                 config=types.GenerateContentConfig(
@@ -98,7 +106,9 @@ class TTSCog(commands.Cog):
                 )
             )
 
-        return await loop.run_in_executor(None, generate_tts)
+        with span("http.client", "POST gemini tts generate_content", voice=voice), \
+                metrics.EXTERNAL_API_SECONDS.time(api="tts"):
+            return await loop.run_in_executor(None, generate_tts)
 
     def _create_wave_file(self, pcm_data, channels=1, rate=24000, sample_width=2):
         """PCM 데이터를 WAV 파일로 변환합니다."""
@@ -227,11 +237,11 @@ class TTSCog(commands.Cog):
 
             voice_client.play(
                 discord.FFmpegPCMAudio(source=play_stream, pipe=True),
-                after=lambda e: logging.error(f'재생 오류: {e}') if e else logging.info('재생 완료')
+                after=lambda e: logger.error(f'재생 오류: {e}') if e else logger.info('재생 완료')
             )
 
         except Exception as e:
-            print(f"Google Gemini TTS 기능에서 오류 발생: {e}")
+            logger.error(f"Google Gemini TTS 기능에서 오류 발생: {e}")
             error_message = str(e).lower()
             if "api key" in error_message or "unauthorized" in error_message:
                 await interaction.followup.send("API 키가 잘못되었거나 설정되지 않았습니다. 봇 관리자에게 문의해주세요.", ephemeral=True)
@@ -292,6 +302,6 @@ class TTSCog(commands.Cog):
 async def setup(bot: commands.Bot):
     """이 cog를 봇에 추가하기 위한 진입점 함수입니다."""
     if client is None:
-        print("Google Gemini 클라이언트가 초기화되지 않아 TTSCog를 로드하지 않습니다.")
+        logger.info("Google Gemini 클라이언트가 초기화되지 않아 TTSCog를 로드하지 않습니다.")
         return
     await bot.add_cog(TTSCog(bot))
@@ -13,6 +13,10 @@ from typing import Optional, List
 from database_manager import execute_query
 from main import is_admin_or_developer, DEVELOPER_IDS, KST
 import sentry_sdk
+import logging
+import lazy
+
+logger = logging.getLogger(__name__)
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -67,15 +71,15 @@ class Version(commands.Cog):
                 encoding="utf-8"
             ).strip()
 
-            print(f"✅ 로컬 버전 정보 로드 완료: {self.local_commit_hash}")
+            logger.info(f"✅ 로컬 버전 정보 로드 완료: {self.local_commit_hash}")
         except FileNotFoundError:
-            print("Git이 설치되어 있지 않거나 경로가 잘못되었습니다. 로컬 버전 정보를 로드할 수 없습니다.")
+            logger.info("Git이 설치되어 있지 않거나 경로가 잘못되었습니다. 로컬 버전 정보를 로드할 수 없습니다.")
             self.local_commit_hash = "정보 없음"
             self.local_commit_date = None
             self.local_commit_message = "Git 정보를 찾을 수 없습니다."
             self.local_commit_author = "정보 없음"
         except Exception as e:
-            print(f"로컬 버전 정보 로드 실패: {e}")
+            logger.error(f"로컬 버전 정보 로드 실패: {e}")
             self.local_commit_hash = "봇 실행 시간"
             self.local_commit_date = None
             self.local_commit_message = "재실행 될 때까지 기다려주세요!"
@@ -208,6 +212,22 @@ class Version(commands.Cog):
                             inline=False
                         )
 
+                    # 지연 로딩으로 시작 시점에서 뺀 SDK 로드 시간
+                    lazy_stats = lazy.stats()
+                    if lazy_stats:
+                        lazy_info = []
+                        for entry in lazy_stats:
+                            if entry['loaded']:
+                                loaded_by = "미리 로드" if entry['loaded_by'] == 'warmup' else "첫 사용 시 로드"
+                                lazy_info.append(f"- {entry['name']}: {entry['load_ms']:.0f}ms ({loaded_by})")
+                            else:
+                                lazy_info.append(f"- {entry['name']}: 아직 로드 안 됨")
+                        embed.add_field(
+                            name=f"⚡ 지연 로딩 (시작 시간 {lazy.startup_time_saved_ms():.0f}ms 절약)",
+                            value="```" + "\n".join(lazy_info) + "```",
+                            inline=False
+                        )
+
                     embed.set_footer(
                         text=f"봇 버전 확인 시간: {datetime.datetime.now(kst_timezone).strftime(common_format)}"
                     )
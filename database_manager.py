@@ -1,9 +1,18 @@
 import os
+import time
 import asyncpg
-from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, AsyncIterator
 import aiopg
 from dotenv import load_dotenv
 import sentry_sdk
+import logging
+
+import metrics
+from tracing import span
+
+logger = logging.getLogger(__name__)
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -11,49 +20,307 @@ load_dotenv()
 # 전역 연결 풀
 _pool: Optional[asyncpg.Pool] = None
 
+# 자주 실행되는 쿼리 레지스트리 (이름 -> SQL)
+# 풀의 각 커넥션이 만들어질 때 한 번씩 prepare 되며, DBSession의 *_named 메서드로 이름을 지정해 실행합니다.
+PREPARED_STATEMENTS: Dict[str, str] = {
+    'balance_get': 'SELECT balance FROM user_balance WHERE user_id = $1',
+    'balance_apply': """
+        UPDATE user_balance SET balance = balance + $1
+        WHERE user_id = $2 AND balance >= -$1
+        RETURNING balance
+    """,
+    'balance_apply_many': """
+        UPDATE user_balance AS b
+        SET balance = b.balance + c.delta
+        FROM (
+            SELECT user_id, SUM(delta)::bigint AS delta
+            FROM unnest($1::bigint[], $2::bigint[]) AS t(user_id, delta)
+            GROUP BY user_id
+        ) AS c
+        WHERE b.user_id = c.user_id AND b.balance >= -c.delta
+        RETURNING b.user_id, b.balance
+    """,
+    'daily_chat_insert': """
+        INSERT INTO daily_chat_log (user_id, chat_date) VALUES ($1, $2)
+        ON CONFLICT (user_id, chat_date) DO NOTHING
+    """,
+    # 출석 upsert와 같은 문장에서 daily_attendance_stats를 증가시켜 오늘의 출석 순서를 함께 반환
+    'attendance_upsert': """
+        WITH attendance AS (
+            INSERT INTO user_attendance (user_id, attendance_count, last_attendance, streak_count)
+            VALUES ($1, 1, $2, 1)
+            ON CONFLICT (user_id) DO UPDATE
+            SET
+                attendance_count = user_attendance.attendance_count + 1,
+                last_attendance = $2,
+                streak_count = CASE
+                    WHEN DATE(user_attendance.last_attendance) = DATE($2 - INTERVAL '1 day')
+                    THEN user_attendance.streak_count + 1
+                    WHEN DATE(user_attendance.last_attendance) = DATE($2)
+                    THEN user_attendance.streak_count
+                    ELSE 1
+                END
+            RETURNING attendance_count, streak_count
+        ), stats AS (
+            INSERT INTO daily_attendance_stats (stat_date, attendance_count)
+            VALUES ($2, 1)
+            ON CONFLICT (stat_date) DO UPDATE
+            SET attendance_count = daily_attendance_stats.attendance_count + 1
+            RETURNING attendance_count AS attendance_order
+        )
+        SELECT attendance.attendance_count, attendance.streak_count, stats.attendance_order
+        FROM attendance, stats
+    """,
+    'attendance_order_get': 'SELECT attendance_count FROM daily_attendance_stats WHERE stat_date = $1',
+    'gacha_upsert': """
+        INSERT INTO user_gacha_characters (user_id, character_name, star, image_url, quantity)
+        VALUES ($1, $2, $3, $4, 1)
+        ON CONFLICT (user_id, character_name, star, image_url)
+        DO UPDATE SET quantity = user_gacha_characters.quantity + 1
+    """,
+}
+
+# 이름별 실행 통계 (호출 수, 누적/최대 소요 시간)
+_statement_stats: Dict[str, Dict[str, float]] = {}
+
+
+class PreparedConnection(asyncpg.Connection):
+    """PREPARED_STATEMENTS를 미리 prepare 해 두는 커넥션입니다."""
+
+    __slots__ = ('prepared',)
+
+
+async def _init_connection(conn: PreparedConnection):
+    """풀에 새 커넥션이 추가될 때 핫 쿼리를 prepare 합니다."""
+    conn.prepared = {}
+    for name, query in PREPARED_STATEMENTS.items():
+        try:
+            conn.prepared[name] = await conn.prepare(query)
+        except Exception as e:
+            # 테이블이 아직 없는 첫 실행 등에서는 실패할 수 있으며, 처음 사용할 때 다시 시도합니다.
+            logger.error(f"쿼리 준비 실패 ({name}): {e}")
+
 
 async def get_db_pool() -> asyncpg.Pool:
     """데이터베이스 연결 풀을 가져옵니다."""
     global _pool
     if _pool is None:
-        _pool = await asyncpg.create_pool(os.getenv('DATABASE_URL'))
+        _pool = await asyncpg.create_pool(
+            os.getenv('DATABASE_URL'),
+            connection_class=PreparedConnection,
+            init=_init_connection
+        )
     return _pool
 
 
+def get_pool_stats() -> Optional[Dict[str, int]]:
+    """연결 풀의 현재 크기와 사용 중/유휴 커넥션 수를 반환합니다. 풀이 없으면 None."""
+    if _pool is None:
+        return None
+    size = _pool.get_size()
+    idle = _pool.get_idle_size()
+    return {'size': size, 'idle': idle, 'in_use': size - idle, 'max': _pool.get_max_size()}
+
+
+def _pool_connection_counts() -> Optional[Dict[tuple, int]]:
+    stats = get_pool_stats()
+    if stats is None:
+        return None
+    return {('in_use',): stats['in_use'], ('idle',): stats['idle'], ('max',): stats['max']}
+
+
+metrics.DB_POOL_CONNECTIONS.set_function(_pool_connection_counts)
+
+
+def get_statement_stats() -> Dict[str, Dict[str, float]]:
+    """이름 있는 쿼리별 호출 수와 평균/최대 지연 시간(ms)을 반환합니다."""
+    return {
+        name: {
+            'calls': int(stats['calls']),
+            'avg_ms': stats['total_ms'] / stats['calls'] if stats['calls'] else 0.0,
+            'max_ms': stats['max_ms'],
+        }
+        for name, stats in _statement_stats.items()
+    }
+
+
+def _record_statement(name: str, elapsed_ms: float):
+    stats = _statement_stats.setdefault(name, {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+    stats['calls'] += 1
+    stats['total_ms'] += elapsed_ms
+    stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+    metrics.DB_QUERY_SECONDS.observe(elapsed_ms / 1000, statement=name)
+
+
 async def get_db_connection() -> Optional[asyncpg.Connection]:
     """데이터베이스 연결을 가져옵니다."""
     try:
         pool = await get_db_pool()
         return await pool.acquire()
     except Exception as e:
-        print(f"데이터베이스 연결 오류: {e}")
+        logger.error(f"데이터베이스 연결 오류: {e}")
         return None
 
 
-async def execute_query(query: str, params: Optional[tuple] = None) -> Optional[List[Dict[str, Any]]]:
-    """쿼리를 실행하고 결과를 반환합니다."""
+class DBSession:
+    """하나의 커넥션 위에서 여러 쿼리를 실행하는 실행기입니다.
+
+    `connection()` / `transaction()` 컨텍스트에서 얻으며, 블록 안의 모든 쿼리는
+    같은 커넥션을 재사용하므로 풀 체크아웃은 한 번만 발생합니다.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def fetch(self, query: str, *args) -> List[asyncpg.Record]:
+        """여러 행을 조회합니다."""
+        return await self._run(self.conn.fetch, query, args)
+
+    async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
+        """첫 번째 행만 조회합니다. 결과가 없으면 None을 반환합니다."""
+        return await self._run(self.conn.fetchrow, query, args)
+
+    async def fetchval(self, query: str, *args, column: int = 0) -> Any:
+        """첫 번째 행의 한 컬럼 값을 조회합니다."""
+        return await self._run(self.conn.fetchval, query, args, column=column)
+
+    async def execute(self, query: str, *args) -> str:
+        """결과 행이 필요 없는 쿼리를 실행하고 상태 문자열을 반환합니다."""
+        return await self._run(self.conn.execute, query, args)
+
+    async def fetch_named(self, name: str, *args) -> List[asyncpg.Record]:
+        """PREPARED_STATEMENTS에 등록된 쿼리를 이름으로 실행해 여러 행을 조회합니다."""
+        return await self._run_named(name, 'fetch', args)
+
+    async def fetchrow_named(self, name: str, *args) -> Optional[asyncpg.Record]:
+        """등록된 쿼리를 이름으로 실행해 첫 번째 행을 조회합니다."""
+        return await self._run_named(name, 'fetchrow', args)
+
+    async def fetchval_named(self, name: str, *args) -> Any:
+        """등록된 쿼리를 이름으로 실행해 첫 번째 행의 첫 컬럼 값을 조회합니다."""
+        return await self._run_named(name, 'fetchval', args)
+
+    async def execute_named(self, name: str, *args) -> str:
+        """등록된 쿼리를 이름으로 실행하고 상태 문자열을 반환합니다."""
+        return await self._run_named(name, 'execute', args)
+
+    async def executemany_named(self, name: str, args_list: List[tuple]) -> None:
+        """등록된 쿼리를 여러 인자 묶음으로 한 번에 실행합니다."""
+        await self._run_named(name, 'executemany', (args_list,))
+
+    def cursor(self, query: str, *args, prefetch: Optional[int] = None):
+        """서버 측 커서로 결과를 prefetch개씩 나눠 받으며 순회합니다. 트랜잭션 안에서만 사용할 수 있습니다."""
+        return self.conn.cursor(query, *args, prefetch=prefetch)
+
+    def transaction(self):
+        """현재 커넥션에서 (중첩 시 savepoint) 트랜잭션을 시작합니다."""
+        return self.conn.transaction()
+
+    async def _prepared(self, name: str, refresh: bool = False):
+        """이 커넥션에 prepare 된 쿼리를 가져오고, 없으면 지금 prepare 합니다."""
+        prepared = self.conn.prepared
+        if refresh or name not in prepared:
+            prepared[name] = await self.conn.prepare(PREPARED_STATEMENTS[name])
+        return prepared[name]
+
+    async def _call_prepared(self, name: str, method: str, args: tuple, refresh: bool = False):
+        statement = await self._prepared(name, refresh)
+        if method == 'execute':
+            await statement.fetch(*args)
+            return statement.get_statusmsg()
+        return await getattr(statement, method)(*args)
+
+    async def _run_named(self, name: str, method: str, args: tuple):
+        start = time.perf_counter()
+        try:
+            with span("db", name, statement=name):
+                try:
+                    return await self._call_prepared(name, method, args)
+                except asyncpg.exceptions.InvalidCachedStatementError:
+                    # 스키마 변경으로 무효화된 경우 한 번만 다시 prepare 합니다.
+                    return await self._call_prepared(name, method, args, refresh=True)
+        except Exception as e:
+            logger.error(f"쿼리 실행 오류 ({name}): {e}")
+            sentry_sdk.capture_exception(e)
+            raise
+        finally:
+            _record_statement(name, (time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    async def _run(method, query: str, args: tuple, **kwargs):
+        try:
+            with span("db", query.strip()), metrics.DB_QUERY_SECONDS.time(statement='raw'):
+                return await method(query, *args, **kwargs)
+        except Exception as e:
+            logger.error(f"쿼리 실행 오류: {e}")
+            sentry_sdk.capture_exception(e)
+            raise
+
+
+@asynccontextmanager
+async def connection(session: Optional[DBSession] = None) -> AsyncIterator[DBSession]:
+    """풀에서 커넥션 하나를 빌려 DBSession으로 제공합니다.
+
+    이미 열린 session을 넘기면 새로 빌리지 않고 그대로 재사용합니다.
+    """
+    if session is not None:
+        yield session
+        return
+
     pool = await get_db_pool()
-    conn = await get_db_connection()
+    async with pool.acquire() as conn:
+        yield DBSession(conn)
 
-    if not conn:
-        return None
 
-    try:
-        if query.strip().upper().startswith('SELECT'):
-            return await conn.fetch(query, *params) if params else await conn.fetch(query)
+@asynccontextmanager
+async def transaction(session: Optional[DBSession] = None) -> AsyncIterator[DBSession]:
+    """커넥션 하나를 빌려 트랜잭션 안에서 DBSession을 제공합니다."""
+    async with connection(session) as db:
+        async with db.transaction():
+            yield db
 
-        elif "RETURNING" in query.upper():
-            return await conn.fetch(query, *params) if params else await conn.fetch(query)
 
-        else:
-            await conn.execute(query, *params) if params else await conn.execute(query)
-            return None
-    except Exception as e:
-        print(f"쿼리 실행 오류: {e}")
-        sentry_sdk.capture_exception(e)
-        raise
-    finally:
-        await pool.release(conn)
+async def fetch(query: str, *args) -> List[asyncpg.Record]:
+    """단일 쿼리용 fetch. 여러 쿼리를 실행할 때는 connection()을 사용하세요."""
+    async with connection() as db:
+        return await db.fetch(query, *args)
+
+
+async def fetchrow(query: str, *args) -> Optional[asyncpg.Record]:
+    """단일 쿼리용 fetchrow."""
+    async with connection() as db:
+        return await db.fetchrow(query, *args)
+
+
+async def fetchval(query: str, *args, column: int = 0) -> Any:
+    """단일 쿼리용 fetchval."""
+    async with connection() as db:
+        return await db.fetchval(query, *args, column=column)
+
+
+async def execute(query: str, *args) -> str:
+    """단일 쿼리용 execute."""
+    async with connection() as db:
+        return await db.execute(query, *args)
+
+
+@lru_cache(maxsize=512)
+def _returns_rows(query: str) -> bool:
+    """쿼리가 결과 행을 반환하는지 판별합니다. 같은 쿼리 문자열은 한 번만 파싱합니다."""
+    normalized = query.strip().upper()
+    return normalized.startswith('SELECT') or "RETURNING" in normalized
+
+
+async def execute_query(query: str, params: Optional[tuple] = None) -> Optional[List[Dict[str, Any]]]:
+    """쿼리를 실행하고 결과를 반환합니다.
+
+    기존 호출부 호환용입니다. 새 코드는 fetch/fetchrow/fetchval/execute를 사용하세요.
+    """
+    async with connection() as db:
+        if _returns_rows(query):
+            return await db.fetch(query, *(params or ()))
+        await db.execute(query, *(params or ()))
+        return None
 
 # --- Dccon 즐겨찾기 기능 함수 ---
 
@@ -68,7 +335,7 @@ async def add_dccon_favorite(user_id: int, title: str, image_url: str) -> bool:
         await execute_query(query, (user_id, title, image_url))
         return True
     except Exception as e:
-        print(f"즐겨찾기 추가 중 오류 발생: {e}")
+        logger.error(f"즐겨찾기 추가 중 오류 발생: {e}")
         return False
 
 async def remove_dccon_favorite(user_id: int, image_url: str) -> bool:
@@ -82,7 +349,7 @@ async def remove_dccon_favorite(user_id: int, image_url: str) -> bool:
         await execute_query(query, (user_id, image_url))
         return True
     except Exception as e:
-        print(f"즐겨찾기 삭제 중 오류 발생: {e}")
+        logger.error(f"즐겨찾기 삭제 중 오류 발생: {e}")
         return False
 
 async def get_user_favorites(user_id: int) -> List[Dict[str, Any]]:
@@ -92,7 +359,7 @@ async def get_user_favorites(user_id: int) -> List[Dict[str, Any]]:
         favorites = await execute_query(query, (user_id,))
         return favorites if favorites else []
     except Exception as e:
-        print(f"즐겨찾기 목록 조회 중 오류 발생: {e}")
+        logger.error(f"즐겨찾기 목록 조회 중 오류 발생: {e}")
         return []
 
 async def is_dccon_favorited(user_id: int, image_url: str) -> bool:
@@ -102,5 +369,5 @@ async def is_dccon_favorited(user_id: int, image_url: str) -> bool:
         result = await execute_query(query, (user_id, image_url))
         return bool(result)
     except Exception as e:
-        print(f"즐겨찾기 확인 중 오류 발생: {e}")
+        logger.error(f"즐겨찾기 확인 중 오류 발생: {e}")
         return False
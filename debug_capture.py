@@ -0,0 +1,87 @@
+"""외부 사이트 응답 원문을 메모리에 잠시 보관하는 디버그용 링 버퍼입니다.
+
+파싱이 깨졌을 때 어떤 HTML을 받았는지 확인하기 위한 용도로, 디스크에는 쓰지 않습니다.
+기본값은 꺼져 있으며(DEBUG_CAPTURE_RATE=0) 켜면 그 비율만큼만 응답을 보관합니다.
+파싱 실패처럼 오류로 표시된 응답은 켜져 있는 동안 항상 보관합니다.
+
+환경 변수:
+    DEBUG_CAPTURE_RATE: 정상 응답을 보관할 비율 (0~1, 기본값 0)
+    DEBUG_CAPTURE_SIZE: 보관할 최대 응답 수 (기본값 20)
+"""
+import io
+import logging
+import os
+import random
+import time
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# 응답 하나당 보관할 최대 글자 수
+MAX_BODY_LENGTH = 512 * 1024
+
+
+class Capture(NamedTuple):
+    captured_at: float
+    source: str
+    url: str
+    status: int
+    body: str
+    error: bool
+
+
+class DebugCapture:
+    def __init__(self, rate: Optional[float] = None, maxlen: Optional[int] = None):
+        self.rate = rate if rate is not None else float(os.getenv("DEBUG_CAPTURE_RATE", "0"))
+        self._entries: deque = deque(maxlen=maxlen if maxlen is not None else int(os.getenv("DEBUG_CAPTURE_SIZE", 20)))
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def set_rate(self, rate: float):
+        self.rate = min(max(rate, 0.0), 1.0)
+        logger.info(f"디버그 캡처 비율 변경: {self.rate}")
+
+    def record(self, source: str, url: str, status: int, body: str, error: bool = False) -> bool:
+        """응답을 보관하고 실제로 보관했는지 반환합니다. 꺼져 있으면 아무것도 하지 않습니다."""
+        if not self.enabled:
+            return False
+        if not error and random.random() >= self.rate:
+            return False
+        self._entries.append(Capture(time.time(), source, url, status, body[:MAX_BODY_LENGTH], error))
+        return True
+
+    def entries(self, source: Optional[str] = None) -> List[Capture]:
+        # list()로 한 번에 복사해 워커 스레드에서 불러도 record()와 겹치지 않게 함
+        return [entry for entry in list(self._entries) if source is None or entry.source == source]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def dump(self, source: Optional[str] = None) -> Optional[io.BytesIO]:
+        """보관 중인 응답을 하나의 zip으로 묶어 반환합니다. 없으면 None."""
+        entries = self.entries(source)
+        if not entries:
+            return None
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            index = []
+            for number, entry in enumerate(entries, 1):
+                stamp = datetime.fromtimestamp(entry.captured_at).strftime('%Y%m%d-%H%M%S')
+                name = f"{number:02d}_{entry.source}_{stamp}{'_error' if entry.error else ''}.html"
+                archive.writestr(name, entry.body)
+                index.append(f"{name}\t{entry.status}\t{entry.url}")
+            archive.writestr("index.txt", "\n".join(index) + "\n")
+        buffer.seek(0)
+        return buffer
+
+
+# 봇 전체에서 공유하는 캡처 버퍼
+captures = DebugCapture()
@@ -4,6 +4,8 @@ from game.dungeon import Dungeon, DUNGEON_WIDTH, DUNGEON_HEIGHT
 from game.player import Player
 from game.fov import compute_fov
 
+logger = logging.getLogger(__name__)
+
 # 시야 반경 설정
 FOV_RADIUS = 6
 
@@ -35,7 +37,7 @@ class GameManager:
         """다음 층으로 이동. 새 던전을 생성하고 게임 상태를 재설정."""
         self.current_floor += 1
         self._generate_floor()
-        logging.info(f"Player moved to floor {self.current_floor}")
+        logger.info(f"Player moved to floor {self.current_floor}")
 
     def update_fov(self):
         """플레이어 주변의 시야를 다시 계산"""
@@ -56,10 +58,10 @@ class GameManager:
             self.player.x = new_x
             self.player.y = new_y
             self.update_fov()
-            logging.info(f"Player teleported to room {room_id} at ({new_x}, {new_y}).")
+            logger.info(f"Player teleported to room {room_id} at ({new_x}, {new_y}).")
             return True
         else:
-            logging.warning(f"Teleport failed: Room ID {room_id} not found.")
+            logger.warning(f"Teleport failed: Room ID {room_id} not found.")
             return False
 
     def use_stairs(self):
@@ -75,7 +77,7 @@ class GameManager:
         new_x = self.player.x + dx
         new_y = self.player.y + dy
 
-        logging.info(f"Attempting to move player from ({self.player.x}, {self.player.y}) to ({new_x}, {new_y}). Dungeon size: ({self.dungeon.width}, {self.dungeon.height})")
+        logger.debug(f"Attempting to move player from ({self.player.x}, {self.player.y}) to ({new_x}, {new_y}). Dungeon size: ({self.dungeon.width}, {self.dungeon.height})")
 
         if 0 <= new_x < self.dungeon.width and 0 <= new_y < self.dungeon.height:
             target_tile = self.dungeon.tiles[new_y][new_x]
@@ -86,7 +88,7 @@ class GameManager:
                 target_tile.blocked = False
                 target_tile.block_sight = False
                 self.update_fov()
-                logging.info(f"Player opened a door at ({new_x}, {new_y})")
+                logger.info(f"Player opened a door at ({new_x}, {new_y})")
             elif not target_tile.blocked:
                 # 일반 이동
                 self.player.x = new_x
@@ -0,0 +1,149 @@
+"""봇 이벤트 루프 위에서 동작하는 aiohttp 상태 확인 서버입니다.
+
+- /          : 호스팅 서비스용 단순 응답
+- /healthz   : 프로세스가 살아 있는지 (항상 200)
+- /readyz    : 게이트웨이 연결과 DB 풀이 정상인지 (정상 200, 아니면 503)
+- /status    : 지연 시간, 풀 사용량, 대기열 길이 등 (JSON)
+
+Prometheus 텍스트 형식의 /metrics는 외부에 노출되지 않도록 별도의 로컬 포트(METRICS_PORT)에서 제공합니다.
+
+RENDER_EXTERNAL_URL이 설정되어 있으면 슬립 모드 방지를 위해 주기적으로 자기 자신에게 요청을 보냅니다.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+from aiohttp import web
+from discord.ext import commands
+
+import metrics
+from database_manager import fetchval, get_pool_stats
+
+logger = logging.getLogger(__name__)
+
+# 14분마다 핑 (15분 미사용 시 슬립되는 호스팅 기준)
+SELF_PING_INTERVAL = 840
+DB_CHECK_TIMEOUT = 2.0
+
+
+class HealthServer:
+    def __init__(self, bot: commands.Bot, host: str = '0.0.0.0', port: Optional[int] = None,
+                 metrics_host: str = '127.0.0.1', metrics_port: Optional[int] = None):
+        self.bot = bot
+        self.host = host
+        # Render에서 제공하는 PORT 환경변수 사용
+        self.port = port if port is not None else int(os.getenv("PORT", 8080))
+        self.metrics_host = metrics_host
+        self.metrics_port = metrics_port if metrics_port is not None else int(os.getenv("METRICS_PORT", 9091))
+        self.started_at = time.monotonic()
+
+        metrics.GATEWAY_LATENCY.set_function(lambda: self._latency())
+        metrics.GUILDS.set_function(lambda: len(bot.guilds))
+        metrics.ATTENDANCE_PENDING.set_function(lambda: bot.attendance.pending_count)
+        metrics.MESSAGES_PROCESSING.set_function(lambda: len(bot.processing_messages))
+
+        self.app = web.Application()
+        self.app.router.add_get('/', self.home)
+        self.app.router.add_get('/healthz', self.healthz)
+        self.app.router.add_get('/readyz', self.readyz)
+        self.app.router.add_get('/status', self.status)
+
+        self.metrics_app = web.Application()
+        self.metrics_app.router.add_get('/metrics', self.metrics_text)
+
+        self._runner: Optional[web.AppRunner] = None
+        self._metrics_runner: Optional[web.AppRunner] = None
+        self._ping_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """서버를 시작합니다. 포트를 열지 못해도 봇은 계속 동작하도록 오류는 기록만 합니다."""
+        self._runner = await self._start_site(self.app, self.host, self.port, "상태 확인 서버")
+        if self.metrics_port > 0:
+            self._metrics_runner = await self._start_site(self.metrics_app, self.metrics_host, self.metrics_port, "메트릭 서버")
+
+        ping_url = os.getenv('RENDER_EXTERNAL_URL')
+        if ping_url:
+            self._ping_task = asyncio.create_task(self._self_ping(ping_url))
+
+    @staticmethod
+    async def _start_site(app: web.Application, host: str, port: int, label: str) -> Optional[web.AppRunner]:
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError as e:
+            logger.error(f"{label} 시작 실패 ({host}:{port}): {e}")
+            await runner.cleanup()
+            return None
+        logger.info(f"{label} 시작: {host}:{port}")
+        return runner
+
+    async def close(self):
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            self._ping_task = None
+        for runner in (self._runner, self._metrics_runner):
+            if runner is not None:
+                await runner.cleanup()
+        self._runner = self._metrics_runner = None
+
+    async def _self_ping(self, url: str):
+        """주기적으로 자체 서버에 요청을 보내 슬립 모드를 방지합니다."""
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            while True:
+                await asyncio.sleep(SELF_PING_INTERVAL)
+                try:
+                    async with session.get(url) as response:
+                        logger.info(f"서버 핑 전송 완료: {response.status}")
+                except Exception as e:
+                    logger.error(f"서버 핑 전송 실패: {e}")
+
+    async def _db_healthy(self) -> bool:
+        try:
+            return await asyncio.wait_for(fetchval('SELECT 1'), DB_CHECK_TIMEOUT) == 1
+        except Exception as e:
+            logger.warning(f"DB 상태 확인 실패: {e}")
+            return False
+
+    def _gateway_connected(self) -> bool:
+        return self.bot.is_ready() and not self.bot.is_closed()
+
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="Bot is running!")
+
+    async def healthz(self, request: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    async def readyz(self, request: web.Request) -> web.Response:
+        checks = {'gateway': self._gateway_connected(), 'database': await self._db_healthy()}
+        return web.json_response(checks, status=200 if all(checks.values()) else 503)
+
+    def _latency(self) -> Optional[float]:
+        # 첫 하트비트 전에는 inf 또는 nan
+        latency = self.bot.latency
+        return latency if latency == latency and latency != float('inf') else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 지연 시간과 대기열 상태를 모읍니다."""
+        bot = self.bot
+        latency = self._latency()
+        return {
+            'uptime_seconds': round(time.monotonic() - self.started_at, 1),
+            'gateway_connected': self._gateway_connected(),
+            'gateway_latency_ms': round(latency * 1000, 1) if latency is not None else None,
+            'guilds': len(bot.guilds),
+            'db_pool': get_pool_stats(),
+            'attendance_pending': bot.attendance.pending_count,
+            'messages_processing': len(bot.processing_messages),
+            'messages_cached': len(bot.message_sent),
+        }
+
+    async def status(self, request: web.Request) -> web.Response:
+        return web.json_response(self.snapshot())
+
+    async def metrics_text(self, request: web.Request) -> web.Response:
+        return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8',
+                            headers={'X-Content-Type-Options': 'nosniff'})
@@ -0,0 +1,169 @@
+"""원본 URL 해시로 찾는 변환 완료 이미지의 디스크 캐시입니다.
+
+변환이 끝난 최종 파일과 원본 크기를 함께 보관하므로, 같은 이미지를 다시 보거나 보낼 때는
+다운로드와 ffmpeg 변환 없이 바로 파일을 돌려줍니다. 전체 용량이 max_bytes를 넘으면
+가장 오래 사용하지 않은 파일부터 지웁니다. 사용 순서는 메모리에서 관리하고, 새 파일을 넣을 때와
+persist_access()를 호출할 때 파일 mtime에 반영해 재시작 후에도 유지됩니다.
+
+파일 구성: <sha256(url)>.<확장자> + <sha256(url)>.json (url, 파일 이름, 원본 크기)
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CachedImage(NamedTuple):
+    path: str
+    size: int
+    dimensions: Optional[Tuple[int, int]]
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class ImageCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # key -> CachedImage. 최근에 사용한 항목이 맨 뒤
+        self._entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # 마지막 persist_access 이후 사용된 키 (get은 파일을 건드리지 않음)
+        self._touched: Set[str] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self):
+        """디렉터리를 읽어 색인을 다시 만듭니다. 메타 파일이 없는 조각 파일은 지웁니다."""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        known_files = set()
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.directory, filename)
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                path = os.path.join(self.directory, meta['file'])
+                stat = os.stat(path)
+            except (OSError, ValueError, KeyError):
+                self._remove_files(meta_path)
+                continue
+            dims = tuple(meta['dimensions']) if meta.get('dimensions') else None
+            found.append((stat.st_mtime, filename[:-5], CachedImage(path, stat.st_size, dims)))
+            known_files.update((filename, meta['file']))
+
+        for filename in os.listdir(self.directory):
+            if filename not in known_files:
+                self._remove_files(os.path.join(self.directory, filename))
+
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            for _, key, entry in sorted(found):
+                self._entries[key] = entry
+                self._total_bytes += entry.size
+            self._evict()
+        logger.info(f"이미지 캐시 로드: {len(self._entries)}개, {self._total_bytes / (1024 * 1024):.1f}MB")
+
+    def get(self, url: str) -> Optional[CachedImage]:
+        """메모리 색인만 확인하므로 이벤트 루프에서 바로 호출해도 됩니다."""
+        key = url_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._touched.add(key)
+            self.hits += 1
+        return entry
+
+    def persist_access(self):
+        """메모리에 쌓인 사용 기록을 파일 mtime에 반영합니다. 워커 스레드에서 호출합니다."""
+        with self._lock:
+            touched = [(key, self._entries[key]) for key in self._touched if key in self._entries]
+            self._touched.clear()
+        for key, entry in touched:
+            try:
+                os.utime(entry.path)
+            except FileNotFoundError:
+                # 밖에서 지워진 경우 색인에서도 제거
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                        self._total_bytes -= entry.size
+
+    def put(self, url: str, source_path: str, dimensions: Optional[Tuple[int, int]]) -> CachedImage:
+        """변환이 끝난 source_path 파일을 캐시로 옮기고 캐시된 항목을 반환합니다. 워커 스레드에서 호출합니다."""
+        # 제거가 일어날 수 있으므로 그 전에 사용 기록을 디스크에 남김
+        self.persist_access()
+        key = url_key(url)
+        ext = os.path.splitext(source_path)[1]
+        filename = f"{key}{ext}"
+        path = os.path.join(self.directory, filename)
+        shutil.move(source_path, path)
+        entry = CachedImage(path, os.path.getsize(path), tuple(dimensions) if dimensions else None)
+
+        meta_path = os.path.join(self.directory, f"{key}.json")
+        tmp_meta_path = meta_path + '.tmp'
+        with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'file': filename, 'dimensions': entry.dimensions}, f)
+        os.replace(tmp_meta_path, meta_path)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.size
+                if old.path != path:
+                    self._remove_files(old.path)
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+            self._touched.discard(key)
+            self._evict(keep=key)
+        return entry
+
+    def _evict(self, keep: Optional[str] = None):
+        # 잠금을 잡은 상태에서 호출
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self._touched.discard(key)
+            self._total_bytes -= entry.size
+            self.evictions += 1
+            self._remove_files(entry.path, os.path.join(self.directory, f"{key}.json"))
+
+    @staticmethod
+    def _remove_files(*paths: str):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"캐시 파일 삭제 실패 ({path}): {e}")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,112 @@
+"""무거운 SDK를 처음 사용할 때 불러오는 지연 import / 지연 생성 도구입니다.
+
+LazyModule은 속성에 처음 접근할 때 모듈을 import 하고, LazyClient는 처음 get() 할 때
+클라이언트를 만듭니다. 각 항목이 실제로 불러와진 시각과 걸린 시간을 기록하므로
+봇 시작 시점에서 아낀 시간을 확인할 수 있습니다 (/버전에 표시).
+"""
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _LazyEntry:
+    """지연 로딩 항목의 공통 상태 (이름, 로드 시간, 로드 경로)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.load_ms: Optional[float] = None
+        # 'warmup' (백그라운드 미리 로드) 또는 'demand' (처음 사용할 때 로드)
+        self.loaded_by: Optional[str] = None
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    @property
+    def loaded(self) -> bool:
+        return self.load_ms is not None
+
+    def _load(self) -> Any:
+        raise NotImplementedError
+
+    def _ensure(self, loaded_by: str = 'demand') -> Any:
+        with self._lock:
+            if self.load_ms is None:
+                start = time.perf_counter()
+                self._value = self._load()
+                self.load_ms = (time.perf_counter() - start) * 1000
+                self.loaded_by = loaded_by
+                logger.info(f"지연 로드 완료: {self.name} ({self.load_ms:.0f}ms, {loaded_by})")
+        return self._value
+
+
+class LazyModule(_LazyEntry):
+    def __init__(self, module_name: str):
+        """module_name 모듈을 첫 속성 접근 시 import 합니다."""
+        super().__init__(module_name)
+        self._value = None
+
+    def _load(self):
+        return importlib.import_module(self.name)
+
+    def __getattr__(self, attr: str) -> Any:
+        # _value 등 인스턴스 속성은 여기까지 오지 않음
+        return getattr(self._ensure(), attr)
+
+
+class LazyClient(_LazyEntry):
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """factory()를 처음 get() 할 때 한 번만 호출해 결과를 재사용합니다."""
+        super().__init__(name)
+        self._factory = factory
+        self._value = None
+
+    def _load(self):
+        return self._factory()
+
+    def get(self) -> Any:
+        return self._ensure()
+
+
+_registry: List[_LazyEntry] = []
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def stats() -> List[Dict[str, Any]]:
+    """등록된 지연 로딩 항목별 상태를 반환합니다."""
+    return [
+        {'name': entry.name, 'loaded': entry.loaded, 'load_ms': entry.load_ms, 'loaded_by': entry.loaded_by}
+        for entry in _registry
+    ]
+
+
+def startup_time_saved_ms() -> float:
+    """시작 시 바로 불러왔다면 걸렸을 시간 중 지금까지 측정된 합계입니다."""
+    return sum(entry.load_ms for entry in _registry if entry.load_ms is not None)
+
+
+async def warm_up(delay: float = 0.0):
+    """아직 불러오지 않은 항목을 워커 스레드에서 하나씩 미리 불러옵니다."""
+    if delay > 0:
+        await asyncio.sleep(delay)
+    for entry in list(_registry):
+        if entry.loaded:
+            continue
+        try:
+            await asyncio.to_thread(entry._ensure, 'warmup')
+        except Exception as e:
+            logger.warning(f"지연 로드 항목 미리 불러오기 실패 ({entry.name}): {e}")
+
+
+def start_warm_up(delay: float) -> Optional[asyncio.Task]:
+    """warm_up을 한 번만 백그라운드 작업으로 시작합니다. delay가 음수면 시작하지 않습니다."""
+    global _warmup_task
+    if delay < 0 or _warmup_task is not None:
+        return _warmup_task
+    _warmup_task = asyncio.create_task(warm_up(delay))
+    return _warmup_task
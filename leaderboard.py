@@ -0,0 +1,103 @@
+"""랭킹을 메모리에 정렬된 상태로 유지하는 리더보드입니다.
+
+점수가 바뀔 때마다 해당 사용자 한 명의 위치만 이분 탐색으로 옮기므로
+랭킹 화면은 테이블을 정렬하지 않고 앞에서부터 읽기만 하면 됩니다.
+출석 보드는 AttendancePipeline이, 잔액 보드는 balance_ledger가 갱신합니다.
+"""
+import asyncio
+import bisect
+import logging
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from database_manager import fetch
+
+logger = logging.getLogger(__name__)
+
+
+class Leaderboard:
+    def __init__(self):
+        """점수가 0보다 큰 사용자만 (점수 내림차순, user_id 오름차순)으로 보관합니다."""
+        self._scores: Dict[int, int] = {}
+        self._order: List[Tuple[int, int]] = []  # (-점수, user_id)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """(user_id, 점수)를 높은 점수부터 순회합니다."""
+        for neg_score, user_id in self._order:
+            yield user_id, -neg_score
+
+    def score(self, user_id: int) -> int:
+        return self._scores.get(user_id, 0)
+
+    def replace(self, scores: Mapping[int, int]):
+        """전체 점수를 새로 채웁니다."""
+        self._scores = {user_id: score for user_id, score in scores.items() if score > 0}
+        self._order = sorted((-score, user_id) for user_id, score in self._scores.items())
+
+    def set(self, user_id: int, score: int):
+        old = self._scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            index = bisect.bisect_left(self._order, (-old, user_id))
+            del self._order[index]
+            del self._scores[user_id]
+        if score > 0:
+            self._scores[user_id] = score
+            bisect.insort(self._order, (-score, user_id))
+
+    def remove(self, user_id: int):
+        self.set(user_id, 0)
+
+    def top(self, limit: int = 10, include: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, int, int]]:
+        """(순위, user_id, 점수)를 limit명까지 반환합니다. 동점자는 같은 순위를 받습니다.
+        include를 주면 해당 사용자만 대상으로 순위를 매깁니다 (예: 길드 멤버)."""
+        ranked = []
+        current_rank = 0
+        current_score = None
+        for user_id, score in self:
+            if include is not None and not include(user_id):
+                continue
+            if score != current_score:
+                current_rank = len(ranked) + 1
+                current_score = score
+            ranked.append((current_rank, user_id, score))
+            if len(ranked) >= limit:
+                break
+        return ranked
+
+
+# 연속 출석 일수 / 총 출석 횟수 / 보유 금액 랭킹
+streaks = Leaderboard()
+attendance_counts = Leaderboard()
+balances = Leaderboard()
+
+_balances_loaded = False
+_balances_lock = asyncio.Lock()
+
+
+async def load_balances():
+    """user_balance에서 잔액 보드를 다시 채웁니다."""
+    global _balances_loaded
+    rows = await fetch('SELECT user_id, balance FROM user_balance WHERE balance > 0')
+    balances.replace({row['user_id']: row['balance'] for row in rows})
+    _balances_loaded = True
+    logger.info(f"잔액 랭킹 로드: {len(balances)}명")
+
+
+async def ensure_balances_loaded():
+    if _balances_loaded:
+        return
+    async with _balances_lock:
+        if not _balances_loaded:
+            await load_balances()
+
+
+def guild_filter(guild) -> Callable[[int], bool]:
+    """봇이 아닌 길드 멤버만 통과시키는 include 함수를 만듭니다."""
+    def include(user_id: int) -> bool:
+        member = guild.get_member(user_id)
+        return member is not None and not member.bot
+    return include
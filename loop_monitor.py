@@ -0,0 +1,151 @@
+"""이벤트 루프 지연 측정과 루프를 막는 콜백 탐지를 담당하는 감시기입니다.
+
+- 이벤트 루프 안의 하트비트 작업이 interval마다 깨어나 늦게 깨어난 만큼을 루프 지연으로 기록합니다.
+- 별도의 감시 스레드가 하트비트가 threshold 이상 멈춘 것을 발견하면 그 순간 루프 스레드의
+  스택과 실행 중인 작업을 잡아 로그와 Sentry로 보냅니다. 같은 위치는 cooldown 동안 한 번만 보고합니다.
+
+환경 변수:
+    LOOP_MONITOR_INTERVAL_MS: 하트비트 간격 (기본값 100, 0이면 끔)
+    LOOP_BLOCK_THRESHOLD_MS: 막힘으로 판단할 지연 (기본값 250)
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+import sentry_sdk
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+REPORT_COOLDOWN = 300.0
+# 스택 중 로그/Sentry에 남길 최대 프레임 수 (안쪽부터)
+MAX_FRAMES = 30
+
+
+class LoopMonitor:
+    def __init__(self, interval: Optional[float] = None, threshold: Optional[float] = None,
+                 cooldown: float = REPORT_COOLDOWN):
+        self.interval = interval if interval is not None else int(os.getenv("LOOP_MONITOR_INTERVAL_MS", 100)) / 1000
+        self.threshold = threshold if threshold is not None else int(os.getenv("LOOP_BLOCK_THRESHOLD_MS", 250)) / 1000
+        self.cooldown = cooldown
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # 하트비트가 마지막으로 깨어난 시각과 횟수 (감시 스레드는 읽기만 함)
+        self._last_beat = time.monotonic()
+        self._beats = 0
+        self._reported_beat = -1
+        self._last_reported: Dict[str, float] = {}
+
+    def start(self):
+        """현재 이벤트 루프에서 하트비트를 시작하고 감시 스레드를 띄웁니다."""
+        if self.interval <= 0 or self._heartbeat_task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-monitor', daemon=True)
+        self._watchdog.start()
+        logger.info(f"이벤트 루프 감시 시작 (간격 {self.interval * 1000:.0f}ms, 기준 {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        self._watchdog = None
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._last_beat = time.monotonic()
+            self._beats += 1
+            metrics.EVENT_LOOP_LAG.observe(lag)
+            metrics.EVENT_LOOP_LAG_LAST.set(lag)
+            if lag >= self.threshold:
+                metrics.EVENT_LOOP_BLOCKS.inc()
+                logger.debug(f"이벤트 루프 지연 {lag * 1000:.0f}ms")
+
+    def _watch(self):
+        # 하트비트 주기의 절반마다 확인해 막힌 동안 스택을 잡을 수 있게 함
+        while not self._stop.wait(self.interval / 2):
+            stalled = time.monotonic() - self._last_beat - self.interval
+            beat = self._beats
+            if stalled < self.threshold or beat == self._reported_beat:
+                continue
+            # 한 번 막힌 동안에는 한 번만 보고
+            self._reported_beat = beat
+            try:
+                self._report(stalled)
+            except Exception as e:
+                logger.warning(f"이벤트 루프 막힘 보고 실패: {e}")
+
+    def _capture(self) -> Optional[List[traceback.FrameSummary]]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        return traceback.extract_stack(frame)[-MAX_FRAMES:]
+
+    def _current_task(self) -> str:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is None:
+            return '(콜백)'
+        coro = task.get_coro()
+        return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+    @staticmethod
+    def _location(stack: List[traceback.FrameSummary]) -> str:
+        """스택에서 가장 안쪽의 프로젝트 코드 위치를 찾습니다 (없으면 가장 안쪽 프레임)."""
+        for frame in reversed(stack):
+            if frame.filename.startswith(_PROJECT_ROOT):
+                return f"{os.path.relpath(frame.filename, _PROJECT_ROOT)}:{frame.lineno} ({frame.name})"
+        last = stack[-1]
+        return f"{last.filename}:{last.lineno} ({last.name})"
+
+    def _report(self, stalled: float):
+        stack = self._capture()
+        if not stack:
+            return
+        location = self._location(stack)
+        now = time.monotonic()
+        if now - self._last_reported.get(location, float('-inf')) < self.cooldown:
+            return
+        self._last_reported[location] = now
+
+        task = self._current_task()
+        formatted = ''.join(traceback.format_list(stack))
+        logger.warning(
+            f"이벤트 루프가 {stalled * 1000:.0f}ms 이상 막힘: {location}, 작업 {task}\n{formatted}"
+        )
+        with sentry_sdk.isolation_scope() as scope:
+            scope.set_tag("loop_block_location", location)
+            scope.set_context("event_loop_block", {
+                'stalled_ms': round(stalled * 1000),
+                'task': task,
+                'stack': formatted,
+            })
+            scope.fingerprint = ['event-loop-block', location]
+            sentry_sdk.capture_message(f"이벤트 루프 막힘: {location}", level="warning")
+
+
+# 봇 전체에서 공유하는 감시기
+monitor = LoopMonitor()
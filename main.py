@@ -5,12 +5,7 @@ from datetime import datetime, timedelta
 import pytz
 from discord.ui import Button, View
 import os
-# 웹 서버를 위한 추가 import
-from flask import Flask
-import threading
 from dotenv import load_dotenv
-import requests  # 새로 추가
-import time  # 새로 추가
 import sys
 from typing import Optional, List, Dict, Any
 
@@ -18,28 +13,26 @@ import logging
 import sentry_sdk
 from sentry_sdk.integrations.logging import LoggingIntegration
 
-from database_manager import get_db_connection, execute_query, get_db_pool
+from database_manager import execute_query, get_db_pool, connection, fetch, DBSession
+import balance_ledger
+import leaderboard
+import migrations
+import startup
+import lazy
+from loop_monitor import monitor as loop_monitor
+from health_server import HealthServer
+from attendance_pipeline import AttendancePipeline
+from ttl_cache import TTLCache
+from account_index import accounts
+from bot_logging import setup_logging, sampled
+from message_router import MessageRouter, MessageKind
+from tracing import TracedCommandTree, command_transaction, traces_sampler
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 # 환경변수 로드
 load_dotenv()
 
-# Flask 앱 생성
-app = Flask(__name__)
-
-
-@app.route('/')
-def home():
-    return "Bot is running!"
-
-
-def run_flask():
-    # Render에서 제공하는 PORT 환경변수 사용
-    port = int(os.getenv("PORT", 8080))
-    app.run(host='0.0.0.0', port=port)
-
-
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
@@ -64,20 +57,12 @@ async def check_user_interaction(interaction: discord.Interaction, user_id: int)
     return True
 
 
-async def update_balance(user_id: int, amount: int) -> bool:
-    """user_id의 잔고를 amount만큼 업데이트합니다."""
+async def update_balance(user_id: int, amount: int, db: Optional[DBSession] = None) -> bool:
+    """user_id의 잔고를 amount만큼 업데이트합니다.
+    db를 넘기면 호출자의 커넥션을 재사용합니다."""
     try:
-        result = await execute_query(
-            'SELECT balance FROM user_balance WHERE user_id = $1',
-            (user_id,)
-        )
-        if not result or result[0]['balance'] < -amount:
+        if await balance_ledger.apply(user_id, amount, db) is None:
             return False
-
-        await execute_query(
-            'UPDATE user_balance SET balance = user_balance.balance + $1 WHERE user_id = $2',
-            (amount, user_id)
-        )
         logger.info(f"{user_id}님의 통장에 {amount}만큼 변동이 생겼습니다.")
         return True
     except Exception as e:
@@ -88,11 +73,9 @@ async def update_balance(user_id: int, amount: int) -> bool:
 async def check_balance(user_id: int, required_amount: int) -> bool:
     """사용자의 잔액이 요구되는 금액 이상인지 확인합니다."""
     try:
-        result = await execute_query(
-            'SELECT balance FROM user_balance WHERE user_id = $1',
-            (user_id,)
-        )
-        return bool(result and result[0]['money'] >= required_amount)
+        async with connection() as db:
+            balance = await db.fetchval_named('balance_get', user_id)
+        return balance is not None and balance >= required_amount
     except Exception as e:
         logger.error(f"잔액 확인 오류: {e}")
         return False
@@ -118,6 +101,7 @@ async def reset_money(user_id: int) -> bool:
             'UPDATE user_balance SET balance = 0 WHERE user_id = $1',
             (user_id,)
         )
+        leaderboard.balances.remove(user_id)
         return True
     except Exception as e:
         logger.error(f"잔액 초기화 오류: {e}")
@@ -138,7 +122,10 @@ class ResetAttendanceView(View):
         self.stop()
 
         try:
-            if not await reset_attendance(self.user_id):
+            # 삭제가 끝날 때까지 출석 기록 저장을 멈춰 지운 기록이 다시 생기지 않게 함
+            async with interaction.client.attendance.forget([self.user_id]):
+                reset_ok = await reset_attendance(self.user_id)
+            if not reset_ok:
                 return
             else:
                 await interaction.response.edit_message(
@@ -212,7 +199,7 @@ class ClearAllView(View):
 
         # 멤버 ID 목록 생성 (봇 제외)
         member_ids = [member.id for member in guild.members if not member.bot]
-        print(f"초기화 대상 멤버 ID 목록: {member_ids}")
+        logger.info(f"초기화 대상 멤버 ID 목록: {member_ids}")
 
         if not member_ids:
             await interaction.response.edit_message(
@@ -221,16 +208,19 @@ class ClearAllView(View):
             )
             return
 
-        # 현재 데이터베이스 상태 확인
-        total_before = await execute_query('SELECT COUNT(*) FROM user_attendance')
+        # 삭제가 끝날 때까지 출석 기록 저장을 멈춰 지운 기록이 다시 생기지 않게 함
+        async with interaction.client.attendance.forget(member_ids), connection() as db:
+            # 현재 데이터베이스 상태 확인
+            total_before = await db.fetchval('SELECT COUNT(*) FROM user_attendance')
 
-        # 멤버별로 개별 삭제 (더 안정적인 방법)
-        deleted_count = 0
-        for member_id in member_ids:
-            await execute_query('DELETE FROM user_attendance WHERE user_id = $1 RETURNING user_id', (member_id,))
+            # 멤버별로 개별 삭제 (더 안정적인 방법)
+            deleted_count = 0
+            for member_id in member_ids:
+                if await db.fetchval('DELETE FROM user_attendance WHERE user_id = $1 RETURNING user_id', member_id):
+                    deleted_count += 1
 
-        # 삭제 후 상태 확인
-        total_after = await execute_query('SELECT COUNT(*) FROM user_attendance')
+            # 삭제 후 상태 확인
+            total_after = await db.fetchval('SELECT COUNT(*) FROM user_attendance')
 
         status_message = (
             f"✅ 서버의 출석 데이터가 초기화되었습니다.\n"
@@ -240,7 +230,7 @@ class ClearAllView(View):
             f"- 전체 레코드 변화: {total_before} → {total_after}"
         )
 
-        print(status_message)
+        logger.info(status_message)
         await interaction.response.edit_message(content=status_message, view=None)
 
     @discord.ui.button(label="✗ 취소", style=discord.ButtonStyle.gray)
@@ -260,41 +250,18 @@ class RankingView(View):
     @discord.ui.button(label="1️⃣ 출석 랭킹", style=discord.ButtonStyle.primary)
     async def attendance_ranking(self, interaction: discord.Interaction, button: Button):
         await check_user_interaction(interaction, self.user_id)
-        conn = get_db_connection()
-        if not conn:
-            await interaction.response.edit_message(content="데이터베이스 연결 실패!", view=None)
-            return
 
-        # 연속 출석 기준 데이터 조회
-        results = await execute_query('''
-            SELECT user_id, streak_count
-            FROM user_attendance
-            WHERE streak_count > 0
-            ORDER BY streak_count DESC
-        ''')
+        # 메모리에 정렬된 연속 출석 랭킹에서 이 서버 멤버만 상위 10명 조회
+        await interaction.client.attendance.ensure_loaded(datetime.now(KST).date())
+        ranked_results = leaderboard.streaks.top(10, leaderboard.guild_filter(interaction.guild))
 
-        if not results:
+        if not ranked_results:
             await interaction.response.edit_message(
                 content="아직 출석 기록이 없습니다!",
                 view=None
             )
             return
 
-        # 동점자 순위 처리
-        ranked_results = []
-        current_rank = 1
-        current_streak = None
-        rank_count = 0
-
-        for user_id, streak in results:
-            if streak != current_streak:
-                current_rank = rank_count + 1
-                current_streak = streak
-            rank_count += 1
-            ranked_results.append((current_rank, user_id, streak))
-            if rank_count >= 10:  # 10등까지만 표시
-                break
-
         # 메시지 구성
         message = "🏆 **연속 출석 랭킹 TOP 10**\n\n"
         message += "```\n"
@@ -315,41 +282,18 @@ class RankingView(View):
     @discord.ui.button(label="2️⃣ 보유 금액 랭킹", style=discord.ButtonStyle.primary)
     async def money_ranking(self, interaction: discord.Interaction, button: Button):
         await check_user_interaction(interaction, self.user_id)
-        conn = get_db_connection()
-        if not conn:
-            await interaction.response.edit_message(content="데이터베이스 연결 실패!", view=None)
-            return
 
-        # 보유 금액 기준 데이터 조회
-        results = await execute_query('''
-            SELECT user_id, balance
-            FROM user_balance
-            WHERE balance > 0
-            ORDER BY balance DESC
-        ''')
+        # 메모리에 정렬된 보유 금액 랭킹에서 이 서버 멤버만 상위 10명 조회
+        await leaderboard.ensure_balances_loaded()
+        ranked_results = leaderboard.balances.top(10, leaderboard.guild_filter(interaction.guild))
 
-        if not results:
+        if not ranked_results:
             await interaction.response.edit_message(
                 content="아직 보유 금액 기록이 없습니다!",
                 view=None
             )
             return
 
-        # 동점자 순위 처리
-        ranked_results = []
-        current_rank = 1
-        current_money = None
-        rank_count = 0
-
-        for user_id, money in results:
-            if money != current_money:
-                current_rank = rank_count + 1
-                current_money = money
-            rank_count += 1
-            ranked_results.append((current_rank, user_id, money))
-            if rank_count >= 10:  # 10등까지만 표시
-                break
-
         # 메시지 구성
         message = "💰 **보유 금액 랭킹 TOP 10**\n\n"
         message += "```\n"
@@ -368,26 +312,6 @@ class RankingView(View):
         await interaction.response.edit_message(content=message, view=None)
 
 
-async def is_duplicate_message_in_day(user_id: int) -> bool:
-    """오늘 이미 메시지를 보냈는지 확인합니다."""
-    today_kst = datetime.now(KST).strftime('%Y-%m-%d')
-
-    result = await execute_query("SELECT 1 FROM daily_chat_log WHERE user_id = $1 AND chat_date = $2",
-                                 (user_id, today_kst))
-    if result:  # 이미 기록이 있으면 True 반환
-        logger.info(f"사용자 {user_id}는 오늘({today_kst}) 이미 메시지를 보냈습니다.")
-        return True
-    else:
-        # 오늘 첫 메시지이므로 기록 추가 후 false 반환
-        await execute_query(
-            "INSERT INTO daily_chat_log (user_id, chat_date) VALUES ($1, $2)"
-            "ON CONFLICT (user_id, chat_date) DO nothing",
-            (user_id, today_kst)
-        )
-        logger.info(f"사용자 {user_id}의 오늘({today_kst}) 첫 메시지를 기록했습니다.")
-        return False
-
-
 async def clear_daily_log():
     await execute_query("DELETE FROM daily_chat_log;")
     logger.info(f"clear_daily_log_ KST 실행 시간: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S %Z%z')}")
@@ -403,15 +327,24 @@ class AttendanceBot(commands.Bot):
         intents.guild_messages = True
 
         # 부모 클래스 초기화
-        super().__init__(command_prefix='!', intents=intents)
+        super().__init__(command_prefix='!', intents=intents, tree_cls=TracedCommandTree)
 
         # 기본 속성 초기화
         self.attendance_channels = set()
-        self._processing_messages = set()
-        self._message_sent = set()
+        # 처리 중/처리 완료 메시지 ID와 사용자별 최근 메시지 시각은 크기와 수명을 제한해 보관
+        self._processing_messages = TTLCache(maxsize=1000, ttl=60)
+        self._message_sent = TTLCache(maxsize=10000, ttl=24 * 60 * 60)
         self._attendance_cache = {}
-        self._message_history = {}
+        self._message_history = TTLCache(maxsize=10000, ttl=60)
         self._message_lock = asyncio.Lock()
+        self.attendance = AttendancePipeline()
+        self._sync_task: Optional[asyncio.Task] = None
+        self.health: Optional[HealthServer] = None
+
+        # on_message는 메시지를 한 번만 분류하고 관심 있는 핸들러에게만 전달
+        self.router = MessageRouter(self, self.command_prefix)
+        self.router.register(MessageKind.COMMAND, self.process_commands)
+        self.router.register(MessageKind.ATTENDANCE, self.handle_attendance)
 
     @property
     def processing_messages(self):
@@ -440,8 +373,7 @@ class AttendanceBot(commands.Bot):
     def mark_message_as_processed(self, message_id: int):
         """메시지를 처리 완료로 표시합니다."""
         self.message_sent.add(message_id)
-        if message_id in self.processing_messages:
-            self.processing_messages.remove(message_id)
+        self.processing_messages.discard(message_id)
 
     def mark_message_as_processing(self, message_id: int):
         """메시지를 처리 중으로 표시합니다."""
@@ -449,134 +381,133 @@ class AttendanceBot(commands.Bot):
 
     def clear_processing_message(self, message_id: int):
         """메시지의 처리 중 상태를 제거합니다."""
-        if message_id in self.processing_messages:
-            self.processing_messages.remove(message_id)
+        self.processing_messages.discard(message_id)
 
     def update_message_history(self, user_id: int, today: str):
         """메시지 히스토리를 업데이트합니다."""
         cache_key = f"{user_id}_{today}"
-        self.message_history[cache_key] = datetime.now(KST)
+        self.message_history.set(cache_key, datetime.now(KST))
 
     def is_duplicate_message(self, user_id: int, today: str) -> bool:
         """5초 이내의 중복 메시지인지 확인합니다."""
         cache_key = f"{user_id}_{today}"
-        if cache_key in self.message_history:
-            last_message_time = self.message_history[cache_key]
+        last_message_time = self.message_history.get(cache_key)
+        if last_message_time is not None:
             current_time = datetime.now(KST)
             time_diff = (current_time - last_message_time).total_seconds()
             return time_diff < 5
         return False
 
     async def setup_hook(self):
+        # 이벤트 루프 지연 측정과 루프를 막는 호출 탐지 (LOOP_MONITOR_INTERVAL_MS=0이면 끔)
+        loop_monitor.start()
+
+        # 상태 확인 서버와 자체 핑 작업을 같은 이벤트 루프에서 시작
+        # 서버를 띄우지 못해도 봇 자체는 계속 시작
+        self.health = HealthServer(self)
+        try:
+            await self.health.start()
+        except Exception as e:
+            logger.error(f"상태 확인 서버 시작 오류: {e}")
+
         # 데이터베이스 연결 풀 생성
         await get_db_pool()
 
-        # sql/ 디렉토리의 모든 .sql 파일을 읽어 테이블 생성
-        sql_dir = 'sql'
-        if os.path.isdir(sql_dir):
-            for filename in sorted(os.listdir(sql_dir)):
-                if filename.endswith('.sql'):
-                    filepath = os.path.join(sql_dir, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            sql_script = f.read()
-                            # 주석 등을 제외하고 실제 쿼리가 있는지 확인
-                            if sql_script.strip():
-                                await execute_query(sql_script)
-                                print(f"✅ SQL 스크립트 '{filename}' 실행 완료.")
-                    except Exception as e:
-                        print(f"❌ SQL 스크립트 '{filename}' 실행 중 오류 발생: {e}")
-
-        # Cogs 로드
-        for filename in os.listdir('./cogs'):
-            if filename.endswith('.py'):
-                try:
-                    print(f"로드 중: {filename}", flush=True)
-                    await self.load_extension(f'cogs.{filename[:-3]}')
-                    print(f"로드 완료: {filename}", flush=True)
-                except Exception as e:
-                    logger.error(f"Cog 로드 오류 ({filename}): {e}")
-
-        # 명령어 동기화
-        print("명령어 동기화 중...", flush=True)
+        # 새로 추가되었거나 바뀐 sql/ 스크립트만 적용 (MIGRATIONS_DRY_RUN=1이면 목록만 기록)
+        try:
+            await migrations.migrate(dry_run=os.getenv("MIGRATIONS_DRY_RUN") == "1")
+        except Exception as e:
+            logger.error(f"마이그레이션 확인 중 오류 발생: {e}")
+
+        # 출석 상태 복원 및 백그라운드 저장 시작
+        try:
+            await self.attendance.load(datetime.now(KST).date())
+        except Exception as e:
+            logger.error(f"출석 상태 복원 오류: {e}")
+        self.attendance.start()
+
+        # 송금 자동완성용 계좌 인덱스와 잔액 랭킹 미리 로드
+        try:
+            await accounts.ensure_loaded()
+            await leaderboard.ensure_balances_loaded()
+        except Exception as e:
+            logger.error(f"계좌 인덱스/랭킹 로드 오류: {e}")
+
+        # Cogs 로드 (외부 라이브러리는 스레드에서 동시에 미리 import, Cog 자체는 순서대로 로드)
+        await startup.load_cogs(self)
+
+        # 명령어 트리가 바뀐 경우에만 동기화하며, 로그인을 막지 않도록 백그라운드에서 진행
+        self._sync_task = asyncio.create_task(self._sync_commands())
+
+        logger.info("=== 봇 초기화 완료 ===")
+
+    async def _sync_commands(self):
         try:
-            await self.tree.sync()
-            print("명령어 동기화 완료", flush=True)
+            await startup.sync_tree_if_changed(self, force=os.getenv("FORCE_COMMAND_SYNC") == "1")
         except Exception as e:
             logger.error(f"명령어 동기화 오류: {e}")
 
-        print("=== 봇 초기화 완료 ===\n", flush=True)
+    async def close(self):
+        # 종료 전에 아직 저장되지 않은 출석 기록을 저장
+        await self.attendance.close()
+        if self.health is not None:
+            await self.health.close()
+        loop_monitor.stop()
+        await super().close()
 
     async def on_ready(self):
-        print("\n" + "=" * 50, flush=True)
-        print("봇이 준비되었습니다!", flush=True)
-        print(f"봇 이름: {self.user}", flush=True)
-        print(f"봇 ID: {self.user.id}", flush=True)
-        print(f"서버 수: {len(self.guilds)}", flush=True)
-        print(f"캐시된 메시지 수: {len(self.message_sent)}", flush=True)
-        print(f"처리 중인 메시지 수: {len(self.processing_messages)}", flush=True)
+        logger.info("봇이 준비되었습니다!")
+        logger.info(f"봇 이름: {self.user}")
+        logger.info(f"봇 ID: {self.user.id}")
+        logger.info(f"서버 수: {len(self.guilds)}")
+        logger.info(f"캐시된 메시지 수: {len(self.message_sent)}")
+        logger.info(f"처리 중인 메시지 수: {len(self.processing_messages)}")
 
         # 봇이 준비되면 출석 채널 다시 로드
         await self.load_attendance_channels()
 
+        # 시작 시 미뤄둔 무거운 SDK를 잠시 후 백그라운드에서 미리 불러옴 (LAZY_WARMUP_DELAY < 0이면 끔)
+        lazy.start_warm_up(float(os.getenv("LAZY_WARMUP_DELAY", "60")))
+
         scheduler = AsyncIOScheduler(timezone='Asia/Seoul')
         # 매일 새벽 0시에 데이터베이스 채팅 기록 지우기
         scheduler.add_job(clear_daily_log, CronTrigger(hour=0, timezone=KST))
         scheduler.start()
 
-        print("=" * 50 + "\n", flush=True)
-
     async def load_attendance_channels(self):
         """출석 채널 목록을 로드합니다."""
         try:
-            result = await execute_query('SELECT channel_id FROM attendance_channels')
+            result = await fetch('SELECT channel_id FROM attendance_channels')
             self.attendance_channels = {row['channel_id'] for row in result}
         except Exception as e:
             logger.error(f"출석 채널 로드 오류: {e}")
             self.attendance_channels = set()
 
     async def on_message(self, message):
-        logger.info(f"{message.author.name}의 메시지 이벤트 발생", extra={
-            'message_id': message.id,
-            'author_name': message.author.name,
-            'message_content': message.content,
-        })
-
-        # DM 채널인 경우 명령어만 처리하고 종료
-        if isinstance(message.channel, discord.DMChannel):
-            print("DM 채널 메시지 - 명령어만 처리", flush=True)
-            await self.process_commands(message)
-            return
-
-        # 채널 정보 출력 (DM이 아닌 경우에만)
-        try:
-            print(f"채널: {message.channel.name}", flush=True)
-            print(f"채널 ID: {message.channel.id}", flush=True)
-            print(f"등록된 출석 채널: {self.attendance_channels}", flush=True)
-        except AttributeError:
-            logger.error("채널 정보를 가져올 수 없습니다.")
+        # 모든 메시지마다 발생하는 이벤트이므로 DEBUG 레벨에서 일부만 기록 (메시지 내용은 남기지 않음)
+        logger.debug("%s의 메시지 이벤트 발생", message.author.name,
+                     extra=sampled(0.01, message_id=message.id, channel_id=message.channel.id))
 
-        print("=" * 50 + "\n", flush=True)
+        await self.router.dispatch(message)
 
-        # 봇 메시지 무시
-        if message.author == self.user or message.author.bot:
-            print("봇 메시지 무시", flush=True)
-            return
+    async def invoke(self, ctx):
+        # 접두사 명령어도 명령어 이름의 트랜잭션으로 추적
+        name = ctx.command.qualified_name if ctx.command else "unknown"
+        with command_transaction(name, "discord.prefix_command"):
+            await super().invoke(ctx)
 
-        # 명령어 처리 시도
-        await self.process_commands(message)
-
-        # 출석 채널이 아닌 경우 무시
-        if message.channel.id not in self.attendance_channels:
-            print("출석 채널이 아님. 무시", flush=True)
-            return
+    async def handle_attendance(self, message):
+        """출석 채널 메시지를 출석으로 처리합니다."""
+        with command_transaction("출석", "discord.message"):
+            await self._check_in(message)
 
+    async def _check_in(self, message):
         # 이미 처리된 메시지인지 확인
         if self.is_message_processed(message.id):
-            print("이미 처리된 메시지. 무시", flush=True)
+            logger.debug(f"이미 처리된 메시지. 무시: {message.id}")
             return
 
-        print("출석 처리 중...")
+        logger.debug(f"출석 처리 중: {message.author.name}")
 
         try:
             # 메시지를 처리 중으로 표시
@@ -586,80 +517,32 @@ class AttendanceBot(commands.Bot):
             today = datetime.now(KST).strftime('%Y-%m-%d')
             today_date = datetime.strptime(today, "%Y-%m-%d").date()
 
-            # 중복 출석 체크
-            if await is_duplicate_message_in_day(user_id):
+            # 중복 체크와 출석 순서는 메모리에서 바로 판정하고, DB 기록은 백그라운드에서 저장
+            await self.attendance.ensure_loaded(today_date)
+            result = self.attendance.check_in(user_id, today_date)
+
+            if result is None:
                 logger.info(f"중복 출석 감지: {message.author.name}")
                 await message.channel.send(f"❌ {message.author.mention}님은 이미 오늘 출석하셨습니다!", delete_after=3)
                 self.mark_message_as_processed(message.id)
                 return
 
-            # 출석 처리
-            result = await execute_query(
-                '''
-                INSERT INTO user_attendance (user_id, attendance_count, last_attendance, streak_count)
-                VALUES ($1, 1, $2, 1)
-                ON CONFLICT (user_id) DO UPDATE
-                SET 
-                    attendance_count = user_attendance.attendance_count + 1,
-                    last_attendance = $2,
-                    streak_count = CASE 
-                        WHEN DATE(user_attendance.last_attendance) = DATE($2 - INTERVAL '1 day')
-                        THEN user_attendance.streak_count + 1
-                        WHEN DATE(user_attendance.last_attendance) = DATE($2)
-                        THEN user_attendance.streak_count
-                        ELSE 1
-                    END
-                RETURNING attendance_count, streak_count
-                ''',
-                (user_id, today_date)
+            await message.channel.send(
+                f"🎉 {message.author.mention}님 출석하셨습니다!\n"
+                f"오늘 {result.order}번째 출석이에요.\n"
+                f"현재 총 출석 횟수: {result.attendance_count}회,\n"
+                f"연속 출석: {result.streak_count}일\n"
+                f"💰 보상: {result.reward}원"
             )
 
-            if result:
-                attendance_count = result[0]['attendance_count']
-                streak_count = result[0]['streak_count']
-
-                # 보상 지급
-                reward = 100 + (streak_count * 10)
-                await update_balance(user_id, reward)
-
-                # 출석 순서 확인
-                result = await execute_query('''
-                    SELECT COUNT(*) AS count 
-                    FROM user_attendance
-                    WHERE DATE(last_attendance) = DATE($1) 
-                    AND user_id != $2
-                ''', (today_date, user_id))
-
-                attendance_order = result[0]["count"] + 1
-
-                await message.channel.send(
-                    f"🎉 {message.author.mention}님 출석하셨습니다!\n"
-                    f"오늘 {attendance_order}번째 출석이에요.\n"
-                    f"현재 총 출석 횟수: {attendance_count}회,\n"
-                    f"연속 출석: {streak_count}일\n"
-                    f"💰 보상: {reward}원"
-                )
-
-                self.mark_message_as_processed(message.id)
-            else:
-                logger.info("출석 처리 실패")
+            self.mark_message_as_processed(message.id)
         except Exception as e:
             logger.error(f"출석 처리 오류: {e}")
             self.clear_processing_message(message.id)
 
 
-def keep_alive():
-    """15분마다 자체 서버에 핑을 보내 슬립모드 방지"""
-    while True:
-        try:
-            # Render에서 제공하는 URL 환경변수 사용
-            url = os.getenv('RENDER_EXTERNAL_URL', 'http://localhost:8080')
-            response = requests.get(url)
-            logger.info(f"서버 핑 전송 완료: {response.status_code}")
-        except Exception as e:
-            logger.error(f"서버 핑 전송 실패: {e}")
-        time.sleep(840)  # 14분(840초)마다 실행 (15분보다 약간 짧게 설정)
-
+setup_logging()
+logger = logging.getLogger(__name__)
 
 bot = AttendanceBot()
 
@@ -673,31 +556,20 @@ if SENTRY_DSN:
     sentry_sdk.init(
         dsn=SENTRY_DSN,
         integrations=[sentry_logging],
-        traces_sample_rate=1.0  # 성능 트레이싱 필요시
+        traces_sampler=traces_sampler  # 명령어별 샘플링 비율 (SENTRY_TRACES_SAMPLE_RATE, SENTRY_COMMAND_SAMPLE_RATES)
     )
-    print("Sentry 초기화 됨")
+    logger.info("Sentry 초기화 됨")
 else:
-    print("SENTRY_DSN 환경 변수가 설정되지 않았습니다!")
-
-logger = logging.getLogger(__name__)
+    logger.warning("SENTRY_DSN 환경 변수가 설정되지 않았습니다!")
 
 # 봇 실행 부분 수정
 if __name__ == "__main__":
-    print("\n=== 봇 시작 ===", flush=True)
-    # Flask 서버를 별도 스레드에서 실행
-    server_thread = threading.Thread(target=run_flask)
-    server_thread.start()
-    print("Flask 서버 스레드 시작됨", flush=True)
-
-    # 핑 전송을 위한 새로운 스레드 시작
-    ping_thread = threading.Thread(target=keep_alive, daemon=True)
-    ping_thread.start()
-    print("핑 전송 스레드 시작됨", flush=True)
-
+    logger.info("=== 봇 시작 ===")
     # 봇 토큰 설정 및 실행
     TOKEN = os.getenv('DISCORD_TOKEN')
     if not TOKEN:
         raise ValueError("DISCORD_TOKEN 환경 변수가 설정되지 않았습니다!")
 
     logger.info("봇 실행 시작...")
-    bot.run(TOKEN)
+    # 로그 출력은 setup_logging의 큐 핸들러가 담당하므로 discord.py 기본 핸들러는 설치하지 않음
+    bot.run(TOKEN, log_handler=None)
@@ -0,0 +1,90 @@
+import enum
+import logging
+from typing import Awaitable, Callable, Dict, List
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[discord.Message], Awaitable[None]]
+
+
+class MessageKind(enum.Flag):
+    """메시지 분류. 한 메시지가 여러 분류에 속할 수 있습니다 (예: 출석 채널의 명령어)."""
+    NONE = 0
+    DM = enum.auto()
+    BOT = enum.auto()
+    COMMAND = enum.auto()
+    ATTENDANCE = enum.auto()
+    OTHER = enum.auto()
+
+
+# 핸들러 호출 순서 (명령어 처리 후 출석 처리)
+_DISPATCH_ORDER = (MessageKind.DM, MessageKind.BOT, MessageKind.COMMAND, MessageKind.ATTENDANCE, MessageKind.OTHER)
+
+
+class MessageRouter:
+    """on_message에서 메시지를 한 번만 분류하고, 해당 분류에 관심을 등록한 핸들러에게만 전달합니다.
+
+    아무도 관심이 없는 메시지(일반 채널 잡담 등)는 분류 직후 바로 버려집니다.
+    """
+
+    def __init__(self, bot: discord.Client, prefix):
+        self.bot = bot
+        self.prefixes = (prefix,) if isinstance(prefix, str) else tuple(prefix)
+        self._handlers: Dict[MessageKind, List[Handler]] = {kind: [] for kind in _DISPATCH_ORDER}
+        self._interest = MessageKind.NONE
+
+    def register(self, kinds: MessageKind, handler: Handler):
+        """kinds에 속하는 메시지를 handler로 받습니다."""
+        for kind in _DISPATCH_ORDER:
+            if kind in kinds and handler not in self._handlers[kind]:
+                self._handlers[kind].append(handler)
+        self._update_interest()
+
+    def unregister(self, kinds: MessageKind, handler: Handler):
+        for kind in _DISPATCH_ORDER:
+            if kind in kinds and handler in self._handlers[kind]:
+                self._handlers[kind].remove(handler)
+        self._update_interest()
+
+    def _update_interest(self):
+        interest = MessageKind.NONE
+        for kind, handlers in self._handlers.items():
+            if handlers:
+                interest |= kind
+        self._interest = interest
+
+    def classify(self, message: discord.Message) -> MessageKind:
+        if message.author.bot:
+            return MessageKind.BOT
+
+        kind = MessageKind.NONE
+        if message.guild is None:
+            kind |= MessageKind.DM
+        elif message.channel.id in self.bot.attendance_channels:
+            kind |= MessageKind.ATTENDANCE
+
+        if message.content.startswith(self.prefixes):
+            kind |= MessageKind.COMMAND
+
+        return kind or MessageKind.OTHER
+
+    async def dispatch(self, message: discord.Message):
+        kind = self.classify(message)
+        if not kind & self._interest:
+            return
+
+        called = set()
+        for target in _DISPATCH_ORDER:
+            if target not in kind:
+                continue
+            for handler in self._handlers[target]:
+                # 여러 분류에 등록된 핸들러는 한 번만 호출
+                if handler in called:
+                    continue
+                called.add(handler)
+                try:
+                    await handler(message)
+                except Exception:
+                    logger.exception(f"메시지 핸들러 오류 ({target.name}): {handler!r}")
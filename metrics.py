@@ -0,0 +1,184 @@
+"""Prometheus 텍스트 형식으로 내보내는 간단한 메트릭 레지스트리입니다.
+
+Counter / Gauge / Histogram을 제공하며, 봇에서 쓰는 메트릭은 모두 이 파일 하단에 모아 정의합니다.
+값은 이벤트 루프 스레드에서만 갱신한다고 가정하므로 별도의 잠금은 두지 않습니다.
+"""
+import math
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+
+# 지연 시간(초)용 기본 버킷
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: Dict[str, "_Metric"] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry[name] = self
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블은 {self.labelnames} 이어야 합니다 (받은 값: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Union[float, Dict[LabelValues, float], None]]] = None
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], Union[float, Dict[LabelValues, float], None]]):
+        """수집할 때마다 function()의 결과를 값으로 사용합니다.
+        레이블이 있으면 {레이블 값 튜플: 값} 딕셔너리를, 값이 없으면 None을 반환합니다."""
+        self._function = function
+
+    def samples(self) -> List[str]:
+        values = self._values
+        if self._function is not None:
+            result = self._function()
+            if result is None:
+                values = {}
+            elif isinstance(result, dict):
+                values = result
+            else:
+                values = {(): result}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # 레이블 값 -> [버킷별 개수..., 합계, 전체 개수]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[index] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간(초)을 기록합니다. 예외가 나도 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, state in self._values.items():
+            cumulative = 0
+            for index, bound in enumerate(self.buckets):
+                cumulative += state[index]
+                le = ('le', _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+def render() -> str:
+    """등록된 모든 메트릭을 Prometheus 텍스트 형식으로 만듭니다."""
+    return '\n'.join(metric.render() for metric in _registry.values()) + '\n'
+
+
+# --- 봇 메트릭 정의 ---
+
+COMMANDS_TOTAL = Counter('bot_commands_total', '실행된 명령어 수', ['command', 'type', 'status'])
+COMMAND_SECONDS = Histogram('bot_command_duration_seconds', '명령어 처리 시간', ['command', 'type'])
+
+DB_QUERY_SECONDS = Histogram('bot_db_query_duration_seconds', 'DB 쿼리 지연 시간 (등록된 쿼리는 이름별, 나머지는 raw)',
+                             ['statement'])
+DB_POOL_CONNECTIONS = Gauge('bot_db_pool_connections', 'DB 연결 풀 커넥션 수', ['state'])
+
+DCCON_DOWNLOAD_BYTES = Counter('bot_dccon_download_bytes_total', '디시콘 이미지 다운로드 바이트 수')
+DCCON_DOWNLOAD_SECONDS = Histogram('bot_dccon_download_duration_seconds', '디시콘 이미지 다운로드 시간', ['result'])
+
+EXTERNAL_API_SECONDS = Histogram('bot_external_api_duration_seconds', '외부 API 호출 시간 (gemini, tts)',
+                                 ['api'], buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0))
+
+EVENT_LOOP_LAG = Histogram('bot_event_loop_lag_seconds', '이벤트 루프 지연 시간',
+                           buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+EVENT_LOOP_LAG_LAST = Gauge('bot_event_loop_lag_last_seconds', '마지막으로 측정한 이벤트 루프 지연 시간')
+EVENT_LOOP_BLOCKS = Counter('bot_event_loop_blocks_total', '기준 시간 이상 이벤트 루프가 막힌 횟수')
+
+GATEWAY_LATENCY = Gauge('bot_gateway_latency_seconds', 'Discord 게이트웨이 하트비트 지연 시간')
+GUILDS = Gauge('bot_guilds', '참여 중인 서버 수')
+ATTENDANCE_PENDING = Gauge('bot_attendance_pending_writes', '아직 DB에 저장되지 않은 출석 기록 수')
+MESSAGES_PROCESSING = Gauge('bot_messages_processing', '처리 중인 출석 메시지 수')
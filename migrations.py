@@ -0,0 +1,157 @@
+"""sql/ 스크립트를 버전 관리하며 적용하는 마이그레이션 실행기입니다.
+
+적용한 스크립트는 schema_migrations 테이블에 파일 체크섬과 함께 기록하고,
+새로 추가되었거나 내용이 바뀐 스크립트만 스크립트마다 하나의 트랜잭션으로 실행합니다.
+변경이 없는 재시작에서는 schema_migrations 조회 외에 아무 SQL도 실행하지 않습니다.
+
+실행 순서:
+1. sql/*.sql (테이블 생성 등 스키마 스크립트, 파일 이름 순)
+2. sql/updates/<data_type>_v<version>.sql (데이터 타입별 버전 순, 적용 후 game_data_versions 갱신)
+"""
+import hashlib
+import logging
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+from database_manager import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+SQL_DIR = 'sql'
+UPDATES_DIR = os.path.join(SQL_DIR, 'updates')
+
+_CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        name TEXT PRIMARY KEY,
+        checksum TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+"""
+
+_RECORD_MIGRATION = """
+    INSERT INTO schema_migrations (name, checksum) VALUES ($1, $2)
+    ON CONFLICT (name) DO UPDATE SET checksum = EXCLUDED.checksum, applied_at = NOW()
+"""
+
+
+class Migration(NamedTuple):
+    name: str
+    path: str
+    checksum: str
+    # sql/updates 스크립트인 경우 game_data_versions의 (data_type, version)
+    data_type: Optional[str] = None
+    version: Optional[int] = None
+
+
+class PendingMigration(NamedTuple):
+    migration: Migration
+    # 'new' 또는 'changed'
+    reason: str
+
+
+def _checksum(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def discover(sql_dir: str = SQL_DIR, updates_dir: str = UPDATES_DIR) -> List[Migration]:
+    """적용 순서대로 마이그레이션 목록을 만듭니다."""
+    migrations = []
+    if os.path.isdir(sql_dir):
+        for filename in sorted(os.listdir(sql_dir)):
+            path = os.path.join(sql_dir, filename)
+            if filename.endswith('.sql') and os.path.isfile(path):
+                migrations.append(Migration(filename, path, _checksum(path)))
+
+    updates = []
+    if os.path.isdir(updates_dir):
+        for filename in os.listdir(updates_dir):
+            if not filename.endswith('.sql'):
+                continue
+            parts = filename[:-4].split('_v')
+            if len(parts) != 2 or not parts[1].isdigit():
+                continue  # 버전이 숫자가 아닌 파일은 무시
+            path = os.path.join(updates_dir, filename)
+            name = f"updates/{filename}"
+            updates.append(Migration(name, path, _checksum(path), parts[0], int(parts[1])))
+    migrations.extend(sorted(updates, key=lambda m: (m.data_type, m.version)))
+    return migrations
+
+
+async def _applied_checksums(create_table: bool = True) -> Dict[str, str]:
+    async with connection() as db:
+        if await db.fetchval("SELECT to_regclass('schema_migrations')") is None:
+            if create_table:
+                await db.execute(_CREATE_MIGRATIONS_TABLE)
+            return {}
+        rows = await db.fetch('SELECT name, checksum FROM schema_migrations')
+    return {row['name']: row['checksum'] for row in rows}
+
+
+async def pending(migrations: Optional[List[Migration]] = None, create_table: bool = True) -> List[PendingMigration]:
+    """아직 적용되지 않았거나 체크섬이 바뀐 마이그레이션을 반환합니다."""
+    if migrations is None:
+        migrations = discover()
+    applied = await _applied_checksums(create_table)
+    result = []
+    for migration in migrations:
+        checksum = applied.get(migration.name)
+        if checksum is None:
+            result.append(PendingMigration(migration, 'new'))
+        elif checksum != migration.checksum:
+            result.append(PendingMigration(migration, 'changed'))
+    return result
+
+
+async def _already_versioned(migration: Migration) -> bool:
+    """schema_migrations 도입 전에 game_data_versions 기준으로 이미 적용된 업데이트인지 확인합니다."""
+    async with connection() as db:
+        version = await db.fetchval(
+            'SELECT version FROM game_data_versions WHERE data_type = $1', migration.data_type
+        )
+    return version is not None and version >= migration.version
+
+
+async def apply(item: PendingMigration):
+    """마이그레이션 하나를 하나의 트랜잭션으로 적용하고 체크섬을 기록합니다."""
+    migration = item.migration
+
+    if item.reason == 'new' and migration.data_type is not None and await _already_versioned(migration):
+        # 기존 방식으로 이미 적용된 스크립트는 실행하지 않고 기록만 남김
+        async with connection() as db:
+            await db.execute(_RECORD_MIGRATION, migration.name, migration.checksum)
+        logger.info(f"마이그레이션 기록만 추가 (이미 적용됨): {migration.name}")
+        return
+
+    with open(migration.path, 'r', encoding='utf-8') as f:
+        sql_script = f.read()
+
+    async with transaction() as db:
+        if sql_script.strip():
+            await db.execute(sql_script)
+        if migration.data_type is not None:
+            await db.execute(
+                'UPDATE game_data_versions SET version = $1 WHERE data_type = $2',
+                migration.version, migration.data_type
+            )
+        await db.execute(_RECORD_MIGRATION, migration.name, migration.checksum)
+    logger.info(f"✅ 마이그레이션 적용 ({item.reason}): {migration.name}")
+
+
+async def migrate(dry_run: bool = False) -> List[PendingMigration]:
+    """적용이 필요한 마이그레이션을 순서대로 적용합니다.
+    dry_run이면 실행하지 않고 적용할 목록만 반환합니다. 실패한 스크립트는 다음 시작 때 다시 시도합니다."""
+    items = await pending(create_table=not dry_run)
+    if not items:
+        logger.info("적용할 마이그레이션 없음")
+        return []
+
+    for item in items:
+        if dry_run:
+            logger.info(f"[dry-run] 적용 예정 ({item.reason}): {item.migration.name}")
+            continue
+        try:
+            await apply(item)
+        except Exception as e:
+            logger.error(f"❌ 마이그레이션 '{item.migration.name}' 적용 중 오류 발생: {e}")
+    return items
@@ -0,0 +1,14 @@
+-- 날짜별 출석 인원을 저장하는 테이블
+-- "오늘 N번째 출석" 순서를 user_attendance 전체를 세지 않고 바로 얻기 위해 사용합니다.
+-- 출석 upsert와 같은 문장에서 원자적으로 1씩 증가합니다.
+CREATE TABLE IF NOT EXISTS daily_attendance_stats (
+    stat_date DATE PRIMARY KEY,
+    attendance_count INT NOT NULL DEFAULT 0
+);
+
+-- 테이블 도입 당일의 기존 출석 인원으로 초기값을 채웁니다. (이미 있으면 유지)
+INSERT INTO daily_attendance_stats (stat_date, attendance_count)
+SELECT (NOW() AT TIME ZONE 'Asia/Seoul')::date, COUNT(*)
+FROM user_attendance
+WHERE DATE(last_attendance) = (NOW() AT TIME ZONE 'Asia/Seoul')::date
+ON CONFLICT (stat_date) DO NOTHING;
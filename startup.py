@@ -0,0 +1,150 @@
+"""봇 시작 과정(Cog 로드, 명령어 동기화)을 담당하는 모듈입니다.
+
+- Cog가 쓰는 외부 라이브러리를 워커 스레드에서 동시에 미리 import 해 두고,
+  Cog 모듈 실행과 setup은 그 뒤에 한 개씩 순서대로 진행합니다. Cog별 소요 시간을 기록합니다.
+- 명령어 트리의 해시를 파일에 저장해 두고, 바뀐 경우에만 tree.sync()를 호출합니다.
+"""
+import ast
+import asyncio
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, NamedTuple, Set
+
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+COGS_DIR = 'cogs'
+COMMAND_TREE_HASH_FILE = os.getenv('COMMAND_TREE_HASH_FILE', '.command_tree_hash')
+
+# 프로젝트 루트에 있는 모듈/패키지는 미리 불러오지 않음 (main 등은 Cog 로드 때 함께 실행됨)
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class CogTiming(NamedTuple):
+    name: str
+    # 외부 라이브러리 import에 걸린 시간
+    import_ms: float
+    # 모듈 실행 + setup()에 걸린 시간
+    setup_ms: float
+    ok: bool
+
+
+def _is_local(module: str) -> bool:
+    top = module.split('.')[0]
+    return (
+        os.path.exists(os.path.join(_PROJECT_ROOT, f"{top}.py"))
+        or os.path.isdir(os.path.join(_PROJECT_ROOT, top))
+    )
+
+
+def external_imports(path: str) -> List[str]:
+    """Cog 파일 최상단에서 import 하는 외부 모듈 이름을 찾습니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    modules: Set[str] = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.add(node.module)
+    return sorted(module for module in modules if not _is_local(module))
+
+
+def _import_all(modules: List[str]) -> float:
+    start = time.perf_counter()
+    for module in modules:
+        if module in sys.modules:
+            continue
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            # 실제 오류는 Cog 로드 때 다시 드러나므로 여기서는 기록만 함
+            logger.debug(f"미리 import 실패 ({module}): {e}")
+    return (time.perf_counter() - start) * 1000
+
+
+async def load_cogs(bot: commands.Bot, directory: str = COGS_DIR) -> List[CogTiming]:
+    """directory의 모든 Cog를 로드하고 Cog별 소요 시간을 반환합니다."""
+    names = sorted(filename[:-3] for filename in os.listdir(directory) if filename.endswith('.py'))
+    started = time.perf_counter()
+
+    # 1. Cog들이 쓰는 외부 라이브러리를 Cog마다 별도 스레드에서 동시에 import
+    import_ms: Dict[str, float] = {}
+
+    async def warm(name: str):
+        try:
+            modules = external_imports(os.path.join(directory, f"{name}.py"))
+        except SyntaxError:
+            modules = []
+        import_ms[name] = await asyncio.to_thread(_import_all, modules)
+
+    await asyncio.gather(*(warm(name) for name in names))
+
+    # 2. Cog 모듈 실행과 setup()은 이름 순서대로 하나씩 진행
+    #    (cog_load에서 await 하는 Cog가 있어 동시에 돌리면 등록 순서가 섞이고,
+    #     main의 라우터/DB에 기대는 Cog끼리도 순서가 보장되지 않음)
+    async def load(name: str) -> CogTiming:
+        start = time.perf_counter()
+        try:
+            await bot.load_extension(f"{directory}.{name}")
+            ok = True
+        except Exception as e:
+            logger.error(f"Cog 로드 오류 ({name}.py): {e}")
+            ok = False
+        return CogTiming(name, import_ms.get(name, 0.0), (time.perf_counter() - start) * 1000, ok)
+
+    timings = [await load(name) for name in names]
+
+    for timing in sorted(timings, key=lambda t: t.import_ms + t.setup_ms, reverse=True):
+        logger.info(
+            f"{'로드 완료' if timing.ok else '로드 실패'}: {timing.name}.py "
+            f"(import {timing.import_ms:.0f}ms, setup {timing.setup_ms:.0f}ms)"
+        )
+    logger.info(f"Cog {len(timings)}개 로드: {(time.perf_counter() - started) * 1000:.0f}ms")
+    return timings
+
+
+def command_tree_hash(bot: commands.Bot) -> str:
+    """전역 명령어 트리의 Discord 등록 내용을 해시합니다."""
+    payload = [command.to_dict(bot.tree) for command in bot.tree.get_commands()]
+    payload.sort(key=lambda command: (command.get('type', 1), command['name']))
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _read_hash() -> str:
+    try:
+        with open(COMMAND_TREE_HASH_FILE, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def _write_hash(value: str):
+    try:
+        with open(COMMAND_TREE_HASH_FILE, 'w', encoding='utf-8') as f:
+            f.write(value)
+    except OSError as e:
+        logger.warning(f"명령어 트리 해시 저장 실패: {e}")
+
+
+async def sync_tree_if_changed(bot: commands.Bot, force: bool = False) -> bool:
+    """명령어 트리가 마지막 동기화 이후 바뀌었을 때만 tree.sync()를 호출합니다."""
+    current = command_tree_hash(bot)
+    if not force and current == _read_hash():
+        logger.info("명령어 변경 없음. 동기화 생략")
+        return False
+
+    logger.info("명령어 동기화 중...")
+    start = time.perf_counter()
+    await bot.tree.sync()
+    _write_hash(current)
+    logger.info(f"명령어 동기화 완료 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+    return True
@@ -0,0 +1,88 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import discord
+import sentry_sdk
+from discord import app_commands
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_rates(raw: str) -> Dict[str, float]:
+    """'가챠=0.5,디비조회=1.0' 형식의 명령어별 샘플링 비율을 읽습니다."""
+    rates = {}
+    for item in raw.split(','):
+        name, _, rate = item.strip().partition('=')
+        if not name or not rate:
+            continue
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            logger.warning(f"잘못된 샘플링 비율 무시: {item}")
+    return rates
+
+
+# 기본 트레이스 샘플링 비율과 명령어별 재정의
+DEFAULT_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.05"))
+COMMAND_SAMPLE_RATES = _parse_rates(os.getenv("SENTRY_COMMAND_SAMPLE_RATES", ""))
+
+
+def traces_sampler(sampling_context: dict) -> float:
+    """sentry_sdk.init(traces_sampler=...)에 넘기는 샘플러. 명령어 이름별로 비율을 정합니다."""
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)
+    name = (sampling_context.get("transaction_context") or {}).get("name")
+    return COMMAND_SAMPLE_RATES.get(name, DEFAULT_TRACES_SAMPLE_RATE)
+
+
+@contextmanager
+def command_transaction(name: str, op: str):
+    """명령어 한 번의 실행을 트랜잭션으로 감쌉니다. 작업마다 스코프를 분리합니다.
+    실행 횟수와 처리 시간은 메트릭으로도 기록합니다."""
+    kind = op.rpartition('.')[2]
+    status = 'error'
+    start = time.perf_counter()
+    with sentry_sdk.isolation_scope():
+        with sentry_sdk.start_transaction(op=op, name=name, source="component") as transaction:
+            try:
+                yield transaction
+                status = 'ok'
+            finally:
+                metrics.COMMANDS_TOTAL.inc(command=name, type=kind, status=status)
+                metrics.COMMAND_SECONDS.observe(time.perf_counter() - start, command=name, type=kind)
+
+
+@contextmanager
+def span(op: str, name: str, **data):
+    """진행 중인 트랜잭션이 있을 때만 하위 span을 만듭니다."""
+    if sentry_sdk.get_current_span() is None:
+        yield None
+        return
+    with sentry_sdk.start_span(op=op, name=name) as current:
+        for key, value in data.items():
+            current.set_data(key, value)
+        yield current
+
+
+def _interaction_name(interaction: discord.Interaction) -> Optional[str]:
+    data = interaction.data or {}
+    return data.get("name")
+
+
+class TracedCommandTree(app_commands.CommandTree):
+    """슬래시 명령어와 자동완성 호출을 명령어 이름의 트랜잭션으로 감싸는 CommandTree."""
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        # CommandTree가 명령어를 찾아 실행하는 단일 진입점
+        if interaction.type is discord.InteractionType.autocomplete:
+            op = "discord.autocomplete"
+        else:
+            op = "discord.app_command"
+        with command_transaction(_interaction_name(interaction) or "unknown", op):
+            await super()._call(interaction)
@@ -0,0 +1,197 @@
+"""크기 상한과 만료 시간을 가진 캐시입니다.
+
+메시지 ID, 사용자별 상태처럼 계속 쌓이기만 하는 값을 보관할 때 사용합니다.
+모든 연산은 O(1)이며, 적중/실패/제거 횟수를 기록합니다.
+외부 요청 결과처럼 비동기로 불러오는 값은 LoadingCache를 사용합니다.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        """maxsize개를 넘으면 가장 오래된 항목부터 버리고, 저장 후 ttl초가 지난 항목은 만료시킵니다."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (만료 시각, 값). 저장 순서 = 만료 순서이므로 맨 앞이 항상 가장 먼저 만료됩니다.
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """값을 조회합니다. 없거나 만료되었으면 default를 반환합니다."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any = True):
+        """값을 저장합니다. 이미 있으면 만료 시각을 새로 고칩니다."""
+        now = time.monotonic()
+        self._data.pop(key, None)
+        self._data[key] = (now + self.ttl, value)
+        self._purge(now)
+
+    def add(self, key: Hashable):
+        """집합처럼 사용할 때 키만 저장합니다."""
+        self.set(key, True)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """값을 꺼내고 캐시에서 제거합니다."""
+        entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+
+    def discard(self, key: Hashable):
+        """키가 있으면 제거합니다."""
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """현재 크기와 적중/실패/제거/만료 횟수를 반환합니다."""
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def _purge(self, now: float):
+        # 앞에서부터 만료된 항목을 지우고, 그래도 넘치면 가장 오래된 항목을 버림
+        while self._data:
+            key, (expires_at, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[key]
+            self.expirations += 1
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LoadingCache:
+    """비동기 로더 결과를 보관하는 TTL + LRU 캐시입니다.
+
+    - 같은 키를 동시에 요청하면 로더는 한 번만 실행하고 결과를 함께 받습니다.
+    - ttl이 지났어도 stale_ttl 안이면 이전 값을 바로 돌려주고 백그라운드에서 새로 고칩니다.
+    - cacheable(value)가 False인 결과(오류 등)는 보관하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0.0,
+                 cacheable: Optional[Callable[[Any], bool]] = None, name: str = 'cache'):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cacheable = cacheable
+        self.name = name
+        # key -> (신선한 기한, 이전 값 사용 기한, 값). 최근에 사용한 항목이 맨 뒤
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시된 값을 반환하고, 없으면 loader()로 불러옵니다."""
+        now = time.monotonic()
+        entry = self._data.get(key)
+        if entry is not None:
+            fresh_until, stale_until, value = entry
+            if now < fresh_until:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            if now < stale_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                self._load(key, loader)
+                return value
+            del self._data[key]
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        # 기다리던 쪽이 취소되어도 다른 요청자를 위해 로드는 계속 진행
+        return await asyncio.shield(self._load(key, loader))
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(key, loader))
+            task.add_done_callback(self._log_failure)
+            self._inflight[key] = task
+        return task
+
+    def _log_failure(self, task: asyncio.Task):
+        # 백그라운드 새로 고침은 기다리는 쪽이 없을 수 있으므로 예외를 여기서 기록
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"{self.name} 로드 실패: {task.exception()!r}")
+
+    async def _run(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        finally:
+            self._inflight.pop(key, None)
+        if self.cacheable is None or self.cacheable(value):
+            self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        self._data.pop(key, None)
+        self._data[key] = (now + self.ttl, now + self.ttl + self.stale_ttl, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """현재 크기와 적중/이전 값 적중/실패/합류/제거 횟수를 반환합니다."""
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)